@@ -5,4 +5,7 @@ logger = logging.getLogger(__name__)
 
 class NetworkApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'network_api'
\ No newline at end of file
+    name = 'network_api'
+
+    def ready(self):
+        from . import signals  # noqa: F401
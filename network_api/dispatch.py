@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent after set-based writes that bypass post_save/post_delete.
+# Arguments: sender (model class), pks (primary keys of the affected rows).
+bulk_changed = Signal()
@@ -0,0 +1,133 @@
+import ipaddress
+import re
+
+from django.core import exceptions
+from django.db import models
+from django.db.models import Lookup
+
+
+class CidrField(models.CharField):
+    description = 'IPv4 or IPv6 network (cidr)'
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('max_length', 43)
+        super().__init__(*args, **kwargs)
+
+    def db_type(self, connection):
+        return 'cidr'
+
+    def to_python(self, value):
+        if value is None or value == '':
+            return value
+        try:
+            return str(ipaddress.ip_network(str(value).strip(), strict=False))
+        except ValueError:
+            raise exceptions.ValidationError(
+                'Некорректная сеть: %(value)s',
+                code='invalid',
+                params={'value': value},
+            )
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        return self.to_python(value)
+
+
+class InetAddressField(models.GenericIPAddressField):
+    description = 'IPv4 or IPv6 address (inet)'
+
+
+class MacAddressField(models.CharField):
+    description = 'MAC address (macaddr)'
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('max_length', 17)
+        super().__init__(*args, **kwargs)
+
+    def db_type(self, connection):
+        return 'macaddr'
+
+    def to_python(self, value):
+        if value is None or value == '':
+            return value
+        mac = parse_mac(value)
+        if mac is None:
+            raise exceptions.ValidationError(
+                'Некорректный MAC-адрес: %(value)s',
+                code='invalid',
+                params={'value': value},
+            )
+        return mac
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        return self.to_python(value)
+
+
+class NetworkLookup(Lookup):
+    operator = None
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} {self.operator} ({rhs})::inet', (*lhs_params, *rhs_params)
+
+
+class NetContains(NetworkLookup):
+    lookup_name = 'net_contains'
+    operator = '>>'
+
+
+class NetContainsOrEquals(NetworkLookup):
+    lookup_name = 'net_contains_or_equals'
+    operator = '>>='
+
+
+class NetContainedBy(NetworkLookup):
+    lookup_name = 'net_contained_by'
+    operator = '<<'
+
+
+class NetContainedByOrEquals(NetworkLookup):
+    lookup_name = 'net_contained_by_or_equals'
+    operator = '<<='
+
+
+class NetOverlaps(NetworkLookup):
+    lookup_name = 'net_overlaps'
+    operator = '&&'
+
+
+for network_field in (CidrField, InetAddressField):
+    for network_lookup in (NetContains, NetContainsOrEquals, NetContainedBy, NetContainedByOrEquals, NetOverlaps):
+        network_field.register_lookup(network_lookup)
+
+
+def parse_network(value):
+    try:
+        return ipaddress.ip_network(str(value).strip(), strict=False)
+    except ValueError:
+        return None
+
+
+def parse_address(value):
+    try:
+        return ipaddress.ip_address(str(value).strip())
+    except ValueError:
+        return None
+
+
+MAC_SEPARATORS_RE = re.compile(r'[\s:.\-]')
+MAC_DIGITS_RE = re.compile(r'^[0-9a-f]{12}$')
+
+
+def parse_mac(value):
+    digits = MAC_SEPARATORS_RE.sub('', str(value)).lower()
+    if not MAC_DIGITS_RE.match(digits):
+        return None
+    return ':'.join(digits[i:i + 2] for i in range(0, 12, 2))
+
+
+def normalize_mac_fragment(value):
+    return re.sub(r'[\s.\-]', ':', str(value).strip()).lower()
@@ -0,0 +1,222 @@
+from collections import namedtuple
+from functools import reduce
+import ipaddress
+import operator
+import re
+
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connection
+from django.db.models import CharField, GenericIPAddressField, IntegerField, Q, TextField, Value
+from django.db.models.functions import Greatest
+from rest_framework import filters
+
+from network_api.fields import CidrField, InetAddressField, MacAddressField, normalize_mac_fragment, parse_mac
+
+TEXT_FIELD_TYPES = (CharField, TextField)
+
+INTEGER_TERM_RE = re.compile(r'^\d+$')
+INTEGER_RANGE_TERM_RE = re.compile(r'^(\d+)(?:\.\.|-)(\d+)$')
+VLAN_TERM_RE = re.compile(r'^vlan[\s:=#-]*(\d+)$', re.IGNORECASE)
+IPV4_PREFIX_TERM_RE = re.compile(r'^\d{1,3}(?:\.\d{1,3}){1,2}\.?$')
+MAC_TERM_RE = re.compile(r'^[0-9a-fA-F.:\-]+$')
+
+INTEGER = 'integer'
+INTEGER_RANGE = 'integer_range'
+VLAN = 'vlan'
+ADDRESS = 'address'
+NETWORK = 'network'
+MAC = 'mac'
+TEXT = 'text'
+
+SearchTerm = namedtuple('SearchTerm', ['kind', 'value', 'raw'])
+
+
+def parse_term(raw):
+    raw = raw.strip()
+
+    match = VLAN_TERM_RE.match(raw)
+    if match:
+        return SearchTerm(VLAN, int(match.group(1)), raw)
+
+    if INTEGER_TERM_RE.match(raw):
+        return SearchTerm(INTEGER, int(raw), raw)
+
+    match = INTEGER_RANGE_TERM_RE.match(raw)
+    if match:
+        low, high = sorted((int(match.group(1)), int(match.group(2))))
+        return SearchTerm(INTEGER_RANGE, (low, high), raw)
+
+    try:
+        return SearchTerm(ADDRESS, ipaddress.ip_address(raw), raw)
+    except ValueError:
+        pass
+
+    if '/' in raw:
+        try:
+            return SearchTerm(NETWORK, ipaddress.ip_network(raw, strict=False), raw)
+        except ValueError:
+            pass
+
+    if IPV4_PREFIX_TERM_RE.match(raw):
+        octets = raw.rstrip('.').split('.')
+        if all(int(octet) <= 255 for octet in octets):
+            padded = octets + ['0'] * (4 - len(octets))
+            return SearchTerm(NETWORK, ipaddress.ip_network(f"{'.'.join(padded)}/{8 * len(octets)}"), raw)
+
+    mac = parse_mac(raw)
+    if mac:
+        return SearchTerm(MAC, mac, raw)
+
+    return SearchTerm(TEXT, raw, raw)
+
+
+def parse_search(tokens):
+    if isinstance(tokens, str):
+        tokens = tokens.split()
+
+    terms = []
+    tokens = [token for token in tokens if token.strip()]
+    index = 0
+    while index < len(tokens):
+        token = tokens[index]
+        following = tokens[index + 1] if index + 1 < len(tokens) else ''
+        if token.lower() == 'vlan' and INTEGER_TERM_RE.match(following):
+            token = f'{token} {following}'
+            index += 1
+        terms.append(parse_term(token))
+        index += 1
+    return terms
+
+
+def resolve_field(model, path):
+    field = None
+    for part in path.split('__'):
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        if field.is_relation:
+            model = field.related_model
+    return field
+
+
+def is_text_field(model, path):
+    field = resolve_field(model, path)
+    return isinstance(field, TEXT_FIELD_TYPES) and not isinstance(field, (MacAddressField, CidrField))
+
+
+def integer_in_range(field, value):
+    low, high = connection.ops.integer_field_range(field.get_internal_type())
+    return (low is None or value >= low) and (high is None or value <= high)
+
+
+def integer_condition(path, field, term):
+    if term.kind == INTEGER and integer_in_range(field, term.value):
+        return Q(**{path: term.value})
+    if term.kind == VLAN and field.name == 'vlan' and integer_in_range(field, term.value):
+        return Q(**{path: term.value})
+    if term.kind == INTEGER_RANGE:
+        low, high = term.value
+        return Q(**{f'{path}__range': (low, high)})
+    return None
+
+
+def term_condition(model, path, term):
+    field = resolve_field(model, path)
+
+    if isinstance(field, ArrayField) and isinstance(field.base_field, IntegerField):
+        if term.kind == INTEGER and integer_in_range(field.base_field, term.value):
+            return Q(**{f'{path}__contains': [term.value]})
+        return None
+
+    if isinstance(field, MacAddressField):
+        if term.kind == MAC:
+            return Q(**{path: term.value})
+        if MAC_TERM_RE.match(term.raw):
+            return Q(**{f'{path}__icontains': normalize_mac_fragment(term.raw)})
+        return None
+
+    if isinstance(field, CidrField):
+        if term.kind == ADDRESS:
+            return Q(**{f'{path}__net_contains_or_equals': str(term.value)})
+        if term.kind == NETWORK:
+            return Q(**{f'{path}__net_contained_by_or_equals': str(term.value)})
+        return None
+
+    if isinstance(field, InetAddressField):
+        if term.kind == ADDRESS:
+            return Q(**{path: str(term.value)})
+        if term.kind == NETWORK:
+            return Q(**{f'{path}__net_contained_by_or_equals': str(term.value)})
+        return None
+
+    if isinstance(field, GenericIPAddressField):
+        if term.kind == ADDRESS:
+            return Q(**{path: str(term.value)})
+        return None
+
+    if isinstance(field, IntegerField):
+        return integer_condition(path, field, term)
+
+    if isinstance(field, TEXT_FIELD_TYPES) and term.kind != VLAN:
+        return Q(**{f'{path}__icontains': term.raw})
+
+    return None
+
+
+def term_matches_any(model, term, fields):
+    conditions = [
+        condition for condition in (term_condition(model, field, term) for field in fields)
+        if condition is not None
+    ]
+    if not conditions:
+        return Q(pk__in=[])
+    return reduce(operator.or_, conditions)
+
+
+def contains_any(model, value, fields):
+    terms = parse_search(value)
+    if not terms:
+        return Q()
+    return reduce(operator.and_, [term_matches_any(model, term, fields) for term in terms])
+
+
+def search_rank(model, value, fields):
+    text_fields = [field for field in fields if is_text_field(model, field)]
+    if not text_fields:
+        return Value(0.0)
+
+    similarities = [TrigramWordSimilarity(value, field) for field in text_fields]
+    if len(similarities) == 1:
+        return similarities[0]
+    return Greatest(*similarities)
+
+
+def trigram_search(queryset, value, fields):
+    value = (value or '').strip()
+    if not value:
+        return queryset
+
+    return queryset.filter(contains_any(queryset.model, value, fields)).annotate(
+        search_rank=search_rank(queryset.model, value, fields)
+    ).order_by('-search_rank', 'pk')
+
+
+class TrigramSearchFilter(filters.SearchFilter):
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = [field.lstrip('^=@$') for field in self.get_search_fields(view, request) or []]
+        search_terms = self.get_search_terms(request)
+
+        if not search_fields or not search_terms:
+            return queryset
+
+        for term in parse_search(search_terms):
+            queryset = queryset.filter(term_matches_any(queryset.model, term, search_fields))
+
+        search_value = ' '.join(search_terms)
+        return queryset.annotate(
+            search_rank=search_rank(queryset.model, search_value, search_fields)
+        ).order_by('-search_rank', 'pk')
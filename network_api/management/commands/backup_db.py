@@ -1,10 +1,14 @@
 import os
-import json
-from django.core.management.base import BaseCommand
+import gzip
+from django.core.management.base import BaseCommand, CommandError
 from django.core.management import call_command
-from django.conf import settings
 from django.utils import timezone
 
+from network_api.services.backup import (
+    BACKUP_FORMAT, COMPRESSIONS, DEFAULT_EXCLUDE, BackupError, IncrementalBackupError, backup_directory,
+    create_backup, create_incremental_backup, latest_backup, write_meta
+)
+
 
 class Command(BaseCommand):
     help = 'Создание резервной копии базы данных'
@@ -13,76 +17,118 @@ class Command(BaseCommand):
         parser.add_argument(
             '--format',
             type=str,
-            choices=['json', 'xml', 'yaml'],
-            default='json',
-            help='Формат резервной копии'
+            choices=[BACKUP_FORMAT, 'json', 'xml', 'yaml'],
+            default=BACKUP_FORMAT,
+            help='Формат резервной копии: copy - потоковая выгрузка таблиц, json/xml/yaml - через dumpdata'
         )
         parser.add_argument(
             '--compress',
-            action='store_true',
-            help='Сжать резервную копию'
+            nargs='?',
+            const='gzip',
+            choices=[name for name in COMPRESSIONS if name],
+            help='Сжать резервную копию (gzip по умолчанию, zstd)'
         )
         parser.add_argument(
             '--exclude',
             nargs='+',
             default=[],
-            help='Исключить таблицы из бэкапа'
+            help='Исключить таблицы из бэкапа (app или app.model)'
+        )
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            default=1,
+            help='Количество параллельных соединений для выгрузки таблиц (формат copy)'
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Сохранить только строки, изменённые после предыдущего бэкапа (формат copy)'
+        )
+        parser.add_argument(
+            '--base',
+            help='Бэкап, от которого считаются изменения (по умолчанию последний в каталоге)'
+        )
+        parser.add_argument(
+            '--output-dir',
+            help='Каталог для резервных копий (по умолчанию backups/)'
         )
 
     def handle(self, *args, **options):
-        backup_dir = os.path.join(settings.BASE_DIR, 'backups')
+        if options['jobs'] < 1:
+            raise CommandError('--jobs должен быть положительным числом')
+        backup_dir = options['output_dir'] or backup_directory()
         os.makedirs(backup_dir, exist_ok=True)
 
         timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'network_db_backup_{timestamp}.{options["format"]}'
-        filepath = os.path.join(backup_dir, filename)
-
-        self.stdout.write(f'Создание резервной копии: {filename}')
-
-        exclude_models = []
-
-        exclude_models.extend([
-            'contenttypes',
-            'auth.permission',
-            'sessions'
-        ])
-
-        if options['exclude']:
-            exclude_models.extend(options['exclude'])
-
+        exclude_models = [*DEFAULT_EXCLUDE, *options['exclude']]
         self.stdout.write(f'  Исключаемые модели: {", ".join(exclude_models)}')
 
+        if options['incremental'] and options['format'] != BACKUP_FORMAT:
+            raise CommandError(f'Инкрементальный бэкап поддерживается только в формате {BACKUP_FORMAT}')
+
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                call_command(
-                    'dumpdata',
-                    '--natural-foreign',
-                    '--natural-primary',
-                    '--indent=2',
-                    f'--format={options["format"]}',
-                    stdout=f
+            meta = None
+            if options['incremental']:
+                base = options['base'] or latest_backup(backup_dir)
+                if not os.path.exists(base):
+                    base = os.path.join(backup_dir, base)
+                filepath = os.path.join(backup_dir, f'network_db_backup_{timestamp}_incr')
+                self.stdout.write(f'Инкрементальный бэкап от {os.path.basename(base)}: {os.path.basename(filepath)}')
+                try:
+                    meta = create_incremental_backup(filepath, base, options['compress'], progress=self.table_done)
+                    self.stdout.write(f'  Изменённых строк: {meta["changed_rows"]}')
+                except IncrementalBackupError as e:
+                    self.stdout.write(self.style.WARNING(f'  {e}. Вместо инкрементального создаётся полный бэкап'))
+
+            if meta is None and options['format'] == BACKUP_FORMAT:
+                filepath = os.path.join(backup_dir, f'network_db_backup_{timestamp}')
+                self.stdout.write(f'Создание резервной копии: {os.path.basename(filepath)}')
+                meta = create_backup(
+                    filepath, options['compress'], options['exclude'], progress=self.table_done, jobs=options['jobs']
                 )
+            elif meta is None:
+                filepath = self.dump_fixture(backup_dir, timestamp, exclude_models, options)
+                meta = {
+                    'backup_file': os.path.basename(filepath),
+                    'timestamp': timestamp,
+                    'format': options['format'],
+                    'compression': options['compress'],
+                    'size_bytes': os.path.getsize(filepath),
+                    'excluded_models': exclude_models,
+                }
+            write_meta(filepath, meta)
+        except BackupError as e:
+            raise CommandError(str(e))
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'[-] Ошибка при создании бэкапа: {str(e)}'))
+            raise
 
-            self.stdout.write(self.style.SUCCESS(f'[+] Резервная копия создана: {filename}'))
-
-            file_size = os.path.getsize(filepath)
-            size_mb = file_size / (1024 * 1024)
-            self.stdout.write(f'  Размер: {size_mb:.2f} MB')
+        self.stdout.write(self.style.SUCCESS(f'[+] Резервная копия создана: {meta["backup_file"]}'))
+        self.stdout.write(f'  Размер: {meta["size_bytes"] / (1024 * 1024):.2f} MB')
+        self.stdout.write(f'  Мета-файл: {filepath}.meta.json')
 
-            meta = {
-                'backup_file': filename,
-                'timestamp': timestamp,
-                'format': options['format'],
-                'size_bytes': file_size,
-                'excluded_models': exclude_models
-            }
+    def table_done(self, table):
+        self.stdout.write(f'  {table["table"]}: {table["rows"]} строк, {table["seconds"]} с')
 
-            meta_filepath = filepath + '.meta.json'
-            with open(meta_filepath, 'w', encoding='utf-8') as f:
-                json.dump(meta, f, indent=2, ensure_ascii=False)
+    def dump_fixture(self, backup_dir, timestamp, exclude_models, options):
+        if options['compress'] not in (None, 'gzip'):
+            raise CommandError(f'Формат {options["format"]} поддерживает только сжатие gzip')
 
-            self.stdout.write(f'  Мета-файл: {meta_filepath}')
+        filename = f'network_db_backup_{timestamp}.{options["format"]}'
+        if options['compress']:
+            filename += '.gz'
+        filepath = os.path.join(backup_dir, filename)
+        self.stdout.write(f'Создание резервной копии: {filename}')
 
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f'[-] Ошибка при создании бэкапа: {str(e)}'))
-            raise
\ No newline at end of file
+        opener = gzip.open if options['compress'] else open
+        with opener(filepath, 'wt', encoding='utf-8') as f:
+            call_command(
+                'dumpdata',
+                '--natural-foreign',
+                '--natural-primary',
+                f'--format={options["format"]}',
+                *[f'--exclude={label}' for label in exclude_models],
+                stdout=f
+            )
+        return filepath
@@ -1,14 +1,142 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
 from network_api.models import (
     Computer, Department, User, Software, Equipment,
     Network, HostComputer, UserComputer, SoftwareComputer,
-    NetworkComputer, Server, ServerNetwork
+    NetworkComputer, Server, ServerNetwork, IpAddressPool, SearchEntry
 )
+from network_api.services import autocomplete
+from network_api.services.cache_versions import bump_versions
+from network_api.services.licensing import recount_installations
+from network_api.services.outbox import record_reset
+from network_api.services.search_index import rebuild_search_index
+import csv
+import io
+import ipaddress
+import multiprocessing
 import random
 from datetime import date, timedelta
 from faker import Faker
 
-fake = Faker('ru_RU')
+SCALES = {
+    '10k': 10000,
+    '100k': 100000,
+    '1m': 1000000,
+}
+
+CHUNK_SIZE = 10000
+HOSTS_PER_NETWORK = 120
+FIRST_SERIAL_NUMBER = 100000
+
+COMPUTER_MODELS = ['Dell Optiplex', 'HP EliteDesk', 'Lenovo ThinkCentre']
+COMPUTER_OSES = ['Windows 10 Pro', 'Windows 11 Pro', 'Ubuntu 22.04']
+
+COMPUTER_COLUMNS = ['id', 'serial_number', 'model', 'os', 'inventory_number', 'department_id']
+USER_COLUMNS = ['id', 'full_name', 'phone', 'email', 'position_id', 'department_id']
+HOST_COLUMNS = ['hostname', 'ip_address', 'mac_address', 'department_id']
+USER_COMPUTER_COLUMNS = ['User_id', 'Computer_id']
+NETWORK_COMPUTER_COLUMNS = ['Network_id', 'Computer_id', 'ip_address', 'mac_address', 'speed']
+SOFTWARE_COMPUTER_COLUMNS = ['Software_id', 'Computer_id']
+
+COPIED_MODELS = [
+    Department, Network, User, Computer, UserComputer, NetworkComputer, SoftwareComputer, Server, ServerNetwork,
+    HostComputer
+]
+
+
+def chunk_random(seed, kind, chunk):
+    return random.Random(f'{seed}:{kind}:{chunk}')
+
+
+def random_mac(rng):
+    return ':'.join(f'{rng.randrange(256):02x}' for _ in range(6))
+
+
+def optional_department(rng, departments, probability):
+    return rng.choice(departments) if departments and rng.random() < probability else None
+
+
+def to_csv(rows):
+    output = io.StringIO()
+    csv.writer(output, lineterminator='\n').writerows(rows)
+    return output.getvalue()
+
+
+def network_address(network_range, offset):
+    network = ipaddress.ip_network(network_range)
+    return str(network.network_address + offset)
+
+
+def generate_users(task):
+    seed, chunk, start, stop, first_id, departments = task
+    rng = chunk_random(seed, 'users', chunk)
+    fake = Faker('ru_RU')
+    fake.seed_instance(f'{seed}:users:{chunk}')
+
+    rows = []
+    for index in range(start, stop):
+        user_id = first_id + index
+        rows.append([
+            user_id,
+            fake.name(),
+            fake.phone_number(),
+            f'{fake.user_name()}.{user_id}@{fake.free_email_domain()}',
+            rng.randint(1, 5),
+            optional_department(rng, departments, 0.8),
+        ])
+    return {'users': to_csv(rows)}
+
+
+def generate_computers(task):
+    seed, chunk, start, stop, context = task
+    rng = chunk_random(seed, 'computers', chunk)
+    networks = context['networks']
+    software = context['software']
+
+    computers = []
+    user_computers = []
+    network_computers = []
+    software_computers = []
+    for index in range(start, stop):
+        computer_id = context['first_computer_id'] + index
+        computers.append([
+            computer_id,
+            context['first_serial_number'] + index,
+            rng.choice(COMPUTER_MODELS),
+            rng.choice(COMPUTER_OSES),
+            rng.randint(1000, 9999),
+            optional_department(rng, context['departments'], 0.7),
+        ])
+
+        if context['users'] and rng.random() < 0.4:
+            owners = rng.sample(range(context['users']), min(rng.randint(1, 2), context['users']))
+            for owner in owners:
+                user_computers.append([context['first_user_id'] + owner, computer_id])
+
+        block, position = divmod(index, HOSTS_PER_NETWORK)
+        if rng.random() < 0.6:
+            network_id, network_range = networks[block % len(networks)]
+            network_computers.append([
+                network_id, computer_id, network_address(network_range, position + 1),
+                random_mac(rng), rng.choice([100, 1000])
+            ])
+            if len(networks) > 1 and rng.random() < 0.2:
+                network_id, network_range = networks[(block + 1) % len(networks)]
+                network_computers.append([
+                    network_id, computer_id, network_address(network_range, HOSTS_PER_NETWORK + position + 1),
+                    random_mac(rng), rng.choice([100, 1000])
+                ])
+
+        if software and rng.random() < 0.8:
+            for software_id in rng.sample(software, min(rng.randint(1, 4), len(software))):
+                software_computers.append([software_id, computer_id])
+
+    return {
+        'computers': to_csv(computers),
+        'user_computers': to_csv(user_computers),
+        'network_computers': to_csv(network_computers),
+        'software_computers': to_csv(software_computers),
+    }
 
 
 class Command(BaseCommand):
@@ -17,61 +145,135 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('--clear', action='store_true')
         parser.add_argument('--computers', type=int, default=500)
+        parser.add_argument(
+            '--scale',
+            choices=list(SCALES),
+            help='Готовый объем данных (задает --computers и пропорции остальных таблиц)'
+        )
+        parser.add_argument('--seed', type=int, help='Зерно генератора для воспроизводимых данных')
+        parser.add_argument('--workers', type=int, default=1, help='Количество процессов генерации')
+        parser.add_argument(
+            '--no-index',
+            action='store_true',
+            help='Не перестраивать поисковый индекс после генерации'
+        )
 
     def handle(self, *args, **options):
+        computers_count = SCALES[options['scale']] if options['scale'] else options['computers']
+        if computers_count < 0 or options['workers'] < 1:
+            raise CommandError('--computers и --workers должны быть положительными')
+
+        seed = options['seed'] if options['seed'] is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.workers = options['workers']
+
         if options['clear']:
             self.stdout.write('Очистка данных...')
             self._clear_data()
 
-        self.stdout.write('Начало генерации...')
+        self.stdout.write(f'Начало генерации (seed={seed}, компьютеров: {computers_count})...')
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            departments = self._create_departments(max(15, computers_count // 100))
+            self.stdout.write(f'[+] Отделы: {len(departments)}')
 
-        departments = self._create_departments(15)
-        self.stdout.write(f'[+] Отделы: {len(departments)}')
+            equipment = self._create_equipment()
+            self.stdout.write(f'[+] Оборудование: {len(equipment)}')
 
-        equipment = self._create_equipment()
-        self.stdout.write(f'[+] Оборудование: {len(equipment)}')
+            network_count = max(20, -(-computers_count // HOSTS_PER_NETWORK))
+            networks = self._create_networks(network_count, equipment)
+            self.stdout.write(f'[+] Сети: {len(networks)}')
 
-        networks = self._create_networks(20, equipment)
-        self.stdout.write(f'[+] Сети: {len(networks)}')
+            software = self._create_software()
+            self.stdout.write(f'[+] ПО: {len(software)}')
 
-        computers = self._create_computers(options['computers'], departments)
-        self.stdout.write(f'[+] Компьютеры: {len(computers)}')
+            users_count = max(300, computers_count * 3 // 5)
+            first_user_id = self._create_users(cursor, users_count, departments)
+            self.stdout.write(f'[+] Пользователи: {users_count}')
 
-        users = self._create_users(300, departments)
-        self.stdout.write(f'[+] Пользователи: {len(users)}')
+            counts = self._create_computers(cursor, computers_count, {
+                'departments': [department.id for department in departments],
+                'networks': [(network.id, network.ip_range) for network in networks],
+                'software': [item.id for item in software],
+                'users': users_count,
+                'first_user_id': first_user_id,
+            })
+            self.stdout.write(f'[+] Компьютеры: {counts["computers"]}')
+            self.stdout.write(f'[+] Связи User-Computer: {counts["user_computers"]}')
+            self.stdout.write(f'[+] Связи Network-Computer: {counts["network_computers"]}')
+            self.stdout.write(f'[+] Установки ПО: {counts["software_computers"]}')
 
-        uc_count = self._create_user_computers(users, computers)
-        self.stdout.write(f'[+] Связи User-Computer: {uc_count}')
+            servers = self._create_servers(max(10, computers_count // 1000))
+            self.stdout.write(f'[+] Серверы: {len(servers)}')
 
-        nc_count = self._create_network_computers(computers, networks)
-        self.stdout.write(f'[+] Связи Network-Computer: {nc_count}')
+            sn_count = self._create_server_networks(servers, networks)
+            self.stdout.write(f'[+] Связи Server-Network: {sn_count}')
 
-        servers = self._create_servers(10)
-        self.stdout.write(f'[+] Серверы: {len(servers)}')
+            hosts_count = self._create_host_computers(cursor, max(25, computers_count // 20), departments)
+            self.stdout.write(f'[+] Хост-компьютеры: {hosts_count}')
 
-        sn_count = self._create_server_networks(servers, networks)
-        self.stdout.write(f'[+] Связи Server-Network: {sn_count}')
+            recount_installations([item.id for item in software])
+            record_reset(COPIED_MODELS)
 
-        hosts = self._create_host_computers(25, departments)
-        self.stdout.write(f'[+] Хост-компьютеры: {len(hosts)}')
+        autocomplete.reset()
+        bump_versions(
+            Computer, User, Software, Department, HostComputer, UserComputer, SoftwareComputer, NetworkComputer
+        )
 
-        software = self._create_software()
-        sw_count = self._install_software(computers, software)
-        self.stdout.write(f'[+] Установки ПО: {sw_count}')
+        if not options['no_index']:
+            self.stdout.write('Перестроение поискового индекса...')
+            rebuild_search_index()
 
         self.stdout.write(self.style.SUCCESS('\n[+] Генерация завершена!'))
 
     def _clear_data(self):
-        NetworkComputer.objects.all().delete()
-        SoftwareComputer.objects.all().delete()
-        UserComputer.objects.all().delete()
-        ServerNetwork.objects.all().delete()
-        Network.objects.all().delete()
-        Computer.objects.all().delete()
-        User.objects.all().delete()
-        Server.objects.all().delete()
-        HostComputer.objects.all().delete()
-        Department.objects.all().delete()
+        models = [
+            NetworkComputer, SoftwareComputer, UserComputer, ServerNetwork, IpAddressPool,
+            Network, Computer, User, Server, HostComputer, Department
+        ]
+        tables = ', '.join(connection.ops.quote_name(model._meta.db_table) for model in models)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'TRUNCATE {tables}')
+            record_reset(COPIED_MODELS)
+            SearchEntry.objects.filter(
+                entity_type__in=['computer', 'user', 'host_computer', 'network', 'server']
+            ).delete()
+            recount_installations()
+        autocomplete.reset()
+        bump_versions(
+            Computer, User, Software, Department, HostComputer, UserComputer, SoftwareComputer, NetworkComputer
+        )
+
+    def _reserve_ids(self, cursor, model, count):
+        table = connection.ops.quote_name(model._meta.db_table)
+        cursor.execute(f'LOCK TABLE {table} IN EXCLUSIVE MODE')
+        cursor.execute("SELECT nextval(pg_get_serial_sequence(%s, 'id'))", [table])
+        first_id = cursor.fetchone()[0]
+        if count > 1:
+            cursor.execute("SELECT setval(pg_get_serial_sequence(%s, 'id'), %s)", [table, first_id + count - 1])
+        return first_id
+
+    def _copy(self, cursor, model, columns, data):
+        if not data:
+            return
+        qn = connection.ops.quote_name
+        column_list = ', '.join(qn(column) for column in columns)
+        cursor.copy_expert(
+            f'COPY {qn(model._meta.db_table)} ({column_list}) FROM STDIN WITH (FORMAT csv)',
+            io.StringIO(data)
+        )
+
+    def _generate(self, function, tasks):
+        if self.workers == 1:
+            yield from map(function, tasks)
+            return
+        with multiprocessing.Pool(self.workers) as pool:
+            yield from pool.imap(function, tasks)
+
+    def _chunks(self, count):
+        for chunk, start in enumerate(range(0, count, CHUNK_SIZE)):
+            yield chunk, start, min(start + CHUNK_SIZE, count)
 
     def _create_equipment(self):
         equipment_list = [
@@ -96,138 +298,113 @@ class Command(BaseCommand):
         return equipment_objs
 
     def _create_networks(self, count, equipment):
-        networks = []
-
         if not equipment:
             self.stdout.write(self.style.ERROR('[-] Нет оборудования для создания сетей!'))
-            return networks
+            return []
 
-        for i in range(count):
-            vlan = 10 + i * 10
-            third_octet = 10 + i
+        taken = set(
+            Network.objects.filter(ip_range__net_contained_by_or_equals='10.0.0.0/8').values_list('ip_range', flat=True)
+        )
+        free_ranges = (
+            f'10.{index // 256}.{index % 256}.0/24' for index in range(65536)
+            if f'10.{index // 256}.{index % 256}.0/24' not in taken
+        )
 
-            network = Network.objects.create(
+        networks = []
+        for i, ip_range in zip(range(count), free_ranges):
+            networks.append(Network(
                 subnet_mask='255.255.255.0',
-                vlan=vlan,
-                ip_range=f'192.168.{third_octet}.0/24',
-                equipment=random.choice(equipment)
-            )
-            networks.append(network)
-
-        return networks
+                vlan=10 + (i * 10) % 4080,
+                ip_range=ip_range,
+                equipment=self.rng.choice(equipment)
+            ))
+        return Network.objects.bulk_create(networks, batch_size=CHUNK_SIZE)
 
     def _create_departments(self, count):
-        departments = []
-        for i in range(count):
-            dept = Department.objects.create(
-                room_number=100 + i,
-                internal_phone=1000 + i,
-                employee_count=random.randint(5, 20),
+        first_room = (Department.objects.order_by('-room_number').values_list('room_number', flat=True).first() or 99) + 1
+        departments = [
+            Department(
+                room_number=first_room + i,
+                internal_phone=900 + first_room + i,
+                employee_count=self.rng.randint(5, 20),
                 employee_phones=[]
             )
-            departments.append(dept)
-        return departments
-
-    def _create_computers(self, count, departments):
-        computers = []
-        models = ['Dell Optiplex', 'HP EliteDesk', 'Lenovo ThinkCentre']
-        oss = ['Windows 10 Pro', 'Windows 11 Pro', 'Ubuntu 22.04']
-
-        for i in range(count):
-            computer = Computer.objects.create(
-                serial_number=random.randint(100000, 999999),
-                model=random.choice(models),
-                os=random.choice(oss),
-                inventory_number=random.randint(1000, 9999),
-                department=random.choice(departments) if random.random() > 0.3 else None
-            )
-            computers.append(computer)
-        return computers
-
-    def _create_users(self, count, departments):
-        users = []
-        for i in range(count):
-            user = User.objects.create(
-                full_name=fake.name(),
-                phone=fake.phone_number(),
-                email=fake.email(),
-                position_id=random.randint(1, 5),
-                department=random.choice(departments) if random.random() > 0.2 else None
-            )
-            users.append(user)
-        return users
-
-    def _create_user_computers(self, users, computers):
-        count = 0
-        for user in users[:100]:
-            num = random.randint(0, 2)
-            assigned = random.sample(computers, min(num, len(computers)))
-            for comp in assigned:
-                _, created = UserComputer.objects.get_or_create(user=user, computer=comp)
-                if created:
-                    count += 1
-        return count
-
-    def _create_network_computers(self, computers, networks):
-        count = 0
-        for computer in random.sample(computers, min(300, len(computers))):
-            num = random.randint(0, 2)
-            assigned = random.sample(networks, min(num, len(networks)))
-            for net in assigned:
-                _, created = NetworkComputer.objects.get_or_create(
-                    network=net,
-                    computer=computer,
-                    defaults={
-                        'ip_address': f'192.168.{net.vlan // 10}.{random.randint(10, 250)}',
-                        'mac_address': ':'.join([f'{random.randint(0, 255):02x}' for _ in range(6)]),
-                        'speed': random.choice([100, 1000])
-                    }
-                )
-                if created:
-                    count += 1
-        return count
+            for i in range(count)
+        ]
+        return Department.objects.bulk_create(departments, batch_size=CHUNK_SIZE)
+
+    def _create_users(self, cursor, count, departments):
+        first_id = self._reserve_ids(cursor, User, count)
+        department_ids = [department.id for department in departments]
+        tasks = (
+            (self.seed, chunk, start, stop, first_id, department_ids)
+            for chunk, start, stop in self._chunks(count)
+        )
+        for result in self._generate(generate_users, tasks):
+            self._copy(cursor, User, USER_COLUMNS, result['users'])
+        return first_id
+
+    def _create_computers(self, cursor, count, context):
+        context['first_computer_id'] = self._reserve_ids(cursor, Computer, count)
+        context['first_serial_number'] = max(
+            FIRST_SERIAL_NUMBER,
+            (Computer.objects.order_by('-serial_number').values_list('serial_number', flat=True).first() or 0) + 1
+        )
+        if context['first_serial_number'] + count > 2 ** 31:
+            raise CommandError('Серийные номера выходят за пределы допустимого диапазона')
+
+        counts = dict.fromkeys(['computers', 'user_computers', 'network_computers', 'software_computers'], 0)
+        tasks = (
+            (self.seed, chunk, start, stop, context)
+            for chunk, start, stop in self._chunks(count)
+        )
+        for result in self._generate(generate_computers, tasks):
+            self._copy(cursor, Computer, COMPUTER_COLUMNS, result['computers'])
+            self._copy(cursor, UserComputer, USER_COMPUTER_COLUMNS, result['user_computers'])
+            self._copy(cursor, NetworkComputer, NETWORK_COMPUTER_COLUMNS, result['network_computers'])
+            self._copy(cursor, SoftwareComputer, SOFTWARE_COMPUTER_COLUMNS, result['software_computers'])
+            for key, data in result.items():
+                counts[key] += data.count('\n')
+        return counts
 
     def _create_servers(self, count):
-        servers = []
-        for i in range(count):
-            server = Server.objects.create(
-                port=random.randint(1024, 65535),
+        servers = [
+            Server(
+                port=self.rng.randint(1024, 65535),
                 hostname=f'server-{i + 1}',
-                connection_date=date.today() - timedelta(days=random.randint(30, 365)),
-                location=random.choice(['ЦОД-1', 'ЦОД-2'])
+                connection_date=date.today() - timedelta(days=self.rng.randint(30, 365)),
+                location=self.rng.choice(['ЦОД-1', 'ЦОД-2'])
             )
-            servers.append(server)
-        return servers
+            for i in range(count)
+        ]
+        return Server.objects.bulk_create(servers, batch_size=CHUNK_SIZE)
 
     def _create_server_networks(self, servers, networks):
-        count = 0
+        links = []
         for server in servers:
-            num = random.randint(1, 2)
-            assigned = random.sample(networks, min(num, len(networks)))
-            for net in assigned:
-                _, created = ServerNetwork.objects.get_or_create(server=server, network=net)
-                if created:
-                    count += 1
+            num = self.rng.randint(1, 2)
+            for net in self.rng.sample(networks, min(num, len(networks))):
+                links.append(ServerNetwork(server=server, network=net))
+        ServerNetwork.objects.bulk_create(links, batch_size=CHUNK_SIZE)
+        return len(links)
+
+    def _create_host_computers(self, cursor, count, departments):
+        department_ids = [department.id for department in departments]
+        first_address = ipaddress.ip_address('172.16.0.1')
+        for chunk, start, stop in self._chunks(count):
+            rng = chunk_random(self.seed, 'hosts', chunk)
+            rows = [
+                [
+                    f'host-{index + 1}',
+                    str(first_address + index),
+                    random_mac(rng),
+                    optional_department(rng, department_ids, 0.5),
+                ]
+                for index in range(start, stop)
+            ]
+            self._copy(cursor, HostComputer, HOST_COLUMNS, to_csv(rows))
         return count
 
-    def _create_host_computers(self, count, departments):
-        hosts = []
-
-        for i in range(count):
-            department = random.choice(departments) if departments and random.random() > 0.5 else None
-
-            mac = ':'.join([f'{random.randint(0, 255):02x}' for _ in range(6)])
-
-            host = HostComputer.objects.create(
-                hostname=f'host-{i + 1}',
-                ip_address=f'10.0.{random.randint(1, 254)}.{random.randint(1, 254)}',
-                mac_address=mac,
-                department=department
-            )
-            hosts.append(host)
-
-        return hosts
-
     def _create_software(self):
         software_list = [
             {'name': 'Windows 10 Pro', 'version': '22H2', 'license': 'Commercial', 'vendor': 'Microsoft'},
@@ -249,14 +426,3 @@ class Command(BaseCommand):
             )
             software_objs.append(obj)
         return software_objs
-
-    def _install_software(self, computers, software):
-        count = 0
-        for computer in random.sample(computers, min(400, len(computers))):
-            num = random.randint(1, 4)
-            installed = random.sample(software, min(num, len(software)))
-            for sw in installed:
-                _, created = SoftwareComputer.objects.get_or_create(software=sw, computer=computer)
-                if created:
-                    count += 1
-        return count
\ No newline at end of file
@@ -0,0 +1,90 @@
+import csv
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from network_api.services.inventory_import import (
+    IMPORT_BATCH_SIZE, IMPORT_TARGETS, ON_CONFLICT_SKIP, ON_CONFLICT_UPDATE, InventoryImportError,
+    detect_format, import_inventory, parse_column_map
+)
+
+
+class Command(BaseCommand):
+    help = 'Импорт инвентаризации из CSV/XLSX'
+
+    def add_arguments(self, parser):
+        parser.add_argument('type', choices=list(IMPORT_TARGETS), help='Тип импортируемых записей')
+        parser.add_argument('path', help='Путь к файлу CSV или XLSX')
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'xlsx'],
+            help='Формат файла (по умолчанию по расширению)'
+        )
+        parser.add_argument(
+            '--on-conflict',
+            choices=[ON_CONFLICT_SKIP, ON_CONFLICT_UPDATE],
+            default=ON_CONFLICT_SKIP,
+            help='Что делать с записями, которые уже есть в базе'
+        )
+        parser.add_argument(
+            '--map',
+            nargs='+',
+            default=[],
+            help='Сопоставление колонок в виде колонка=поле'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Размер пакета проверки и загрузки'
+        )
+        parser.add_argument(
+            '--rejects',
+            help='Записать отклоненные строки в CSV-файл'
+        )
+
+    def handle(self, *args, **options):
+        rejects_file = open(options['rejects'], 'w', encoding='utf-8', newline='') if options['rejects'] else None
+        rejects_writer = csv.writer(rejects_file) if rejects_file else None
+        if rejects_writer:
+            rejects_writer.writerow(['line', 'errors'])
+
+        def progress(report):
+            self.stdout.write(
+                f'  Обработано: {report["processed"]}, '
+                f'принято: {report["staged"]}, отклонено: {report["rejected"]}'
+            )
+
+        def on_reject(line, errors):
+            if rejects_writer:
+                rejects_writer.writerow([line, json.dumps(errors, ensure_ascii=False)])
+
+        self.stdout.write(f'Импорт {options["type"]} из {options["path"]}')
+        try:
+            with open(options['path'], 'rb') as stream:
+                report = import_inventory(
+                    options['type'],
+                    stream,
+                    detect_format(options['path'], options['format']),
+                    on_conflict=options['on_conflict'],
+                    column_map=parse_column_map(options['map']),
+                    batch_size=options['batch_size'],
+                    progress=progress,
+                    on_reject=on_reject,
+                )
+        except (InventoryImportError, OSError) as e:
+            raise CommandError(str(e))
+        finally:
+            if rejects_file:
+                rejects_file.close()
+
+        if report['ignored_columns']:
+            self.stdout.write(f'  Пропущенные колонки: {", ".join(report["ignored_columns"])}')
+        self.stdout.write(
+            f'  Создано: {report["created"]}, обновлено: {report["updated"]}, '
+            f'уже в базе: {report["skipped"]}, отклонено: {report["rejected"]}'
+        )
+        for row in report['rejected_rows'][:20]:
+            self.stdout.write(self.style.WARNING(f'  Строка {row["line"]}: {row["errors"]}'))
+
+        self.stdout.write(self.style.SUCCESS('[+] Импорт завершен'))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+from network_api.services.search_index import SEARCH_DOCUMENTS, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Перестроение глобального поискового индекса'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type',
+            nargs='+',
+            default=[],
+            help='Типы сущностей для перестроения (по умолчанию все)'
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options['type']) - set(SEARCH_DOCUMENTS)
+        if unknown:
+            raise CommandError(f'Неизвестные типы: {", ".join(sorted(unknown))}')
+
+        self.stdout.write('Перестроение поискового индекса...')
+        totals = rebuild_search_index(options['type'] or None)
+
+        for entity_type, count in totals.items():
+            self.stdout.write(f'  {entity_type}: {count}')
+
+        self.stdout.write(self.style.SUCCESS('[+] Поисковый индекс перестроен'))
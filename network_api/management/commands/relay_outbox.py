@@ -0,0 +1,70 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from network_api.services.outbox import (
+    BROKERS, OUTBOX_BATCH_SIZE, OutboxError, make_broker, purge_published, relay_pending
+)
+
+
+class Command(BaseCommand):
+    help = 'Публикация событий изменений из журнала (outbox) в Kafka'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--broker',
+            choices=list(BROKERS),
+            help='Брокер сообщений (по умолчанию OUTBOX_BROKER)'
+        )
+        parser.add_argument('--topic', help='Топик (по умолчанию OUTBOX_TOPIC)')
+        parser.add_argument('--file', help='Файл для брокера file')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=OUTBOX_BATCH_SIZE,
+            help='Количество событий в одной публикации'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1.0,
+            help='Пауза между проверками журнала, секунд'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Опубликовать накопленные события и завершиться'
+        )
+
+    def handle(self, *args, **options):
+        broker_options = {'path': options['file']} if options['file'] else {}
+        try:
+            broker = make_broker(options['broker'], **broker_options)
+        except OutboxError as e:
+            raise CommandError(str(e))
+
+        try:
+            while True:
+                try:
+                    published = relay_pending(broker, options['topic'], options['batch_size'])
+                except OutboxError as e:
+                    if options['once']:
+                        raise CommandError(str(e))
+                    self.stderr.write(f'[-] {e}')
+                    published = 0
+
+                if published:
+                    self.stdout.write(f'Опубликовано событий: {published}')
+                if options['once']:
+                    break
+
+                purged = purge_published()
+                if purged:
+                    self.stdout.write(f'Удалено старых событий: {purged}')
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            broker.close()
+
+        self.stdout.write(self.style.SUCCESS('[+] Публикация завершена'))
@@ -2,7 +2,8 @@ import os
 import json
 from django.core.management.base import BaseCommand, CommandError
 from django.core.management import call_command
-from django.conf import settings
+
+from network_api.services.backup import BackupError, backup_directory, restore_backup
 
 
 class Command(BaseCommand):
@@ -15,12 +16,18 @@ class Command(BaseCommand):
             action='store_true',
             help='Не запрашивать подтверждение'
         )
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            default=1,
+            help='Количество параллельных соединений для загрузки таблиц (формат copy)'
+        )
 
     def handle(self, *args, **options):
         backup_file = options['backup_file']
 
         if not os.path.exists(backup_file):
-            backup_dir = os.path.join(settings.BASE_DIR, 'backups')
+            backup_dir = backup_directory()
             full_path = os.path.join(backup_dir, backup_file)
             if os.path.exists(full_path):
                 backup_file = full_path
@@ -36,6 +43,8 @@ class Command(BaseCommand):
             self.stdout.write(f'  Дата бэкапа: {meta.get("timestamp", "unknown")}')
             self.stdout.write(f'  Формат: {meta.get("format", "unknown")}')
             self.stdout.write(f'  Включенные таблицы: {len(meta.get("tables_included", []))}')
+            if meta.get('base'):
+                self.stdout.write(f'  Инкрементальный, базовый бэкап: {meta["base"]}')
 
         if not options['noinput']:
             confirm = input('Восстановление удалит все текущие данные. Продолжить? (yes/no): ')
@@ -43,6 +52,17 @@ class Command(BaseCommand):
                 self.stdout.write('Операция отменена.')
                 return
 
+        if os.path.isdir(backup_file):
+            try:
+                self.stdout.write('Восстановление таблиц...')
+                restored = restore_backup(backup_file, progress=self.table_done, jobs=options['jobs'])
+            except BackupError as e:
+                if options['jobs'] > 1:
+                    self.stdout.write(self.style.ERROR('✗ Данные восстановлены частично, повторите восстановление'))
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(f'✓ База данных успешно восстановлена, строк: {sum(restored.values())}'))
+            return
+
         try:
             self.stdout.write('Очистка базы данных...')
             call_command('flush', '--noinput')
@@ -70,4 +90,7 @@ class Command(BaseCommand):
             except Exception as migrate_error:
                 self.stdout.write(self.style.ERROR(f'✗ Ошибка восстановления миграций: {migrate_error}'))
 
-            raise
\ No newline at end of file
+            raise
+
+    def table_done(self, table):
+        self.stdout.write(f'  {table["table"]}: {table["rows"]}')
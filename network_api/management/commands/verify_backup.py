@@ -0,0 +1,46 @@
+import os
+from django.core.management.base import BaseCommand, CommandError
+
+from network_api.services.backup import backup_directory, list_backups, verify_backup
+
+
+class Command(BaseCommand):
+    help = 'Проверка резервных копий без восстановления: структура, число строк и контрольные суммы'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'backups',
+            nargs='*',
+            help='Бэкапы для проверки (по умолчанию все бэкапы в каталоге)'
+        )
+        parser.add_argument(
+            '--backup-dir',
+            help='Каталог с резервными копиями (по умолчанию backups/)'
+        )
+
+    def handle(self, *args, **options):
+        backup_dir = options['backup_dir'] or backup_directory()
+        paths = [
+            name if os.path.exists(name + '.meta.json') else os.path.join(backup_dir, name)
+            for name in options['backups']
+        ] or list_backups(backup_dir)
+        if not paths:
+            raise CommandError(f'В каталоге {backup_dir} нет резервных копий')
+
+        invalid = 0
+        for path in paths:
+            report = verify_backup(path, progress=self.table_done if options['verbosity'] > 1 else None)
+            summary = f'{report["backup"]}: таблиц {report["tables"]}, строк {report["rows"]}, {report["duration_seconds"]} с'
+            if report['valid']:
+                self.stdout.write(self.style.SUCCESS(f'✓ {summary}'))
+                continue
+            invalid += 1
+            self.stdout.write(self.style.ERROR(f'✗ {summary}'))
+            for error in report['errors']:
+                self.stdout.write(f'  {error}')
+
+        if invalid:
+            raise CommandError(f'Повреждённых резервных копий: {invalid} из {len(paths)}')
+
+    def table_done(self, table, errors):
+        self.stdout.write(f'  {table["table"]}: {table["rows"]} строк{", ошибка" if errors else ""}')
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:53
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from network_api.services.licensing import classify_license
+
+
+def populate_license_data(apps, schema_editor):
+    Software = apps.get_model('network_api', 'Software')
+    SoftwareComputer = apps.get_model('network_api', 'SoftwareComputer')
+
+    software_list = list(Software.objects.only('id', 'license'))
+    for software in software_list:
+        software.license_class = classify_license(software.license)
+    Software.objects.bulk_update(software_list, ['license_class'], batch_size=1000)
+
+    installations = SoftwareComputer.objects.filter(
+        software=OuterRef('pk')
+    ).order_by().values('software').annotate(total=Count('id')).values('total')
+    Software.objects.update(installed_count=Coalesce(Subquery(installations), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('network_api', '0002_alter_hostcomputer_department'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='software',
+            name='installed_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='software',
+            name='license_class',
+            field=models.CharField(choices=[('commercial', 'Коммерческая'), ('free', 'Свободная'), ('trial', 'Пробная'), ('expired', 'Истекшая'), ('unknown', 'Не определена')], db_index=True, default='unknown', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='software',
+            name='seat_count',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(populate_license_data, migrations.RunPython.noop),
+    ]
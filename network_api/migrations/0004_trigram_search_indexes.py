@@ -0,0 +1,71 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:54
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('network_api', '0003_software_license_compliance'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='computer',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('model'), name='gin_trgm_ops'), name='computer_model_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='computer',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('os'), name='gin_trgm_ops'), name='computer_os_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='equipment',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('type'), name='gin_trgm_ops'), name='equipment_type_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='hostcomputer',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('hostname'), name='gin_trgm_ops'), name='host_hostname_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='hostcomputer',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('mac_address'), name='gin_trgm_ops'), name='host_mac_address_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='network',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('ip_range'), name='gin_trgm_ops'), name='network_ip_range_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='software',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='software_name_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='software',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('version'), name='gin_trgm_ops'), name='software_version_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='software',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('vendor'), name='gin_trgm_ops'), name='software_vendor_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='software',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('license'), name='gin_trgm_ops'), name='software_license_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('full_name'), name='gin_trgm_ops'), name='user_full_name_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email'), name='gin_trgm_ops'), name='user_email_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('phone'), name='gin_trgm_ops'), name='user_phone_trgm'),
+        ),
+    ]
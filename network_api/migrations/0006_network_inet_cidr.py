@@ -0,0 +1,58 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:58
+
+import django.contrib.postgres.indexes
+import network_api.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('network_api', '0005_search_entry'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='network',
+            name='network_ip_range_trgm',
+        ),
+        migrations.AlterField(
+            model_name='hostcomputer',
+            name='ip_address',
+            field=network_api.fields.InetAddressField(),
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    'ALTER TABLE "Network" ALTER COLUMN "ip_range" TYPE cidr '
+                    'USING network(trim("ip_range")::inet)',
+                    'ALTER TABLE "Network" ALTER COLUMN "ip_range" TYPE varchar(100) '
+                    'USING "ip_range"::text',
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='network',
+                    name='ip_range',
+                    field=network_api.fields.CidrField(max_length=43),
+                ),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='networkcomputer',
+            name='ip_address',
+            field=network_api.fields.InetAddressField(),
+        ),
+        migrations.AddIndex(
+            model_name='hostcomputer',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['ip_address'], name='host_ip_address_gist', opclasses=['inet_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='network',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['ip_range'], name='network_ip_range_gist', opclasses=['inet_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='networkcomputer',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['ip_address'], name='netcomp_ip_address_gist', opclasses=['inet_ops']),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:59
+
+import django.db.models.deletion
+import network_api.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('network_api', '0006_network_inet_cidr'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IpAddressPool',
+            fields=[
+                ('network', models.OneToOneField(db_column='Network_id', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='address_pool', serialize=False, to='network_api.network')),
+                ('ip_range', network_api.fields.CidrField(max_length=43)),
+                ('size', models.BigIntegerField()),
+                ('used', models.BinaryField()),
+                ('reserved', models.BinaryField()),
+            ],
+            options={
+                'verbose_name': 'Пул IP-адресов',
+                'verbose_name_plural': 'Пулы IP-адресов',
+                'db_table': 'Ip_Address_Pool',
+                'abstract': False,
+                'managed': True,
+            },
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:01
+
+import network_api.fields
+from django.db import migrations, models
+
+MAC_TABLES = ['Network_Computer', 'Host_Computer']
+
+MAC_DIGITS = "regexp_replace(\"mac_address\", '[\\s:.-]', '', 'g')"
+
+
+def check_mac_addresses(apps, schema_editor):
+    invalid = []
+    with schema_editor.connection.cursor() as cursor:
+        for table in MAC_TABLES:
+            cursor.execute(
+                f'SELECT id, "mac_address" FROM "{table}" '
+                f"WHERE {MAC_DIGITS} !~ '^[0-9A-Fa-f]{{12}}$' ORDER BY id LIMIT 20"
+            )
+            invalid.extend(f'{table}#{row_id}: {value!r}' for row_id, value in cursor.fetchall())
+
+    if invalid:
+        raise ValueError(
+            'Найдены некорректные MAC-адреса, исправьте их перед миграцией: ' + ', '.join(invalid)
+        )
+
+
+def convert_to_macaddr(table):
+    return migrations.RunSQL(
+        f'ALTER TABLE "{table}" ALTER COLUMN "mac_address" TYPE macaddr '
+        f'USING {MAC_DIGITS}::macaddr',
+        f'ALTER TABLE "{table}" ALTER COLUMN "mac_address" TYPE varchar(17) '
+        f'USING "mac_address"::text',
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('network_api', '0007_ip_address_pool'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='hostcomputer',
+            name='host_mac_address_trgm',
+        ),
+        migrations.RunPython(check_mac_addresses, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[convert_to_macaddr(table) for table in MAC_TABLES],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='hostcomputer',
+                    name='mac_address',
+                    field=network_api.fields.MacAddressField(max_length=17),
+                ),
+                migrations.AlterField(
+                    model_name='networkcomputer',
+                    name='mac_address',
+                    field=network_api.fields.MacAddressField(max_length=17),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='hostcomputer',
+            index=models.Index(fields=['mac_address'], name='host_mac_address_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='networkcomputer',
+            index=models.Index(fields=['mac_address'], name='netcomp_mac_address_idx'),
+        ),
+    ]
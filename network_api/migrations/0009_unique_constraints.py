@@ -0,0 +1,53 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:04
+
+from django.db import migrations, models
+
+UNIQUE_COLUMNS = {
+    'Computer': ['serial_number'],
+    'Software': ['name', 'version'],
+    'User': ['email'],
+}
+
+
+def check_duplicates(apps, schema_editor):
+    duplicates = []
+    with schema_editor.connection.cursor() as cursor:
+        for table, columns in UNIQUE_COLUMNS.items():
+            column_list = ', '.join(f'"{column}"' for column in columns)
+            not_null = ' AND '.join(f'"{column}" IS NOT NULL' for column in columns)
+            cursor.execute(
+                f'SELECT {column_list}, array_agg(id ORDER BY id) FROM "{table}" WHERE {not_null} '
+                f'GROUP BY {column_list} HAVING count(*) > 1 ORDER BY min(id) LIMIT 20'
+            )
+            duplicates.extend(
+                f'{table} {", ".join(map(repr, row[:-1]))}: id {", ".join(map(str, row[-1]))}'
+                for row in cursor.fetchall()
+            )
+
+    if duplicates:
+        raise ValueError(
+            'Найдены повторяющиеся значения, устраните их перед миграцией: ' + '; '.join(duplicates)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('network_api', '0008_mac_address_storage'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='computer',
+            constraint=models.UniqueConstraint(fields=('serial_number',), name='computer_serial_number_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='software',
+            constraint=models.UniqueConstraint(fields=('name', 'version'), name='software_name_version_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(fields=('email',), name='user_email_uniq'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:05
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('network_api', '0009_unique_constraints'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='department',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['employee_phones'], name='department_phones_gin'),
+        ),
+        AddIndexConcurrently(
+            model_name='department',
+            index=models.Index(fields=['internal_phone'], name='department_internal_phone_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='user',
+            index=models.Index(models.Func(models.F('phone'), models.Value('\\D'), models.Value(''), models.Value('g'), function='REGEXP_REPLACE', output_field=models.CharField()), name='user_phone_digits_idx'),
+        ),
+    ]
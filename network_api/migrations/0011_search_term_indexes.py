@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:07
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('network_api', '0010_phone_lookup_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='computer',
+            index=models.Index(fields=['inventory_number'], name='computer_inventory_number_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='department',
+            index=models.Index(fields=['room_number'], name='department_room_number_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='network',
+            index=models.Index(fields=['vlan'], name='network_vlan_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:31
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('network_api', '0012_idempotency_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('entity_type', models.CharField(max_length=30)),
+                ('object_id', models.BigIntegerField()),
+                ('operation', models.CharField(max_length=10)),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('published_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Событие изменения',
+                'verbose_name_plural': 'Журнал изменений',
+                'db_table': 'Outbox_Event',
+                'abstract': False,
+                'managed': True,
+                'indexes': [models.Index(condition=models.Q(('published_at__isnull', True)), fields=['id'], name='outbox_event_pending_idx'), models.Index(fields=['published_at'], name='outbox_event_published_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('network_api', '0014_outbox_transaction_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModelVersion',
+            fields=[
+                ('label', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField()),
+            ],
+            options={
+                'verbose_name': 'Версия данных модели',
+                'verbose_name_plural': 'Версии данных моделей',
+                'db_table': 'Model_Version',
+                'abstract': False,
+                'managed': True,
+            },
+        ),
+    ]
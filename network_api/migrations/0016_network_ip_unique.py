@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:06
+
+from django.db import migrations, models
+
+
+def check_duplicates(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT "Network_id", host(ip_address), array_agg(id ORDER BY id) FROM "Network_Computer" '
+            'GROUP BY "Network_id", ip_address HAVING count(*) > 1 ORDER BY min(id) LIMIT 20'
+        )
+        duplicates = [
+            f'сеть {network_id}, {address}: id {", ".join(map(str, ids))}'
+            for network_id, address, ids in cursor.fetchall()
+        ]
+
+    if duplicates:
+        raise ValueError(
+            'Найдены повторяющиеся IP-адреса в сетях, устраните их перед миграцией: ' + '; '.join(duplicates)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('network_api', '0015_model_versions'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='networkcomputer',
+            constraint=models.UniqueConstraint(fields=('network', 'ip_address'), name='netcomp_network_ip_uniq'),
+        ),
+    ]
@@ -1,4 +1,18 @@
+import hashlib
+
+from .services.bulk_links import assign_links, unassign_links
+from .services.cache_versions import model_versions
 from .services.export_utils import export_queryset_to_excel
+from .services.facets import DEFAULT_FACET_LIMIT, facet_counts
+from .services.idempotency import IdempotencyError, claim_key, release_key, request_fingerprint, store_response
+from .services.ip_allocator import AllocationError
+from .services.selections import SelectionError
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.decorators import action
 
@@ -68,4 +82,251 @@ class ExportMixin:
             if key not in ['format', 'page', 'page_size'] and value:
                 filters.append(f"{key}_{value}")
 
-        return "_".join(filters) if filters else "all"
\ No newline at end of file
+        return "_".join(filters) if filters else "all"
+
+
+class UniqueConstraintMixin:
+    unique_constraint_errors = {}
+
+    def create(self, request, *args, **kwargs):
+        try:
+            with transaction.atomic():
+                return super().create(request, *args, **kwargs)
+        except IntegrityError as e:
+            return self.unique_constraint_response(e)
+
+    def update(self, request, *args, **kwargs):
+        try:
+            with transaction.atomic():
+                return super().update(request, *args, **kwargs)
+        except IntegrityError as e:
+            return self.unique_constraint_response(e)
+
+    def unique_constraint_message(self, error):
+        diag = getattr(error.__cause__, 'diag', None)
+        return self.unique_constraint_errors.get(getattr(diag, 'constraint_name', None))
+
+    def unique_constraint_response(self, error):
+        message = self.unique_constraint_message(error)
+        if message is None:
+            raise error
+
+        return Response({'error': message}, status=status.HTTP_400_BAD_REQUEST)
+
+    def integrity_error_response(self, error):
+        message = self.unique_constraint_message(error)
+        if message is None:
+            return Response({'error': 'Нарушение целостности данных'}, status=status.HTTP_409_CONFLICT)
+
+        return Response({'error': message}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class FacetsMixin:
+    facet_fields = {}
+    facet_cache_models = ()
+
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        requested = request.query_params.get('facet', '').split(',')
+        facets = {
+            name: paths for name, paths in self.facet_fields.items() if name in requested
+        } or self.facet_fields
+
+        try:
+            limit = max(int(request.query_params.get('facet_limit', DEFAULT_FACET_LIMIT)), 1)
+        except ValueError:
+            limit = DEFAULT_FACET_LIMIT
+
+        queryset = self.filter_queryset(self.get_queryset())
+
+        timeout = getattr(settings, 'FACETS_CACHE_SECONDS', 0)
+        if not timeout:
+            return Response(facet_counts(queryset, facets, limit))
+
+        cache_key = self.facets_cache_key(request, queryset.model)
+        data = cache.get(cache_key)
+        if data is None:
+            data = facet_counts(queryset, facets, limit)
+            cache.set(cache_key, data, timeout)
+        return Response(data)
+
+    def facets_cache_key(self, request, model):
+        params = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+        digest = hashlib.md5(repr(params).encode()).hexdigest()
+        versions = model_versions(model, *self.facet_cache_models)
+        return f'facets:{model._meta.label_lower}:{versions}:{digest}'
+
+
+class BulkLinkMixin:
+
+    @action(detail=False, methods=['post'])
+    def assign(self, request):
+        return self.bulk_link_response(assign_links, request)
+
+    @action(detail=False, methods=['post'])
+    def unassign(self, request):
+        return self.bulk_link_response(unassign_links, request)
+
+    def bulk_link_response(self, operation, request):
+        try:
+            return Response(operation(self.queryset.model, request.data))
+        except SelectionError as e:
+            return Response({'error': e.args[0]}, status=status.HTTP_400_BAD_REQUEST)
+        except AllocationError as e:
+            return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+
+
+class NotModified(Exception):
+
+    def __init__(self, etag):
+        self.etag = etag
+
+
+class PreconditionFailed(Exception):
+
+    def __init__(self, etag):
+        self.etag = etag
+
+
+def row_version(model, pk, lock=False):
+    try:
+        pk = model._meta.pk.to_python(pk)
+    except ValidationError:
+        return None
+
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT xmin::text FROM {qn(model._meta.db_table)} WHERE {qn(model._meta.pk.column)} = %s'
+            f'{" FOR UPDATE" if lock else ""}',
+            [pk]
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def strip_weak(etags):
+    return [etag[2:] if etag.startswith('W/') else etag for etag in etags]
+
+
+class ConditionalRequestMixin:
+    etag_models = ()
+    etag_actions = ('list', 'retrieve')
+    etag_write_actions = ('update', 'partial_update', 'destroy')
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in ('PUT', 'PATCH', 'DELETE') and 'HTTP_IF_MATCH' in request.META:
+            with transaction.atomic():
+                return super().dispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag = None
+        if not getattr(settings, 'CONDITIONAL_REQUESTS', True):
+            return
+
+        if request.method in ('GET', 'HEAD') and self.action in self.etag_actions:
+            self.etag = self.compute_etag(request)
+            if self.etag and self.etag in strip_weak(parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))):
+                raise NotModified(self.etag)
+
+        elif self.action in self.etag_write_actions and 'HTTP_IF_MATCH' in request.META:
+            current = self.compute_etag(request, lock=True)
+            expected = parse_etags(request.META['HTTP_IF_MATCH'])
+            if current is None or (expected != ['*'] and current not in expected):
+                raise PreconditionFailed(current)
+
+    def compute_etag(self, request, lock=False):
+        model = self.queryset.model
+        if self.detail:
+            version = row_version(model, self.kwargs.get(self.lookup_url_kwarg or self.lookup_field), lock)
+            if version is None:
+                return None
+            related = [related_model for related_model in self.etag_models if related_model is not model]
+            parts = ['detail', self.kwargs.get(self.lookup_url_kwarg or self.lookup_field), version,
+                     model_versions(*related)]
+        else:
+            parts = ['list', request.get_full_path(), model_versions(model, *self.etag_models)]
+        return quote_etag(hashlib.md5(f'{model._meta.label_lower}|{"|".join(map(str, parts))}'.encode()).hexdigest())
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': exc.etag})
+        if isinstance(exc, PreconditionFailed):
+            headers = {'ETag': exc.etag} if exc.etag else {}
+            return Response(
+                {'error': 'Запись изменилась с момента загрузки, обновите данные и повторите'},
+                status=status.HTTP_412_PRECONDITION_FAILED,
+                headers=headers
+            )
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        etag = getattr(self, 'etag', None)
+        if etag and response.status_code == status.HTTP_200_OK and not response.has_header('ETag'):
+            response['ETag'] = etag
+        return response
+
+
+class IdempotentReplay(Exception):
+
+    def __init__(self, status_code, data, replayed=True):
+        self.status_code = status_code
+        self.data = data
+        self.replayed = replayed
+
+
+class IdempotencyMixin:
+    idempotent_actions = ('create',)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.idempotency_claim = None
+        key = request.headers.get('Idempotency-Key')
+        if key is None or self.action not in self.idempotent_actions:
+            return
+
+        scope = f'{self.basename}.{self.action}'
+        if request.user.is_authenticated:
+            scope += f':{request.user.pk}'
+        fingerprint = request_fingerprint(request.method, request.get_full_path(), request.body)
+        claim = claim_key(scope, key.strip(), fingerprint)
+
+        if not claim.owned:
+            if claim.fingerprint != fingerprint:
+                raise IdempotencyError('Idempotency-Key уже использован для другого запроса')
+            if claim.status_code is None:
+                raise IdempotentReplay(
+                    status.HTTP_409_CONFLICT,
+                    {'error': 'Запрос с этим Idempotency-Key ещё выполняется, повторите позже'},
+                    replayed=False
+                )
+            raise IdempotentReplay(claim.status_code, claim.response)
+        self.idempotency_claim = claim
+
+    def handle_exception(self, exc):
+        if isinstance(exc, IdempotentReplay):
+            headers = {'Idempotent-Replayed': 'true'} if exc.replayed else {}
+            return Response(exc.data, status=exc.status_code, headers=headers)
+        if isinstance(exc, IdempotencyError):
+            return Response({'error': str(exc)}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        try:
+            return super().handle_exception(exc)
+        except Exception:
+            claim = getattr(self, 'idempotency_claim', None)
+            if claim is not None:
+                release_key(claim)
+            raise
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        claim = getattr(self, 'idempotency_claim', None)
+        if claim is not None:
+            self.idempotency_claim = None
+            if response.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+                release_key(claim)
+            else:
+                store_response(claim, response.status_code, getattr(response, 'data', None))
+        return response
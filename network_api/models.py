@@ -1,5 +1,26 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models import F, Func, Value
+from django.db.models.functions import Upper
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, GistIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.utils import timezone
+
+from .fields import CidrField, InetAddressField, MacAddressField
+from .services.licensing import LicenseClass, classify_license
+
+
+def trigram_index(field_name, name):
+    return GinIndex(OpClass(Upper(field_name), name='gin_trgm_ops'), name=name)
+
+
+def phone_digits(field_name):
+    return Func(
+        F(field_name), Value(r'\D'), Value(''), Value('g'),
+        function='REGEXP_REPLACE',
+        output_field=models.CharField()
+    )
 
 
 class CustomModel(models.Model):
@@ -24,6 +45,11 @@ class Department(CustomModel):
         db_table = 'Department'
         verbose_name = 'Отдел'
         verbose_name_plural = 'Отделы'
+        indexes = [
+            GinIndex(fields=['employee_phones'], name='department_phones_gin'),
+            models.Index(fields=['internal_phone'], name='department_internal_phone_idx'),
+            models.Index(fields=['room_number'], name='department_room_number_idx'),
+        ]
 
     def __str__(self):
         return f"Отдел {self.room_number} (тел: {self.internal_phone})"
@@ -47,6 +73,14 @@ class Computer(CustomModel):
         db_table = 'Computer'
         verbose_name = 'Компьютер'
         verbose_name_plural = 'Компьютеры'
+        constraints = [
+            models.UniqueConstraint(fields=['serial_number'], name='computer_serial_number_uniq'),
+        ]
+        indexes = [
+            trigram_index('model', 'computer_model_trgm'),
+            trigram_index('os', 'computer_os_trgm'),
+            models.Index(fields=['inventory_number'], name='computer_inventory_number_idx'),
+        ]
 
     def __str__(self):
         return f"{self.model} (SN: {self.serial_number})"
@@ -75,6 +109,15 @@ class User(CustomModel):
         db_table = 'User'
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
+        constraints = [
+            models.UniqueConstraint(fields=['email'], name='user_email_uniq'),
+        ]
+        indexes = [
+            trigram_index('full_name', 'user_full_name_trgm'),
+            trigram_index('email', 'user_email_trgm'),
+            trigram_index('phone', 'user_phone_trgm'),
+            models.Index(phone_digits('phone'), name='user_phone_digits_idx'),
+        ]
 
     def __str__(self):
         return self.full_name
@@ -104,6 +147,14 @@ class Software(CustomModel):
     name = models.CharField(max_length=50)
     version = models.CharField(max_length=100)
     license = models.CharField(max_length=200)
+    license_class = models.CharField(
+        max_length=20,
+        choices=LicenseClass.choices,
+        default=LicenseClass.UNKNOWN,
+        db_index=True
+    )
+    seat_count = models.PositiveIntegerField(null=True, blank=True)
+    installed_count = models.IntegerField(default=0)
     vendor = models.CharField(max_length=200)
     computers = models.ManyToManyField(
         Computer,
@@ -115,10 +166,26 @@ class Software(CustomModel):
         db_table = 'Software'
         verbose_name = 'Программное обеспечение'
         verbose_name_plural = 'Программное обеспечение'
+        indexes = [
+            trigram_index('name', 'software_name_trgm'),
+            trigram_index('version', 'software_version_trgm'),
+            trigram_index('vendor', 'software_vendor_trgm'),
+            trigram_index('license', 'software_license_trgm'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['name', 'version'], name='software_name_version_uniq'),
+        ]
 
     def __str__(self):
         return f"{self.name} {self.version}"
 
+    def save(self, *args, **kwargs):
+        self.license_class = classify_license(self.license)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'license' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'license_class'}
+        super().save(*args, **kwargs)
+
 
 class SoftwareComputer(CustomModel):
     software = models.ForeignKey(
@@ -150,6 +217,9 @@ class Equipment(CustomModel):
         db_table = 'Equipment'
         verbose_name = 'Оборудование'
         verbose_name_plural = 'Оборудование'
+        indexes = [
+            trigram_index('type', 'equipment_type_trgm'),
+        ]
 
     def __str__(self):
         return f"{self.type} (портов: {self.port_count})"
@@ -159,7 +229,7 @@ class Network(CustomModel):
     id = models.BigAutoField(primary_key=True)
     subnet_mask = models.GenericIPAddressField()
     vlan = models.SmallIntegerField()
-    ip_range = models.CharField(max_length=100)
+    ip_range = CidrField()
     equipment = models.ForeignKey(
         Equipment,
         on_delete=models.CASCADE,
@@ -175,6 +245,10 @@ class Network(CustomModel):
         db_table = 'Network'
         verbose_name = 'Сеть'
         verbose_name_plural = 'Сети'
+        indexes = [
+            GistIndex(fields=['ip_range'], opclasses=['inet_ops'], name='network_ip_range_gist'),
+            models.Index(fields=['vlan'], name='network_vlan_idx'),
+        ]
 
     def __str__(self):
         return f"VLAN {self.vlan} ({self.ip_range})"
@@ -192,17 +266,46 @@ class NetworkComputer(CustomModel):
         on_delete=models.CASCADE,
         db_column='Computer_id'
     )
-    ip_address = models.GenericIPAddressField()
-    mac_address = models.CharField(max_length=17)
+    ip_address = InetAddressField()
+    mac_address = MacAddressField()
     speed = models.IntegerField()
 
     class Meta(CustomModel.Meta):
         db_table = 'Network_Computer'
         unique_together = [['network', 'computer']]
+        constraints = [
+            models.UniqueConstraint(fields=['network', 'ip_address'], name='netcomp_network_ip_uniq'),
+        ]
+        indexes = [
+            GistIndex(fields=['ip_address'], opclasses=['inet_ops'], name='netcomp_ip_address_gist'),
+            models.Index(fields=['mac_address'], name='netcomp_mac_address_idx'),
+        ]
         verbose_name = 'Сеть-Компьютер'
         verbose_name_plural = 'Связи Сеть-Компьютер'
 
 
+class IpAddressPool(CustomModel):
+    network = models.OneToOneField(
+        Network,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='address_pool',
+        db_column='Network_id'
+    )
+    ip_range = CidrField()
+    size = models.BigIntegerField()
+    used = models.BinaryField()
+    reserved = models.BinaryField()
+
+    class Meta(CustomModel.Meta):
+        db_table = 'Ip_Address_Pool'
+        verbose_name = 'Пул IP-адресов'
+        verbose_name_plural = 'Пулы IP-адресов'
+
+    def __str__(self):
+        return f"Пул {self.ip_range}"
+
+
 class Server(CustomModel):
     id = models.BigAutoField(primary_key=True)
     port = models.IntegerField()
@@ -246,8 +349,8 @@ class ServerNetwork(CustomModel):
 class HostComputer(CustomModel):
     id = models.BigAutoField(primary_key=True)
     hostname = models.CharField(max_length=100)
-    ip_address = models.GenericIPAddressField()
-    mac_address = models.CharField(max_length=17)
+    ip_address = InetAddressField()
+    mac_address = MacAddressField()
     department = models.ForeignKey(
         Department,
         on_delete=models.SET_NULL,
@@ -260,6 +363,104 @@ class HostComputer(CustomModel):
         db_table = 'Host_Computer'
         verbose_name = 'Хост-компьютер'
         verbose_name_plural = 'Хост-компьютеры'
+        indexes = [
+            trigram_index('hostname', 'host_hostname_trgm'),
+            GistIndex(fields=['ip_address'], opclasses=['inet_ops'], name='host_ip_address_gist'),
+            models.Index(fields=['mac_address'], name='host_mac_address_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.hostname} ({self.ip_address})"
+
+
+class SearchEntry(CustomModel):
+    id = models.BigAutoField(primary_key=True)
+    entity_type = models.CharField(max_length=30)
+    object_id = models.BigIntegerField()
+    title = models.CharField(max_length=255)
+    subtitle = models.CharField(max_length=255, blank=True)
+    document = models.TextField()
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('title', weight='A', config='simple') +
+            SearchVector('document', weight='B', config='simple')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True
+    )
+
+    class Meta(CustomModel.Meta):
+        db_table = 'Search_Entry'
+        verbose_name = 'Поисковая запись'
+        verbose_name_plural = 'Поисковый индекс'
+        constraints = [
+            models.UniqueConstraint(fields=['entity_type', 'object_id'], name='search_entry_object_uniq'),
+        ]
+        indexes = [
+            GinIndex(fields=['search_vector'], name='search_entry_vector_gin'),
+            trigram_index('document', 'search_entry_document_trgm'),
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type}:{self.object_id} {self.title}"
+
+
+class IdempotencyKey(CustomModel):
+    id = models.BigAutoField(primary_key=True)
+    scope = models.CharField(max_length=100)
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.SmallIntegerField(null=True)
+    response = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta(CustomModel.Meta):
+        db_table = 'Idempotency_Key'
+        verbose_name = 'Ключ идемпотентности'
+        verbose_name_plural = 'Ключи идемпотентности'
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'key'], name='idempotency_key_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['created_at'], name='idempotency_key_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.scope}:{self.key}"
+
+
+class OutboxEvent(CustomModel):
+    id = models.BigAutoField(primary_key=True)
+    entity_type = models.CharField(max_length=30)
+    object_id = models.BigIntegerField()
+    operation = models.CharField(max_length=10)
+    payload = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    transaction_id = models.BigIntegerField(null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    published_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta(CustomModel.Meta):
+        db_table = 'Outbox_Event'
+        verbose_name = 'Событие изменения'
+        verbose_name_plural = 'Журнал изменений'
+        indexes = [
+            models.Index(fields=['id'], condition=models.Q(published_at__isnull=True), name='outbox_event_pending_idx'),
+            models.Index(fields=['published_at'], name='outbox_event_published_idx'),
+            models.Index(fields=['transaction_id'], name='outbox_event_transaction_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.operation} {self.entity_type}:{self.object_id}"
+
+
+class ModelVersion(CustomModel):
+    label = models.CharField(max_length=100, primary_key=True)
+    version = models.BigIntegerField()
+
+    class Meta(CustomModel.Meta):
+        db_table = 'Model_Version'
+        verbose_name = 'Версия данных модели'
+        verbose_name_plural = 'Версии данных моделей'
 
     def __str__(self):
-        return f"{self.hostname} ({self.ip_address})"
\ No newline at end of file
+        return f"{self.label}:{self.version}"
@@ -0,0 +1,112 @@
+from django.conf import settings
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connection
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+
+
+def estimate_count(queryset):
+    query = queryset.query
+    if not query.where and not query.distinct and not query.group_by and not query.combinator:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [connection.ops.quote_name(queryset.model._meta.db_table)]
+            )
+            row = cursor.fetchone()
+        if row and row[0] >= 0:
+            return row[0]
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedPage(Page):
+
+    def __init__(self, object_list, number, paginator, has_more):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self):
+        return self.has_more
+
+
+class EstimatedCountPaginator(Paginator):
+
+    def __init__(self, object_list, per_page, estimate=False, threshold=0, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.estimate = estimate
+        self.threshold = threshold
+        self.count_is_estimate = False
+
+    @cached_property
+    def estimated_count(self):
+        if not self.estimate:
+            return None
+        estimated = estimate_count(self.object_list)
+        return estimated if estimated >= self.threshold else None
+
+    @cached_property
+    def count(self):
+        if self.estimated_count is None:
+            return super().count
+        self.count_is_estimate = True
+        return self.estimated_count
+
+    def validate_number(self, number):
+        if self.estimated_count is None:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('Номер страницы должен быть целым числом')
+        if number < 1:
+            raise EmptyPage('Номер страницы меньше 1')
+        return number
+
+    def page(self, number):
+        if self.estimated_count is None:
+            return super().page(number)
+
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        items = list(self.object_list[bottom:bottom + self.per_page + 1])
+        has_more = len(items) > self.per_page
+        items = items[:self.per_page]
+
+        if not items and number > 1:
+            raise EmptyPage('На этой странице нет результатов')
+
+        seen = bottom + len(items)
+        if not has_more:
+            self.count = seen
+            self.count_is_estimate = False
+        elif self.count <= seen:
+            self.count = seen + 1
+        return EstimatedPage(items, number, self, has_more)
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    count_query_param = 'count'
+
+    def django_paginator_class(self, object_list, per_page):
+        return EstimatedCountPaginator(
+            object_list,
+            per_page,
+            estimate=self.request.query_params.get(self.count_query_param) == 'estimate',
+            threshold=getattr(settings, 'ESTIMATED_COUNT_THRESHOLD', 100000)
+        )
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        response.data['count_is_estimate'] = self.page.paginator.count_is_estimate
+        return response
+
+
+class StandardResultsSetPagination(EstimatedCountPagination):
+    page_size = 25
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -1,8 +1,29 @@
 from rest_framework import serializers
+from rest_framework.validators import UniqueTogetherValidator, UniqueValidator
 from .models import (
     Department, Computer, User, Software, Network, NetworkComputer,
     Equipment, HostComputer, Server, SoftwareComputer, UserComputer, ServerNetwork
 )
+from .fields import parse_mac, parse_network
+from .services.licensing import RENEWAL_CLASSES
+
+
+class DatabaseUniquenessMixin:
+
+    def build_standard_field(self, field_name, model_field):
+        field_class, field_kwargs = super().build_standard_field(field_name, model_field)
+        if 'validators' in field_kwargs:
+            field_kwargs['validators'] = [
+                validator for validator in field_kwargs['validators']
+                if not isinstance(validator, UniqueValidator)
+            ]
+        return field_class, field_kwargs
+
+    def get_validators(self):
+        return [
+            validator for validator in super().get_validators()
+            if not isinstance(validator, UniqueTogetherValidator)
+        ]
 
 
 class DepartmentSerializer(serializers.ModelSerializer):
@@ -128,7 +149,7 @@ class DepartmentSerializer(serializers.ModelSerializer):
             })
         return attrs
 
-class ComputerSerializer(serializers.ModelSerializer):
+class ComputerSerializer(DatabaseUniquenessMixin, serializers.ModelSerializer):
     department_info = serializers.SerializerMethodField()
     users_count = serializers.SerializerMethodField()
     software_list = serializers.SerializerMethodField()
@@ -163,21 +184,8 @@ class ComputerSerializer(serializers.ModelSerializer):
             return network_conn.speed if network_conn else 0
         return 0
 
-    def validate_serial_number(self, value):
-        instance = self.instance
-        if instance:
-            exists = Computer.objects.filter(
-                serial_number=value
-            ).exclude(id=instance.id).exists()
-        else:
-            exists = Computer.objects.filter(serial_number=value).exists()
-
-        if exists:
-            raise serializers.ValidationError("Компьютер с таким серийным номером уже существует")
-        return value
-
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DatabaseUniquenessMixin, serializers.ModelSerializer):
     department_room = serializers.CharField(
         source='department.room_number',
         read_only=True
@@ -227,21 +235,17 @@ class UserSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class SoftwareSerializer(serializers.ModelSerializer):
-    installed_count = serializers.SerializerMethodField()
+class SoftwareSerializer(DatabaseUniquenessMixin, serializers.ModelSerializer):
     popular_os = serializers.SerializerMethodField()
     needs_license_renewal = serializers.SerializerMethodField()
 
     class Meta:
         model = Software
         fields = [
-            'id', 'name', 'version', 'license', 'vendor',
+            'id', 'name', 'version', 'license', 'license_class', 'seat_count', 'vendor',
             'installed_count', 'popular_os', 'needs_license_renewal'
         ]
-        read_only_fields = ['installed_count', 'popular_os', 'needs_license_renewal']
-
-    def get_installed_count(self, obj):
-        return obj.computers.count() if hasattr(obj, 'computers') else 0
+        read_only_fields = ['license_class', 'installed_count', 'popular_os', 'needs_license_renewal']
 
     def get_popular_os(self, obj):
         if hasattr(obj, 'computers'):
@@ -250,10 +254,23 @@ class SoftwareSerializer(serializers.ModelSerializer):
         return []
 
     def get_needs_license_renewal(self, obj):
-        return 'trial' in obj.license.lower() or 'expired' in obj.license.lower()
+        return obj.license_class in RENEWAL_CLASSES
+
+
+class MacAddressField(serializers.CharField):
+    default_error_messages = {
+        'invalid': 'Укажите MAC-адрес, например 00:1a:2b:3c:4d:5e',
+    }
+
+    def to_internal_value(self, data):
+        mac = parse_mac(super().to_internal_value(data))
+        if mac is None:
+            self.fail('invalid')
+        return mac
 
 
 class NetworkComputerSerializer(serializers.ModelSerializer):
+    mac_address = MacAddressField()
     computer_model = serializers.CharField(source='computer.model', read_only=True)
     network_vlan = serializers.IntegerField(source='network.vlan', read_only=True)
 
@@ -264,6 +281,17 @@ class NetworkComputerSerializer(serializers.ModelSerializer):
         read_only_fields = ['computer_model', 'network_vlan']
 
 
+class IpAllocationSerializer(serializers.Serializer):
+    computer = serializers.PrimaryKeyRelatedField(queryset=Computer.objects.all())
+    mac_address = MacAddressField()
+    speed = serializers.IntegerField(min_value=1)
+
+
+class IpRangeSerializer(serializers.Serializer):
+    start = serializers.IPAddressField()
+    end = serializers.IPAddressField(required=False)
+
+
 class NetworkSerializer(serializers.ModelSerializer):
     equipment_port_count = serializers.IntegerField(source='equipment.port_count', read_only=True)
     equipment_type = serializers.CharField(source='equipment.type', read_only=True)
@@ -282,6 +310,12 @@ class NetworkSerializer(serializers.ModelSerializer):
             'equipment': {'required': True}
         }
 
+    def validate_ip_range(self, value):
+        network = parse_network(value)
+        if network is None:
+            raise serializers.ValidationError("Укажите сеть в формате CIDR, например 192.168.10.0/24")
+        return str(network)
+
 
 class EquipmentSerializer(serializers.ModelSerializer):
     type_of_bandwidth = serializers.SerializerMethodField()
@@ -301,6 +335,7 @@ class EquipmentSerializer(serializers.ModelSerializer):
 
 
 class HostComputerSerializer(serializers.ModelSerializer):
+    mac_address = MacAddressField()
     department_room = serializers.CharField(
         source='department.room_number',
         read_only=True
@@ -0,0 +1,210 @@
+from bisect import bisect_left, insort
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+
+WORD_SEPARATORS = ' -_./()'
+LOAD_CHUNK_SIZE = 5000
+
+AUTOCOMPLETE_FIELDS = {
+    'host_computer': ('network_api.HostComputer', 'hostname'),
+    'computer_model': ('network_api.Computer', 'model'),
+    'user': ('network_api.User', 'full_name'),
+    'software': ('network_api.Software', 'name'),
+}
+
+
+def normalize(value):
+    return ' '.join(str(value).split()).casefold()
+
+
+def word_suffixes(value):
+    normalized = normalize(value)
+    for position, char in enumerate(normalized):
+        if char in WORD_SEPARATORS:
+            continue
+        if position == 0 or normalized[position - 1] in WORD_SEPARATORS:
+            yield normalized[position:]
+
+
+class PrefixIndex:
+
+    def __init__(self, model_label, field_name):
+        self.model_label = model_label
+        self.field_name = field_name
+        self.loaded_at = None
+        self._keys = []
+        self._owners = {}
+        self._values = {}
+        self._pending = None
+        self._refreshing = False
+        self.refresh_thread = None
+        self._lock = threading.RLock()
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def is_stale(self):
+        refresh = getattr(settings, 'AUTOCOMPLETE_REFRESH_SECONDS', 300)
+        return bool(refresh) and time.monotonic() - self.loaded_at > refresh
+
+    def load(self):
+        with self._lock:
+            self._pending = []
+        rows = self.model.objects.exclude(**{self.field_name: ''}).values_list('pk', self.field_name)
+
+        owners = {}
+        values = {}
+        for pk, value in rows.iterator(chunk_size=LOAD_CHUNK_SIZE):
+            owners.setdefault(value, set()).add(pk)
+            values[pk] = value
+
+        keys = sorted((key, value) for value in owners for key in word_suffixes(value))
+
+        with self._lock:
+            self._keys, self._owners, self._values = keys, owners, values
+            self.loaded_at = time.monotonic()
+            pending, self._pending = self._pending, None
+            for pk, value in pending:
+                self._set(pk, value)
+
+    def refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        self.refresh_thread = threading.Thread(target=self._refresh, daemon=True)
+        self.refresh_thread.start()
+
+    def _refresh(self):
+        try:
+            self.load()
+        finally:
+            self._refreshing = False
+            connection.close()
+
+    def ensure_loaded(self):
+        if self.loaded_at is None:
+            self.load()
+        elif self.is_stale():
+            self.refresh_in_background()
+
+    def add(self, pk, value):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((pk, value))
+            if self.loaded_at is not None:
+                self._set(pk, value)
+
+    def _set(self, pk, value):
+        if self._values.get(pk) == value:
+            return
+        self._discard(pk)
+        if not value:
+            return
+
+        self._values[pk] = value
+        owners = self._owners.setdefault(value, set())
+        if not owners:
+            for key in word_suffixes(value):
+                insort(self._keys, (key, value))
+        owners.add(pk)
+
+    def discard(self, pk):
+        self.add(pk, None)
+
+    def _discard(self, pk):
+        value = self._values.pop(pk, None)
+        if value is None:
+            return
+
+        owners = self._owners.get(value, set())
+        owners.discard(pk)
+        if owners:
+            return
+
+        del self._owners[value]
+        for key in word_suffixes(value):
+            position = bisect_left(self._keys, (key, value))
+            if position < len(self._keys) and self._keys[position] == (key, value):
+                del self._keys[position]
+
+    def search(self, prefix, limit=10):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        matches = []
+        seen = set()
+        with self._lock:
+            position = bisect_left(self._keys, (prefix,))
+            while position < len(self._keys) and len(matches) < limit:
+                key, value = self._keys[position]
+                if not key.startswith(prefix):
+                    break
+                if value not in seen:
+                    seen.add(value)
+                    owners = self._owners[value]
+                    matches.append({'value': value, 'id': min(owners), 'count': len(owners)})
+                position += 1
+        return matches
+
+
+INDEXES = {
+    index_type: PrefixIndex(model_label, field_name)
+    for index_type, (model_label, field_name) in AUTOCOMPLETE_FIELDS.items()
+}
+
+
+def indexes_for(model):
+    label = model._meta.label
+    return [index for index in INDEXES.values() if index.model_label == label]
+
+
+def _apply(changes):
+    for index, pk, value in changes:
+        if value is None:
+            index.discard(pk)
+        else:
+            index.add(pk, value)
+
+
+def update_instance(instance):
+    changes = [(index, instance.pk, getattr(instance, index.field_name)) for index in indexes_for(type(instance))]
+    transaction.on_commit(lambda: _apply(changes))
+
+
+def remove_instance(instance):
+    changes = [(index, instance.pk, None) for index in indexes_for(type(instance))]
+    transaction.on_commit(lambda: _apply(changes))
+
+
+def update_rows(model, pks):
+    pks = list(pks)
+    for index in indexes_for(model):
+        if index.loaded_at is None:
+            continue
+        for start in range(0, len(pks), LOAD_CHUNK_SIZE):
+            chunk = pks[start:start + LOAD_CHUNK_SIZE]
+            values = dict(model.objects.filter(pk__in=chunk).values_list('pk', index.field_name))
+            _apply([(index, pk, values.get(pk)) for pk in chunk])
+
+
+def reset(model=None):
+    for index in (indexes_for(model) if model else INDEXES.values()):
+        index.loaded_at = None
+
+
+def suggest(prefix, index_types=None, limit=10):
+    results = []
+    for index_type in index_types or INDEXES:
+        index = INDEXES[index_type]
+        index.ensure_loaded()
+        results.extend(
+            {'type': index_type, **match} for match in index.search(prefix, limit)
+        )
+    return results
@@ -0,0 +1,732 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+import zlib
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.color import no_style
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from network_api.services import autocomplete
+from network_api.services.cache_versions import bump_versions
+from network_api.services.licensing import recount_installations
+from network_api.services.outbox import OPERATION_RESET, entity_type, record_reset
+from network_api.services.search_index import index_objects
+
+BACKUP_FORMAT = 'copy'
+BACKUP_FORMAT_VERSION = 1
+BACKUP_FULL = 'full'
+BACKUP_INCREMENTAL = 'incremental'
+BACKUP_TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S'
+COPY_BUFFER_SIZE = 1024 * 1024
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+DEFAULT_EXCLUDE = [
+    'contenttypes', 'auth.permission', 'sessions', 'network_api.idempotencykey', 'network_api.outboxevent',
+    'network_api.modelversion'
+]
+DERIVED_MODELS = ['network_api.searchentry']
+TABLE_KEYS = ('model', 'table', 'file', 'columns', 'rows', 'sha256')
+
+Compression = namedtuple('Compression', ['extension', 'writer', 'reader'])
+
+
+class BackupError(Exception):
+    pass
+
+
+class IncrementalBackupError(BackupError):
+    pass
+
+
+def zstd_module():
+    try:
+        import zstandard
+    except ImportError:
+        raise BackupError('Для сжатия zstd установите пакет zstandard')
+    return zstandard
+
+
+def zstd_writer(path):
+    return zstd_module().ZstdCompressor(level=ZSTD_LEVEL).stream_writer(open(path, 'wb'), closefd=True)
+
+
+def zstd_reader(path):
+    return zstd_module().ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+
+
+COMPRESSIONS = {
+    None: Compression('', lambda path: open(path, 'wb'), lambda path: open(path, 'rb')),
+    'gzip': Compression('.gz', lambda path: gzip.open(path, 'wb', compresslevel=GZIP_LEVEL), gzip.open),
+    'zstd': Compression('.zst', zstd_writer, zstd_reader),
+}
+
+
+def backup_models(exclude=()):
+    excluded = {label.lower() for label in [*DEFAULT_EXCLUDE, *exclude]}
+    known = {model._meta.label_lower for model in apps.get_models(include_auto_created=True)}
+    known |= {config.label for config in apps.get_app_configs()}
+    unknown = excluded - known
+    if unknown:
+        raise BackupError(f'Неизвестные модели: {", ".join(sorted(unknown))}')
+
+    return [
+        model for model in apps.get_models(include_auto_created=True)
+        if model._meta.managed and not model._meta.proxy
+        and model._meta.app_label not in excluded and model._meta.label_lower not in excluded
+    ]
+
+
+def table_columns(model):
+    return [field.column for field in model._meta.concrete_fields if not getattr(field, 'generated', False)]
+
+
+def copy_sql(model, columns, direction, keys=None):
+    qn = connection.ops.quote_name
+    column_list = ', '.join(qn(column) for column in columns)
+    if direction != 'out':
+        return f'COPY {qn(model._meta.db_table)} ({column_list}) FROM STDIN'
+    if keys is None:
+        return f'COPY {qn(model._meta.db_table)} ({column_list}) TO STDOUT'
+    return (
+        f'COPY (SELECT {column_list} FROM {qn(model._meta.db_table)} '
+        f'WHERE {qn(model._meta.pk.column)} = ANY({keys})) TO STDOUT'
+    )
+
+
+class ChecksumWriter:
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.digest = hashlib.sha256()
+        self.rows = 0
+        self.bytes = 0
+
+    def write(self, data):
+        if isinstance(data, str):
+            data = data.encode()
+        self.digest.update(data)
+        self.rows += data.count(b'\n')
+        self.bytes += len(data)
+        self.stream.write(data)
+        return len(data)
+
+
+class ChecksumReader:
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.digest = hashlib.sha256()
+        self.rows = 0
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.digest.update(data)
+        self.rows += data.count(b'\n')
+        return data
+
+    def readline(self, size=-1):
+        data = self.stream.readline(size)
+        self.digest.update(data)
+        self.rows += data.count(b'\n')
+        return data
+
+
+def table_filename(model, compression, kind='copy'):
+    return f'{model._meta.db_table}.{kind}{COMPRESSIONS[compression].extension}'
+
+
+def dump_table(cursor, model, directory, compression, keys=None):
+    columns = table_columns(model)
+    filename = table_filename(model, compression)
+    started = time.monotonic()
+    keys_literal = None if keys is None else cursor.mogrify('%s::bigint[]', [keys]).decode()
+    with COMPRESSIONS[compression].writer(os.path.join(directory, filename)) as stream:
+        writer = ChecksumWriter(stream)
+        cursor.copy_expert(copy_sql(model, columns, 'out', keys_literal), writer, size=COPY_BUFFER_SIZE)
+
+    table = {
+        'model': model._meta.label_lower,
+        'table': model._meta.db_table,
+        'file': filename,
+        'columns': columns,
+        'rows': writer.rows,
+        'bytes': writer.bytes,
+        'sha256': writer.digest.hexdigest(),
+        'seconds': round(time.monotonic() - started, 3),
+    }
+    if keys is not None:
+        table.update(dump_keys(model, keys, directory, compression))
+    return table
+
+
+def dump_keys(model, keys, directory, compression):
+    filename = table_filename(model, compression, 'keys')
+    with COMPRESSIONS[compression].writer(os.path.join(directory, filename)) as stream:
+        writer = ChecksumWriter(stream)
+        writer.write(''.join(f'{key}\n' for key in keys))
+    return {
+        'mode': 'changes',
+        'keys_file': filename,
+        'keys': writer.rows,
+        'keys_sha256': writer.digest.hexdigest(),
+    }
+
+
+def read_keys(directory, table, compression):
+    with COMPRESSIONS[compression].reader(os.path.join(directory, table['keys_file'])) as stream:
+        data = stream.read()
+    if hashlib.sha256(data).hexdigest() != table['keys_sha256']:
+        raise BackupError(f'Таблица {table["table"]}: список изменённых строк повреждён')
+    return [int(key) for key in data.split()]
+
+
+def current_snapshot(cursor):
+    cursor.execute('SELECT pg_current_snapshot()::text')
+    return cursor.fetchone()[0]
+
+
+def run_parallel(jobs, func, items):
+    def worker(item):
+        try:
+            return func(item)
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(worker, item) for item in items]
+        try:
+            return [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+
+def table_sizes(models):
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT pg_total_relation_size(to_regclass(name)) FROM unnest(%s::text[]) AS name',
+            [[qn(model._meta.db_table) for model in models]]
+        )
+        return {model: size or 0 for model, (size,) in zip(models, cursor.fetchall())}
+
+
+def dump_in_snapshot(snapshot, model, directory, compression):
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY')
+        cursor.execute('SET TRANSACTION SNAPSHOT %s', [snapshot])
+        return dump_table(cursor, model, directory, compression)
+
+
+def create_backup(directory, compression=None, exclude=(), progress=None, jobs=1):
+    if compression not in COMPRESSIONS:
+        raise BackupError(f'Неизвестный метод сжатия: {compression}')
+    if compression == 'zstd':
+        zstd_module()
+
+    models = backup_models(exclude)
+    os.makedirs(directory)
+    started = time.monotonic()
+
+    def dumped(table):
+        if progress:
+            progress(table)
+        return table
+
+    snapshot = not connection.in_atomic_block
+    if jobs > 1 and not snapshot:
+        raise BackupError('Параллельная выгрузка невозможна внутри открытой транзакции')
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        if snapshot:
+            cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY')
+        db_snapshot = current_snapshot(cursor)
+        if jobs > 1:
+            cursor.execute('SELECT pg_export_snapshot()')
+            snapshot_id = cursor.fetchone()[0]
+            sizes = table_sizes(models)
+            dumped_tables = run_parallel(
+                jobs,
+                lambda model: dumped(dump_in_snapshot(snapshot_id, model, directory, compression)),
+                sorted(models, key=sizes.get, reverse=True)
+            )
+            by_table = {table['table']: table for table in dumped_tables}
+            tables = [by_table[model._meta.db_table] for model in models]
+        else:
+            tables = [dumped(dump_table(cursor, model, directory, compression)) for model in models]
+
+    return {
+        'backup_file': os.path.basename(directory),
+        'timestamp': timezone.now().strftime(BACKUP_TIMESTAMP_FORMAT),
+        'format': BACKUP_FORMAT,
+        'format_version': BACKUP_FORMAT_VERSION,
+        'type': BACKUP_FULL,
+        'snapshot': db_snapshot,
+        'compression': compression,
+        'size_bytes': sum(os.path.getsize(os.path.join(directory, table['file'])) for table in tables),
+        'excluded_models': [*DEFAULT_EXCLUDE, *exclude],
+        'tables_included': [table['table'] for table in tables],
+        'tables': tables,
+        'jobs': jobs,
+        'duration_seconds': round(time.monotonic() - started, 3),
+    }
+
+
+def changed_keys(cursor, since_snapshot):
+    from network_api.models import OutboxEvent
+
+    cursor.execute(
+        f'SELECT entity_type, array_agg(DISTINCT object_id) FILTER (WHERE operation <> %s), '
+        f'bool_or(operation = %s) FROM {connection.ops.quote_name(OutboxEvent._meta.db_table)} '
+        f'WHERE transaction_id >= pg_snapshot_xmin(%s::pg_snapshot)::text::bigint '
+        f'AND NOT pg_visible_in_snapshot(transaction_id::text::xid8, %s::pg_snapshot) '
+        f'GROUP BY entity_type',
+        [OPERATION_RESET, OPERATION_RESET, since_snapshot, since_snapshot]
+    )
+    rows = cursor.fetchall()
+    reset = sorted(entity for entity, _, was_reset in rows if was_reset)
+    if reset:
+        raise IncrementalBackupError(
+            f'После базового бэкапа таблицы {", ".join(reset)} изменены в обход журнала изменений, '
+            f'сделайте полный бэкап'
+        )
+    return {entity: sorted(keys or []) for entity, keys, _ in rows}
+
+
+def check_retention(base_meta):
+    created = datetime.strptime(base_meta['timestamp'], BACKUP_TIMESTAMP_FORMAT).replace(tzinfo=dt_timezone.utc)
+    retention = timedelta(seconds=getattr(settings, 'OUTBOX_RETENTION_SECONDS', 7 * 86400))
+    if timezone.now() - created > retention:
+        raise IncrementalBackupError('Журнал изменений старше срока хранения очищен, сделайте полный бэкап')
+
+
+def create_incremental_backup(directory, base, compression=None, progress=None):
+    from network_api.signals import OUTBOX_MODELS
+
+    base_meta = read_meta(base)
+    if base_meta.get('format') != BACKUP_FORMAT or not base_meta.get('snapshot'):
+        raise BackupError('Базой для инкрементального бэкапа может быть только бэкап в формате copy')
+    if os.path.dirname(os.path.abspath(base)) != os.path.dirname(os.path.abspath(directory)):
+        raise BackupError('Инкрементальный бэкап должен лежать в одном каталоге с базовым')
+    check_retention(base_meta)
+    if compression == 'zstd':
+        zstd_module()
+
+    models = [model for model, _ in backup_tables(base_meta)]
+    started = time.monotonic()
+
+    tables = []
+    snapshot = not connection.in_atomic_block
+    with transaction.atomic(), connection.cursor() as cursor:
+        if snapshot:
+            cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY')
+        db_snapshot = current_snapshot(cursor)
+        changed = changed_keys(cursor, base_meta['snapshot'])
+        os.makedirs(directory)
+        for model in models:
+            if model._meta.label_lower in DERIVED_MODELS:
+                continue
+            keys = changed.get(entity_type(model), []) if model in OUTBOX_MODELS else None
+            table = dump_table(cursor, model, directory, compression, keys)
+            tables.append(table)
+            if progress:
+                progress(table)
+
+    return {
+        'backup_file': os.path.basename(directory),
+        'timestamp': timezone.now().strftime(BACKUP_TIMESTAMP_FORMAT),
+        'format': BACKUP_FORMAT,
+        'format_version': BACKUP_FORMAT_VERSION,
+        'type': BACKUP_INCREMENTAL,
+        'base': os.path.basename(base.rstrip(os.sep)),
+        'since_snapshot': base_meta['snapshot'],
+        'snapshot': db_snapshot,
+        'compression': compression,
+        'size_bytes': sum(
+            os.path.getsize(os.path.join(directory, name))
+            for table in tables for name in (table['file'], table.get('keys_file')) if name
+        ),
+        'excluded_models': base_meta.get('excluded_models', []),
+        'tables_included': [table['table'] for table in tables],
+        'tables': tables,
+        'changed_rows': sum(table.get('keys', 0) for table in tables),
+        'duration_seconds': round(time.monotonic() - started, 3),
+    }
+
+
+def backup_directory():
+    return os.path.join(settings.BASE_DIR, 'backups')
+
+
+def list_backups(backup_dir):
+    if not os.path.isdir(backup_dir):
+        return []
+    return sorted(
+        os.path.join(backup_dir, name[:-len('.meta.json')])
+        for name in os.listdir(backup_dir) if name.endswith('.meta.json')
+    )
+
+
+def latest_backup(backup_dir):
+    candidates = []
+    for path in list_backups(backup_dir):
+        try:
+            meta = read_meta(path)
+        except (BackupError, ValueError):
+            continue
+        if meta.get('format') == BACKUP_FORMAT and meta.get('snapshot') and os.path.isdir(path):
+            candidates.append((meta['timestamp'], path))
+    if not candidates:
+        raise BackupError(f'В каталоге {backup_dir} нет бэкапов формата copy')
+    return max(candidates)[1]
+
+
+def backup_chain(path):
+    chain = [(path, read_meta(path))]
+    visited = {os.path.abspath(path)}
+    while chain[0][1].get('type') == BACKUP_INCREMENTAL:
+        base = os.path.join(os.path.dirname(os.path.abspath(chain[0][0])), chain[0][1]['base'])
+        if base in visited:
+            raise BackupError(f'Цепочка бэкапов зациклена на {base}')
+        visited.add(base)
+        chain.insert(0, (base, read_meta(base)))
+    return chain
+
+
+def meta_path(path):
+    return path.rstrip(os.sep) + '.meta.json'
+
+
+def write_meta(path, meta):
+    with open(meta_path(path), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2, ensure_ascii=False)
+
+
+def read_meta(path):
+    try:
+        with open(meta_path(path), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise BackupError(f'Не найден мета-файл {meta_path(path)}')
+
+
+def backup_tables(meta):
+    by_label = {model._meta.label_lower: model for model in apps.get_models(include_auto_created=True)}
+    tables = []
+    for table in meta['tables']:
+        model = by_label.get(table['model'])
+        if model is None:
+            raise BackupError(f'Модель {table["model"]} из бэкапа не найдена')
+        tables.append((model, table))
+    return tables
+
+
+def load_table(cursor, model, table, directory, compression):
+    with COMPRESSIONS[compression].reader(os.path.join(directory, table['file'])) as stream:
+        reader = ChecksumReader(stream)
+        try:
+            cursor.copy_expert(copy_sql(model, table['columns'], 'in'), reader, size=COPY_BUFFER_SIZE)
+        except DatabaseError as e:
+            raise BackupError(f'Таблица {table["table"]}: {e}')
+
+    if reader.rows != table['rows'] or reader.digest.hexdigest() != table['sha256']:
+        raise BackupError(f'Таблица {table["table"]}: данные не совпадают с контрольной суммой')
+    return reader.rows
+
+
+def stream_errors(compression):
+    errors = (OSError, EOFError, zlib.error)
+    if compression == 'zstd':
+        errors += (zstd_module().ZstdError,)
+    return errors
+
+
+def scan_file(path, compression):
+    with COMPRESSIONS[compression].reader(path) as stream:
+        reader = ChecksumReader(stream)
+        fields = 0
+        last = b'\n'
+        while True:
+            chunk = reader.read(COPY_BUFFER_SIZE)
+            if not chunk:
+                break
+            fields += chunk.count(b'\t')
+            last = chunk[-1:]
+    return reader, fields, last == b'\n'
+
+
+def verify_file(directory, table, filename, rows, sha256, columns, compression):
+    path = os.path.join(directory, filename)
+    if not os.path.isfile(path):
+        return [f'Таблица {table["table"]}: файл {filename} не найден']
+    try:
+        reader, fields, complete = scan_file(path, compression)
+    except stream_errors(compression) as e:
+        return [f'Таблица {table["table"]}: файл {filename} не читается: {e}']
+
+    errors = []
+    if not complete:
+        errors.append(f'Таблица {table["table"]}: файл {filename} обрывается на середине строки')
+    if fields != reader.rows * (columns - 1):
+        errors.append(f'Таблица {table["table"]}: в файле {filename} строки не совпадают с числом колонок')
+    if reader.rows != rows:
+        errors.append(f'Таблица {table["table"]}: в файле {filename} {reader.rows} строк вместо {rows}')
+    if reader.digest.hexdigest() != sha256:
+        errors.append(f'Таблица {table["table"]}: файл {filename} не совпадает с контрольной суммой')
+    return errors
+
+
+def verify_table(directory, model, table, compression):
+    missing = set(table['columns']) - set(table_columns(model))
+    if missing:
+        return [f'Таблица {table["table"]}: колонок {", ".join(sorted(missing))} нет в текущей схеме']
+
+    errors = verify_file(
+        directory, table, table['file'], table['rows'], table['sha256'], len(table['columns']), compression
+    )
+    if table.get('mode') == 'changes':
+        errors += verify_file(directory, table, table['keys_file'], table['keys'], table['keys_sha256'], 1, compression)
+    return errors
+
+
+def verify_fixture(path, meta):
+    if not os.path.isfile(path):
+        raise BackupError(f'Файл {path} не найден')
+    if os.path.getsize(path) != meta.get('size_bytes'):
+        raise BackupError(f'Размер файла {os.path.getsize(path)} не совпадает с мета-файлом ({meta.get("size_bytes")})')
+    if meta.get('compression') == 'gzip':
+        try:
+            scan_file(path, 'gzip')
+        except stream_errors('gzip') as e:
+            raise BackupError(f'Архив повреждён: {e}')
+
+
+def backup_structure(path, meta):
+    if meta.get('format') != BACKUP_FORMAT:
+        verify_fixture(path, meta)
+        return []
+    if meta.get('format_version') != BACKUP_FORMAT_VERSION:
+        raise BackupError(f'Версия формата {meta.get("format_version")} не поддерживается')
+    if meta.get('compression') not in COMPRESSIONS:
+        raise BackupError(f'Неизвестный метод сжатия: {meta.get("compression")}')
+    if not os.path.isdir(path):
+        raise BackupError(f'Каталог {path} не найден')
+    if meta.get('type') == BACKUP_INCREMENTAL:
+        backup_chain(path)
+    tables = backup_tables(meta)
+    for _, table in tables:
+        missing = [key for key in TABLE_KEYS if key not in table]
+        if missing:
+            raise BackupError(f'Таблица {table.get("table")}: в мета-файле нет полей {", ".join(missing)}')
+    return tables
+
+
+def verify_backup(path, progress=None):
+    started = time.monotonic()
+    meta = {}
+    tables = []
+    errors = []
+    try:
+        meta = read_meta(path)
+        tables = backup_structure(path, meta)
+    except BackupError as e:
+        errors.append(str(e))
+    except (ValueError, KeyError, TypeError, AttributeError):
+        errors.append(f'Мета-файл {meta_path(path)} повреждён')
+
+    for model, table in tables:
+        table_errors = verify_table(path, model, table, meta['compression'])
+        errors += table_errors
+        if progress:
+            progress(table, table_errors)
+
+    return {
+        'backup': os.path.basename(path.rstrip(os.sep)),
+        'type': meta.get('type', BACKUP_FULL),
+        'format': meta.get('format'),
+        'timestamp': meta.get('timestamp'),
+        'valid': not errors,
+        'errors': errors,
+        'tables': len(tables),
+        'rows': sum(table['rows'] for _, table in tables),
+        'duration_seconds': round(time.monotonic() - started, 3),
+    }
+
+
+def reset_sequences(models):
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def reset_caches(models):
+    bump_versions(*models)
+    autocomplete.reset()
+
+
+def table_oids(cursor, tables):
+    qn = connection.ops.quote_name
+    cursor.execute(
+        'SELECT to_regclass(name)::oid FROM unnest(%s::text[]) AS name',
+        [[qn(table['table']) for _, table in tables]]
+    )
+    return [oid for (oid,) in cursor.fetchall() if oid]
+
+
+def deferred_ddl(cursor, oids):
+    cursor.execute(
+        'SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid) FROM pg_index i '
+        'WHERE i.indrelid = ANY(%s::oid[]) '
+        'AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid) '
+        'ORDER BY 1',
+        [oids]
+    )
+    indexes = cursor.fetchall()
+    cursor.execute(
+        "SELECT conrelid::regclass::text, quote_ident(conname), pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE contype = 'f' AND (conrelid = ANY(%s::oid[]) OR confrelid = ANY(%s::oid[])) "
+        "ORDER BY 1, 2",
+        [oids, oids]
+    )
+    return indexes, cursor.fetchall()
+
+
+def drop_deferred_ddl(cursor, indexes, foreign_keys):
+    for table, name, _ in foreign_keys:
+        cursor.execute(f'ALTER TABLE {table} DROP CONSTRAINT {name}')
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX {name}')
+
+
+def create_index(definition):
+    with connection.cursor() as cursor:
+        cursor.execute(definition)
+
+
+def add_foreign_keys(cursor, foreign_keys, validate=True):
+    for table, name, definition in foreign_keys:
+        cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}{"" if validate else " NOT VALID"}')
+
+
+def copy_table(model, table, directory, compression):
+    with transaction.atomic(), connection.cursor() as cursor:
+        return load_table(cursor, model, table, directory, compression)
+
+
+def apply_increment(cursor, directory, meta, progress=None):
+    qn = connection.ops.quote_name
+    changed = {}
+    for model, table in backup_tables(meta):
+        db_table = qn(table['table'])
+        if table.get('mode') == 'changes':
+            keys = read_keys(directory, table, meta['compression'])
+            if len(keys) != table['keys']:
+                raise BackupError(f'Таблица {table["table"]}: список изменённых строк повреждён')
+            cursor.execute(f'DELETE FROM {db_table} WHERE {qn(model._meta.pk.column)} = ANY(%s)', [keys])
+            changed[model] = keys
+        else:
+            cursor.execute(f'DELETE FROM {db_table}')
+        load_table(cursor, model, table, directory, meta['compression'])
+        if progress:
+            progress(table)
+    return changed
+
+
+def apply_increments(increments, progress=None):
+    from network_api.signals import SEARCHABLE_MODELS
+
+    changed = {}
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute('SET CONSTRAINTS ALL DEFERRED')
+        for directory, meta in increments:
+            for model, keys in apply_increment(cursor, directory, meta, progress).items():
+                changed.setdefault(model, set()).update(keys)
+
+        for model, keys in changed.items():
+            if model in SEARCHABLE_MODELS:
+                index_objects(model, list(keys))
+        recount_installations()
+        reset_sequences([model for model, _ in backup_tables(increments[-1][1])])
+    return {model._meta.db_table: len(keys) for model, keys in changed.items()}
+
+
+def finish_restore(tables):
+    from network_api.signals import OUTBOX_MODELS
+
+    models = [model for model, _ in tables]
+    reset_sequences(models)
+    record_reset([model for model in models if model in OUTBOX_MODELS])
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(f'ANALYZE {", ".join(qn(table["table"]) for _, table in tables)}')
+    transaction.on_commit(lambda: reset_caches(models))
+
+
+def restore_backup(directory, progress=None, jobs=1):
+    chain = backup_chain(directory)
+    base_directory, meta = chain[0]
+    if meta.get('format') != BACKUP_FORMAT:
+        raise BackupError(f'Формат бэкапа {meta.get("format")} не поддерживается')
+    tables = backup_tables(meta)
+    increments = chain[1:]
+    qn = connection.ops.quote_name
+    truncate_sql = f'TRUNCATE {", ".join(qn(table["table"]) for _, table in tables)} CASCADE'
+
+    def loaded(item):
+        model, table = item
+        rows = copy_table(model, table, base_directory, meta['compression'])
+        if progress:
+            progress(table)
+        return rows
+
+    if jobs <= 1:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+            indexes, foreign_keys = deferred_ddl(cursor, table_oids(cursor, tables))
+            drop_deferred_ddl(cursor, indexes, foreign_keys)
+            cursor.execute(truncate_sql)
+            restored = {table['table']: loaded((model, table)) for model, table in tables}
+            for _, definition in indexes:
+                cursor.execute(definition)
+            if increments:
+                apply_increments(increments, progress)
+            add_foreign_keys(cursor, foreign_keys)
+            finish_restore(tables)
+        return restored
+
+    if connection.in_atomic_block:
+        raise BackupError('Параллельное восстановление невозможно внутри открытой транзакции')
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        indexes, foreign_keys = deferred_ddl(cursor, table_oids(cursor, tables))
+        drop_deferred_ddl(cursor, indexes, foreign_keys)
+        cursor.execute(truncate_sql)
+
+    try:
+        by_size = sorted(tables, key=lambda item: item[1]['bytes'], reverse=True)
+        rows = run_parallel(jobs, loaded, by_size)
+    except BaseException:
+        with transaction.atomic(), connection.cursor() as cursor:
+            for _, definition in indexes:
+                cursor.execute(definition)
+            add_foreign_keys(cursor, foreign_keys, validate=False)
+        raise
+
+    run_parallel(jobs, create_index, [definition for _, definition in indexes])
+    with transaction.atomic(), connection.cursor() as cursor:
+        if increments:
+            apply_increments(increments, progress)
+        add_foreign_keys(cursor, foreign_keys)
+        finish_restore(tables)
+    return {table['table']: count for (_, table), count in zip(by_size, rows)}
@@ -0,0 +1,143 @@
+import json
+import re
+from io import BytesIO
+from urllib.parse import urlsplit
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+
+BATCH_MAX_OPERATIONS = 100
+BATCH_METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+BATCH_PATH_PREFIX = '/api/'
+
+REF_NAME = r'[A-Za-z_]\w*'
+REFERENCE = re.compile(rf'\$({REF_NAME})(?:\.(\w+))?')
+DROPPED_META = ('CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_IDEMPOTENCY_KEY', 'HTTP_IF_MATCH', 'HTTP_IF_NONE_MATCH')
+
+
+class BatchError(Exception):
+    pass
+
+
+class BatchFailed(Exception):
+
+    def __init__(self, index, status_code):
+        self.index = index
+        self.status_code = status_code
+
+
+def resolve_reference(refs, name, field):
+    if name not in refs:
+        raise BatchError(f'Ссылка ${name} не определена в предыдущих операциях')
+    data = refs[name]
+    field = field or 'id'
+    if not isinstance(data, dict) or field not in data:
+        raise BatchError(f'В результате операции ${name} нет поля {field}')
+    return data[field]
+
+
+def substitute(value, refs):
+    if isinstance(value, str):
+        match = REFERENCE.fullmatch(value)
+        return resolve_reference(refs, *match.groups()) if match else value
+    if isinstance(value, list):
+        return [substitute(item, refs) for item in value]
+    if isinstance(value, dict):
+        return {key: substitute(item, refs) for key, item in value.items()}
+    return value
+
+
+def substitute_path(path, refs):
+    return REFERENCE.sub(lambda match: str(resolve_reference(refs, *match.groups())), path)
+
+
+def parse_operation(index, operation, refs):
+    if not isinstance(operation, dict):
+        raise BatchError(f'Операция {index}: ожидается объект')
+
+    method = str(operation.get('method', 'GET')).upper()
+    if method not in BATCH_METHODS:
+        raise BatchError(f'Операция {index}: метод {method} не поддерживается')
+
+    path = operation.get('path')
+    if not isinstance(path, str) or not path.startswith(BATCH_PATH_PREFIX):
+        raise BatchError(f'Операция {index}: path должен начинаться с {BATCH_PATH_PREFIX}')
+
+    ref = operation.get('ref')
+    if ref is not None and (not isinstance(ref, str) or not re.fullmatch(REF_NAME, ref)):
+        raise BatchError(f'Операция {index}: некорректное имя ref')
+    if ref in refs:
+        raise BatchError(f'Операция {index}: ref {ref} уже используется')
+
+    try:
+        url = urlsplit(substitute_path(path, refs))
+        body = substitute(operation.get('body'), refs)
+    except BatchError as e:
+        raise BatchError(f'Операция {index}: {e}')
+
+    try:
+        match = resolve(url.path)
+    except Resolver404:
+        raise BatchError(f'Операция {index}: адрес {url.path} не найден')
+    view_class = getattr(match.func, 'cls', None)
+    if view_class is None or not getattr(view_class, 'batch_allowed', True):
+        raise BatchError(f'Операция {index}: адрес {url.path} недоступен в пакетном запросе')
+
+    return method, url, body, ref, match
+
+
+def build_request(parent, method, url, body):
+    payload = b'' if body is None else json.dumps(body, cls=DjangoJSONEncoder).encode()
+
+    request = HttpRequest()
+    request.method = method
+    request.path = request.path_info = url.path
+    request.META = {key: value for key, value in parent.META.items() if key not in DROPPED_META}
+    request.META.update({
+        'REQUEST_METHOD': method,
+        'PATH_INFO': url.path,
+        'QUERY_STRING': url.query,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(payload)),
+    })
+    request.GET = QueryDict(url.query)
+    request.COOKIES = parent.COOKIES
+    request._stream = BytesIO(payload)
+    request._read_started = False
+    request._dont_enforce_csrf_checks = True
+    if hasattr(parent, 'user'):
+        request.user = parent.user
+    if hasattr(parent, 'session'):
+        request.session = parent.session
+    return request
+
+
+def run_batch(parent, operations):
+    if not isinstance(operations, list) or not operations:
+        raise BatchError('operations: ожидается непустой список операций')
+    if len(operations) > BATCH_MAX_OPERATIONS:
+        raise BatchError(f'Слишком много операций: {len(operations)} (максимум {BATCH_MAX_OPERATIONS})')
+
+    refs = {}
+    results = []
+    try:
+        with transaction.atomic():
+            for index, operation in enumerate(operations):
+                method, url, body, ref, match = parse_operation(index, operation, refs)
+                response = match.func(build_request(parent, method, url, body), *match.args, **match.kwargs)
+
+                data = getattr(response, 'data', None)
+                result = {'index': index, 'status': response.status_code, 'data': data}
+                if ref is not None:
+                    result['ref'] = ref
+                    refs[ref] = data
+                results.append(result)
+
+                if response.status_code >= 400:
+                    raise BatchFailed(index, response.status_code)
+    except BatchFailed as e:
+        return results, e
+
+    return results, None
@@ -0,0 +1,126 @@
+from django.db import transaction
+from rest_framework import serializers
+
+from network_api.dispatch import bulk_changed
+from network_api.models import Computer, Department
+
+BULK_BATCH_SIZE = 1000
+BULK_MAX_ROWS = 50000
+BULK_FIELDS = ['serial_number', 'model', 'os', 'inventory_number', 'department']
+
+ON_CONFLICT_ERROR = 'error'
+ON_CONFLICT_UPDATE = 'update'
+
+DUPLICATE_SERIAL_ERROR = 'Компьютер с таким серийным номером уже существует'
+
+
+class BulkComputerRowSerializer(serializers.Serializer):
+    id = serializers.IntegerField(required=False, min_value=1)
+    serial_number = serializers.IntegerField(min_value=-2 ** 31, max_value=2 ** 31 - 1)
+    model = serializers.CharField(max_length=100)
+    os = serializers.CharField(max_length=100)
+    inventory_number = serializers.IntegerField(min_value=-2 ** 31, max_value=2 ** 31 - 1)
+    department = serializers.IntegerField(required=False, allow_null=True, min_value=1)
+
+
+def validate_rows(rows):
+    valid = {}
+    results = []
+    for index, row in enumerate(rows):
+        serializer = BulkComputerRowSerializer(data=row) if isinstance(row, dict) else None
+        if serializer is not None and serializer.is_valid():
+            valid[index] = serializer.validated_data
+            results.append({'index': index, 'status': None})
+        else:
+            errors = serializer.errors if serializer is not None else {'non_field_errors': ['Ожидался объект']}
+            results.append({'index': index, 'status': 'rejected', 'errors': errors})
+    return valid, results
+
+
+def reject(result, field, message):
+    result['status'] = 'rejected'
+    result['errors'] = {field: [message]}
+
+
+def bulk_upsert_computers(rows, on_conflict=ON_CONFLICT_ERROR, batch_size=BULK_BATCH_SIZE):
+    valid, results = validate_rows(rows)
+
+    serials = {data['serial_number'] for data in valid.values()}
+    ids = {data['id'] for data in valid.values() if 'id' in data}
+    departments = {data['department'] for data in valid.values() if data.get('department')}
+
+    existing_by_serial = dict(
+        Computer.objects.filter(serial_number__in=serials).values_list('serial_number', 'id')
+    )
+    existing_ids = set(Computer.objects.filter(id__in=ids).values_list('id', flat=True))
+    existing_departments = set(Department.objects.filter(id__in=departments).values_list('id', flat=True))
+
+    to_create = []
+    to_update = []
+    claimed_serials = {}
+    claimed_ids = set()
+    for index, data in valid.items():
+        result = results[index]
+        serial = data['serial_number']
+        department = data.get('department')
+        computer_id = data.get('id')
+        owner = existing_by_serial.get(serial)
+
+        if serial in claimed_serials:
+            reject(result, 'serial_number', f'Серийный номер повторяется в строке {claimed_serials[serial]}')
+            continue
+        if department and department not in existing_departments:
+            reject(result, 'department', f'Отдел {department} не найден')
+            continue
+
+        if computer_id is None and owner is not None:
+            if on_conflict != ON_CONFLICT_UPDATE:
+                reject(result, 'serial_number', DUPLICATE_SERIAL_ERROR)
+                continue
+            computer_id = owner
+        elif computer_id is not None:
+            if computer_id not in existing_ids:
+                reject(result, 'id', f'Компьютер {computer_id} не найден')
+                continue
+            if owner is not None and owner != computer_id:
+                reject(result, 'serial_number', DUPLICATE_SERIAL_ERROR)
+                continue
+        if computer_id in claimed_ids:
+            reject(result, 'id', f'Компьютер {computer_id} повторяется в запросе')
+            continue
+
+        claimed_serials[serial] = index
+        if computer_id is not None:
+            claimed_ids.add(computer_id)
+        computer = Computer(
+            id=computer_id,
+            serial_number=serial,
+            model=data['model'],
+            os=data['os'],
+            inventory_number=data['inventory_number'],
+            department_id=department
+        )
+        if computer_id is None:
+            to_create.append((result, computer))
+        else:
+            to_update.append((result, computer))
+
+    with transaction.atomic():
+        created = Computer.objects.bulk_create([computer for _, computer in to_create], batch_size=batch_size)
+        Computer.objects.bulk_update([computer for _, computer in to_update], BULK_FIELDS, batch_size=batch_size)
+
+        for (result, _), computer in zip(to_create, created):
+            result.update(status='created', id=computer.id)
+        for result, computer in to_update:
+            result.update(status='updated', id=computer.id)
+
+        changed = [result['id'] for result in results if result['status'] in ('created', 'updated')]
+        if changed:
+            bulk_changed.send(sender=Computer, pks=changed)
+
+    return {
+        'created': len(to_create),
+        'updated': len(to_update),
+        'rejected': sum(1 for result in results if result['status'] == 'rejected'),
+        'results': results,
+    }
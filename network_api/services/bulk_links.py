@@ -0,0 +1,213 @@
+import re
+from collections import Counter, defaultdict
+
+from django.db import connection, transaction
+
+from network_api.fields import parse_mac
+from network_api.models import NetworkComputer, ServerNetwork, Software, SoftwareComputer, UserComputer
+from network_api.services.cache_versions import bump_versions
+from network_api.services.ip_allocator import allocate, release_addresses
+from network_api.services.licensing import adjust_installed_count
+from network_api.services.outbox import OPERATION_CREATE, OPERATION_DELETE, outbox_insert_sql
+from network_api.services.selections import SelectionError, selection_queryset
+
+LINK_MAX_PAIRS = 100000
+DEFAULT_SPEED = 1000
+
+LINKS = {
+    SoftwareComputer: ('software', 'computer'),
+    UserComputer: ('user', 'computer'),
+    NetworkComputer: ('network', 'computer'),
+    ServerNetwork: ('server', 'network'),
+}
+
+
+def resolve_sides(link_model, data):
+    if not isinstance(data, dict):
+        raise SelectionError('Ожидается JSON-объект')
+
+    querysets = []
+    missing = {}
+    for name in LINKS[link_model]:
+        if name not in data:
+            raise SelectionError(f'Укажите {name}: список id или объект с фильтрами')
+        queryset, missing_ids = selection_queryset(name, data[name])
+        querysets.append(queryset)
+        if missing_ids:
+            missing[name] = missing_ids
+    return querysets, missing
+
+
+def subquery(queryset):
+    return queryset.order_by().values('pk').query.sql_with_params()
+
+
+def link_columns(link_model):
+    return [link_model._meta.get_field(name).column for name in LINKS[link_model]]
+
+
+def count_pairs(cursor, left, right):
+    (left_sql, left_params), (right_sql, right_params) = subquery(left), subquery(right)
+    cursor.execute(
+        f'SELECT (SELECT count(*) FROM ({left_sql}) l) * (SELECT count(*) FROM ({right_sql}) r)',
+        left_params + right_params
+    )
+    return cursor.fetchone()[0]
+
+
+def apply_side_effects(link_model, rows, delta):
+    if rows:
+        changed = [link_model, Software] if link_model is SoftwareComputer else [link_model]
+        transaction.on_commit(lambda: bump_versions(*changed))
+
+    if link_model is SoftwareComputer:
+        by_count = defaultdict(list)
+        for software_id, count in Counter(row[0] for row in rows).items():
+            by_count[count].append(software_id)
+        for count, software_ids in by_count.items():
+            adjust_installed_count(software_ids, count * delta)
+
+    if link_model is NetworkComputer and delta < 0:
+        by_network = defaultdict(list)
+        for network_id, _, ip_address in rows:
+            by_network[network_id].append(ip_address)
+        for network_id, addresses in by_network.items():
+            release_addresses(network_id, addresses)
+
+
+def assign_links(link_model, data):
+    if link_model is NetworkComputer:
+        return assign_network_computers(data)
+
+    (left, right), missing = resolve_sides(link_model, data)
+    left_column, right_column = (connection.ops.quote_name(column) for column in link_columns(link_model))
+    table = connection.ops.quote_name(link_model._meta.db_table)
+    (left_sql, left_params), (right_sql, right_params) = subquery(left), subquery(right)
+
+    events_sql, events_params = outbox_insert_sql(link_model, OPERATION_CREATE, 'inserted')
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        requested = count_pairs(cursor, left, right)
+        if requested > LINK_MAX_PAIRS:
+            raise SelectionError(f'Слишком много связей за один запрос: {requested} (максимум {LINK_MAX_PAIRS})')
+
+        cursor.execute(
+            f'WITH inserted AS ('
+            f'INSERT INTO {table} ({left_column}, {right_column}) '
+            f'SELECT l.id, r.id FROM ({left_sql}) l(id) CROSS JOIN ({right_sql}) r(id) '
+            f'ON CONFLICT ({left_column}, {right_column}) DO NOTHING '
+            f'RETURNING *'
+            f'), events AS ({events_sql}) '
+            f'SELECT {left_column}, {right_column} FROM inserted',
+            [*left_params, *right_params, *events_params]
+        )
+        rows = cursor.fetchall()
+        apply_side_effects(link_model, rows, 1)
+
+    return {
+        'requested': requested,
+        'created': len(rows),
+        'existing': requested - len(rows),
+        'missing': missing,
+    }
+
+
+def assign_network_computers(data):
+    (networks, computers), missing = resolve_sides(NetworkComputer, data)
+
+    speed = data.get('speed', DEFAULT_SPEED)
+    if not isinstance(speed, int) or isinstance(speed, bool) or speed <= 0:
+        raise SelectionError('speed должен быть положительным целым числом')
+
+    given = data.get('mac_addresses') or {}
+    if not isinstance(given, dict):
+        raise SelectionError('mac_addresses: ожидается объект {id компьютера: MAC}')
+    mac_addresses = {}
+    for computer_id, value in given.items():
+        mac = parse_mac(str(value))
+        if mac is None or not re.fullmatch(r'[0-9]+', str(computer_id)):
+            raise SelectionError(f'Некорректный MAC-адрес для компьютера {computer_id}')
+        mac_addresses[int(computer_id)] = mac
+
+    requested = computers.count()
+    with transaction.atomic(), connection.cursor() as cursor:
+        network_list = list(networks.select_for_update()[:2])
+        if len(network_list) != 1:
+            raise SelectionError('Для подключения компьютеров укажите ровно одну сеть')
+        network = network_list[0]
+
+        candidates = list(
+            computers.exclude(networkcomputer__network=network).order_by('pk').values_list('pk', flat=True)
+        )
+        if len(candidates) > LINK_MAX_PAIRS:
+            raise SelectionError(f'Слишком много связей за один запрос: {len(candidates)} (максимум {LINK_MAX_PAIRS})')
+
+        known = dict(
+            NetworkComputer.objects.filter(computer_id__in=candidates).exclude(
+                computer_id__in=mac_addresses
+            ).order_by('computer_id', '-id').distinct('computer_id').values_list('computer_id', 'mac_address')
+        )
+        known.update(mac_addresses)
+        ready = [computer_id for computer_id in candidates if computer_id in known]
+        skipped = [computer_id for computer_id in candidates if computer_id not in known]
+
+        addresses = allocate(network, len(ready)) if ready else []
+        events_sql, events_params = outbox_insert_sql(NetworkComputer, OPERATION_CREATE, 'inserted')
+        cursor.execute(
+            'WITH inserted AS ('
+            'INSERT INTO "Network_Computer" ("Network_id", "Computer_id", ip_address, mac_address, speed) '
+            'SELECT %s, t.computer_id, t.ip_address, t.mac_address, %s '
+            'FROM unnest(%s::bigint[], %s::inet[], %s::macaddr[]) AS t(computer_id, ip_address, mac_address) '
+            'ON CONFLICT ("Network_id", "Computer_id") DO NOTHING '
+            'RETURNING *'
+            f'), events AS ({events_sql}) '
+            'SELECT "Computer_id", host(ip_address) FROM inserted',
+            [network.pk, speed, ready, addresses, [known[computer_id] for computer_id in ready]] + events_params
+        )
+        rows = cursor.fetchall()
+
+        if rows:
+            transaction.on_commit(lambda: bump_versions(NetworkComputer))
+
+        assigned = {ip_address for _, ip_address in rows}
+        unused = [ip_address for ip_address in addresses if ip_address not in assigned]
+        if unused:
+            release_addresses(network.pk, unused)
+
+    return {
+        'requested': requested,
+        'created': len(rows),
+        'existing': requested - len(candidates),
+        'skipped': skipped,
+        'missing': missing,
+    }
+
+
+def unassign_links(link_model, data):
+    (left, right), missing = resolve_sides(link_model, data)
+    left_column, right_column = (connection.ops.quote_name(column) for column in link_columns(link_model))
+    table = connection.ops.quote_name(link_model._meta.db_table)
+    (left_sql, left_params), (right_sql, right_params) = subquery(left), subquery(right)
+    returning = f't.{left_column}, t.{right_column}'
+    if link_model is NetworkComputer:
+        returning += ', host(t.ip_address)'
+
+    events_sql, events_params = outbox_insert_sql(link_model, OPERATION_DELETE, 'deleted')
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'WITH deleted AS ('
+            f'DELETE FROM {table} t USING ({left_sql}) l(id), ({right_sql}) r(id) '
+            f'WHERE t.{left_column} = l.id AND t.{right_column} = r.id '
+            f'RETURNING t.*'
+            f'), events AS ({events_sql}) '
+            f'SELECT {returning} FROM deleted t',
+            [*left_params, *right_params, *events_params]
+        )
+        rows = cursor.fetchall()
+        apply_side_effects(link_model, rows, -1)
+
+    return {
+        'deleted': len(rows),
+        'missing': missing,
+    }
@@ -0,0 +1,38 @@
+import time
+
+from django.db import connection
+
+from network_api.models import ModelVersion
+
+
+def version_label(model):
+    return model._meta.label_lower
+
+
+def store_versions(labels, conflict):
+    table = connection.ops.quote_name(ModelVersion._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (label, version) SELECT label, %s FROM unnest(%s::text[]) AS label '
+            f'ON CONFLICT (label) {conflict}',
+            [time.time_ns(), labels]
+        )
+
+
+def model_versions(*models):
+    labels = [version_label(model) for model in models]
+    versions = dict(ModelVersion.objects.filter(label__in=labels).values_list('label', 'version'))
+    missing = sorted(set(labels) - set(versions))
+    if missing:
+        store_versions(missing, 'DO NOTHING')
+        versions.update(ModelVersion.objects.filter(label__in=missing).values_list('label', 'version'))
+    return '-'.join(str(versions[label]) for label in labels)
+
+
+def model_version(model):
+    return model_versions(model)
+
+
+def bump_versions(*models):
+    table = connection.ops.quote_name(ModelVersion._meta.db_table)
+    store_versions(sorted({version_label(model) for model in models}), f'DO UPDATE SET version = {table}.version + 1')
@@ -0,0 +1,43 @@
+from django.db import transaction
+
+from network_api.dispatch import bulk_changed
+from network_api.models import Department
+from network_api.services.cache_versions import bump_versions
+from network_api.services.selections import SelectionError, selection_queryset
+
+MOVABLE = {
+    'computers': 'computer',
+    'users': 'user',
+    'host_computers': 'host_computer',
+}
+
+
+def move_to_department(department, data):
+    if not isinstance(data, dict):
+        raise SelectionError('Ожидается JSON-объект')
+
+    requested = [key for key in MOVABLE if key in data]
+    if not requested:
+        raise SelectionError(f'Укажите хотя бы одно из: {", ".join(MOVABLE)}')
+
+    selections = {key: selection_queryset(MOVABLE[key], data[key]) for key in requested}
+
+    moved = {}
+    missing = {}
+    with transaction.atomic():
+        for key, (queryset, missing_ids) in selections.items():
+            pks = list(queryset.exclude(department=department).values_list('pk', flat=True))
+            moved[key] = queryset.model.objects.filter(pk__in=pks).update(department=department)
+            if moved[key]:
+                bulk_changed.send(sender=queryset.model, pks=pks)
+            if missing_ids:
+                missing[key] = missing_ids
+
+        if any(moved.values()):
+            transaction.on_commit(lambda: bump_versions(Department))
+
+    return {
+        'department': department.pk,
+        'moved': moved,
+        'missing': missing,
+    }
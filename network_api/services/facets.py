@@ -0,0 +1,63 @@
+from django.db import connection
+from django.db.models import F
+
+DEFAULT_FACET_LIMIT = 100
+
+
+def facet_counts(queryset, facets, limit=DEFAULT_FACET_LIMIT):
+    quote = connection.ops.quote_name
+
+    expressions = {}
+    grouping_sets = []
+    first_columns = {}
+    for name, paths in facets.items():
+        aliases = []
+        for position, path in enumerate(paths):
+            alias = f'{name}_{position}'
+            expressions[alias] = F(path)
+            aliases.append(quote(alias))
+        first_columns[name] = aliases[0]
+        grouping_sets.append(f"({', '.join(aliases)})")
+    grouping_sets.append('()')
+
+    inner_sql, params = queryset.order_by().values(**expressions).query.sql_with_params()
+    columns = ', '.join(quote(alias) for alias in expressions)
+    groupings = ', '.join(f'GROUPING({column})' for column in first_columns.values())
+
+    sql = (
+        f'SELECT {columns}, {groupings}, COUNT(*) FROM ({inner_sql}) AS filtered '
+        f"GROUP BY GROUPING SETS ({', '.join(grouping_sets)})"
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    offsets = {}
+    offset = 0
+    for name, paths in facets.items():
+        offsets[name] = (offset, len(paths))
+        offset += len(paths)
+
+    total = 0
+    results = {name: [] for name in facets}
+    names = list(facets)
+    for row in rows:
+        grouping = row[len(expressions):-1]
+        count = row[-1]
+        if all(grouping):
+            total = count
+            continue
+
+        name = names[grouping.index(0)]
+        start, width = offsets[name]
+        bucket = {'value': row[start], 'count': count}
+        if width > 1:
+            bucket['label'] = row[start + 1]
+        results[name].append(bucket)
+
+    for name, buckets in results.items():
+        buckets.sort(key=lambda bucket: (-bucket['count'], bucket['value'] is None, str(bucket['value'])))
+        del buckets[limit:]
+
+    return {'total': total, 'facets': results}
@@ -0,0 +1,79 @@
+import hashlib
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from network_api.models import IdempotencyKey
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+Claim = namedtuple('Claim', ['id', 'owned', 'fingerprint', 'status_code', 'response', 'claimed_at'])
+
+
+class IdempotencyError(Exception):
+    pass
+
+
+def key_ttl():
+    return timedelta(seconds=getattr(settings, 'IDEMPOTENCY_KEY_TTL_SECONDS', 86400))
+
+
+def key_lease():
+    return timedelta(seconds=getattr(settings, 'IDEMPOTENCY_LEASE_SECONDS', 60))
+
+
+def request_fingerprint(method, path, body):
+    digest = hashlib.sha256(f'{method} {path}\n'.encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def claim_key(scope, key, fingerprint):
+    if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise IdempotencyError(f'Idempotency-Key должен содержать от 1 до {IDEMPOTENCY_KEY_MAX_LENGTH} символов')
+
+    now = timezone.now()
+    expired = now - key_ttl()
+    table = connection.ops.quote_name(IdempotencyKey._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (scope, key, fingerprint, status_code, response, created_at) '
+            f'VALUES (%s, %s, %s, NULL, NULL, %s) '
+            f'ON CONFLICT (scope, key) DO UPDATE SET fingerprint = EXCLUDED.fingerprint, '
+            f'status_code = NULL, response = NULL, created_at = EXCLUDED.created_at '
+            f'WHERE {table}.created_at < %s OR ({table}.status_code IS NULL AND {table}.created_at < %s) '
+            f'RETURNING id',
+            [scope, key, fingerprint, now, expired, now - key_lease()]
+        )
+        row = cursor.fetchone()
+
+    if row:
+        purge_expired(expired)
+        return Claim(row[0], True, fingerprint, None, None, now)
+
+    existing = IdempotencyKey.objects.filter(scope=scope, key=key).values_list(
+        'id', 'fingerprint', 'status_code', 'response', 'created_at'
+    ).first()
+    if existing is None:
+        return claim_key(scope, key, fingerprint)
+    return Claim(existing[0], False, *existing[1:])
+
+
+def store_response(claim, status_code, data):
+    IdempotencyKey.objects.filter(id=claim.id, created_at=claim.claimed_at, status_code__isnull=True).update(
+        status_code=status_code, response=data
+    )
+
+
+def release_key(claim):
+    IdempotencyKey.objects.filter(id=claim.id, created_at=claim.claimed_at, status_code__isnull=True).delete()
+
+
+def purge_expired(before=None):
+    if before is None:
+        before = timezone.now() - key_ttl()
+    deleted, _ = IdempotencyKey.objects.filter(created_at__lt=before).delete()
+    return deleted
@@ -0,0 +1,390 @@
+from collections import namedtuple
+import csv
+import io
+from itertools import chain
+import re
+import zipfile
+
+from django.db import connection, models, transaction
+import pandas as pd
+
+from network_api.dispatch import bulk_changed
+from network_api.models import Computer, Department, Software, User
+from network_api.services.licensing import classify_license
+
+IMPORT_BATCH_SIZE = 5000
+IMPORT_REPORT_LIMIT = 1000
+CSV_SNIFF_SIZE = 64 * 1024
+
+CSV = 'csv'
+XLSX = 'xlsx'
+FORMATS = (CSV, XLSX)
+
+ON_CONFLICT_SKIP = 'skip'
+ON_CONFLICT_UPDATE = 'update'
+
+TEXT = 'text'
+INTEGER = 'integer'
+
+ImportTarget = namedtuple('ImportTarget', ['model', 'fields', 'key', 'aliases', 'computed', 'defaults'])
+ImportColumn = namedtuple('ImportColumn', ['name', 'column', 'kind', 'required', 'limit'])
+
+IMPORT_TARGETS = {
+    'computers': ImportTarget(
+        model=Computer,
+        fields=['serial_number', 'model', 'os', 'inventory_number', 'department'],
+        key=['serial_number'],
+        aliases={
+            'serial_number': ['serial', 'серийный_номер', 'серийный_№'],
+            'model': ['модель'],
+            'os': ['операционная_система', 'ос'],
+            'inventory_number': ['inventory', 'инвентарный_номер', 'инвентарный_№'],
+            'department': ['department_id', 'отдел'],
+        },
+        computed={},
+        defaults={},
+    ),
+    'users': ImportTarget(
+        model=User,
+        fields=['full_name', 'phone', 'email', 'position_id', 'department'],
+        key=['email'],
+        aliases={
+            'full_name': ['name', 'фио', 'имя'],
+            'phone': ['телефон'],
+            'email': ['e_mail', 'почта'],
+            'position_id': ['position', 'должность'],
+            'department': ['department_id', 'отдел'],
+        },
+        computed={},
+        defaults={},
+    ),
+    'software': ImportTarget(
+        model=Software,
+        fields=['name', 'version', 'license', 'vendor', 'seat_count'],
+        key=['name', 'version'],
+        aliases={
+            'name': ['название'],
+            'version': ['версия'],
+            'license': ['лицензия'],
+            'vendor': ['производитель'],
+            'seat_count': ['seats', 'количество_мест'],
+        },
+        computed={'license_class': lambda frame: frame['license'].map(classify_license)},
+        defaults={'installed_count': 0},
+    ),
+}
+
+
+class InventoryImportError(Exception):
+    pass
+
+
+def normalize_header(value):
+    return re.sub(r'[\s\-/.]+', '_', str(value or '').strip().casefold()).strip('_')
+
+
+def target_columns(target):
+    columns = []
+    for name in target.fields:
+        field = target.model._meta.get_field(name)
+        required = not field.null
+        if isinstance(field, models.ForeignKey):
+            columns.append(ImportColumn(name, field.column, INTEGER, required, (1, None)))
+        elif isinstance(field, models.IntegerField):
+            limit = connection.ops.integer_field_range(field.get_internal_type())
+            columns.append(ImportColumn(name, field.column, INTEGER, required, limit))
+        else:
+            columns.append(ImportColumn(name, field.column, TEXT, required, field.max_length))
+    return columns
+
+
+def map_headers(target, header, column_map=None):
+    lookup = {}
+    for column in target_columns(target):
+        for alias in [column.name, column.column, *target.aliases.get(column.name, [])]:
+            lookup[normalize_header(alias)] = column.name
+    for source, name in (column_map or {}).items():
+        if name not in target.fields:
+            raise InventoryImportError(f'Неизвестное поле {name}')
+        lookup[normalize_header(source)] = name
+
+    mapping = {}
+    ignored = []
+    for position, title in enumerate(header):
+        name = lookup.get(normalize_header(title))
+        if name is None or name in mapping.values():
+            if title not in (None, ''):
+                ignored.append(str(title))
+            continue
+        mapping[position] = name
+
+    missing = [
+        column.name for column in target_columns(target)
+        if column.required and column.name not in mapping.values()
+    ]
+    if missing:
+        raise InventoryImportError(f'В файле нет обязательных колонок: {", ".join(missing)}')
+    return mapping, ignored
+
+
+def parse_column_map(items):
+    column_map = {}
+    for item in items or []:
+        source, separator, name = item.partition('=')
+        if not separator or not source.strip() or not name.strip():
+            raise InventoryImportError(f'Некорректное сопоставление {item!r}, ожидается колонка=поле')
+        column_map[source.strip()] = name.strip()
+    return column_map
+
+
+def detect_format(filename, file_format=None):
+    file_format = (file_format or filename.rsplit('.', 1)[-1]).lower()
+    if file_format not in FORMATS:
+        raise InventoryImportError('Поддерживаются только файлы CSV и XLSX')
+    return file_format
+
+
+def read_csv_rows(stream):
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    try:
+        sample = text.read(CSV_SNIFF_SIZE)
+        if not sample:
+            return
+        sample += text.readline()
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+        except csv.Error:
+            dialect = csv.excel
+        yield from csv.reader(chain(io.StringIO(sample), text), dialect)
+    finally:
+        text.detach()
+
+
+def read_xlsx_rows(stream):
+    from openpyxl import load_workbook
+    from openpyxl.utils.exceptions import InvalidFileException
+
+    try:
+        workbook = load_workbook(stream, read_only=True, data_only=True)
+    except (InvalidFileException, zipfile.BadZipFile, KeyError) as e:
+        raise InventoryImportError(f'Не удалось прочитать XLSX: {e}')
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def read_rows(stream, file_format):
+    reader = read_csv_rows(stream) if file_format == CSV else read_xlsx_rows(stream)
+    try:
+        yield from reader
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise InventoryImportError(f'Не удалось прочитать CSV: {e}')
+
+
+def iter_batches(rows, mapping, batch_size):
+    names = list(mapping.values())
+    positions = list(mapping)
+    batch = []
+    for line, row in enumerate(rows, start=2):
+        values = [row[position] if position < len(row) else None for position in positions]
+        if all(value in (None, '') for value in values):
+            continue
+        batch.append([line, *values])
+        if len(batch) >= batch_size:
+            yield pd.DataFrame(batch, columns=['line', *names], dtype=object)
+            batch = []
+    if batch:
+        yield pd.DataFrame(batch, columns=['line', *names], dtype=object)
+
+
+class BatchValidator:
+
+    def __init__(self, target):
+        self.target = target
+        self.columns = target_columns(target)
+        self.seen = {}
+
+    def validate(self, frame):
+        errors = {}
+
+        def flag(mask, field, message):
+            for line in frame.loc[mask.fillna(False).astype(bool), 'line']:
+                errors.setdefault(int(line), {}).setdefault(field, []).append(message)
+
+        clean = pd.DataFrame({'line': frame['line'].astype('int64')})
+        for column in self.columns:
+            if column.name in frame:
+                values = frame[column.name].astype('string').str.strip()
+                values = values.mask(values == '')
+            else:
+                values = pd.Series(pd.NA, index=frame.index, dtype='string')
+
+            if column.required:
+                flag(values.isna(), column.name, 'Обязательное поле')
+
+            if column.kind == TEXT:
+                flag(values.str.len() > column.limit, column.name, f'Не длиннее {column.limit} символов')
+                clean[column.column] = values
+                continue
+
+            numbers = pd.to_numeric(values, errors='coerce')
+            invalid = values.notna() & (numbers.isna() | (numbers % 1 != 0))
+            flag(invalid, column.name, 'Ожидается целое число')
+            low, high = column.limit
+            out_of_range = pd.Series(False, index=frame.index)
+            if low is not None:
+                out_of_range |= (numbers < low).fillna(False)
+            if high is not None:
+                out_of_range |= (numbers > high).fillna(False)
+            flag(out_of_range & ~invalid, column.name, 'Значение вне допустимого диапазона')
+            clean[column.column] = numbers.mask(invalid | out_of_range).round().astype('Int64')
+
+        clean = clean[~clean['line'].isin(errors)].copy()
+        keys = self.keys(clean)
+        repeated = keys.duplicated() | keys.isin(self.seen.keys())
+        self.seen.update(zip(keys[~repeated], clean.loc[~repeated, 'line'].astype(int)))
+        for key, line in zip(keys[repeated], clean.loc[repeated, 'line']):
+            errors.setdefault(int(line), {}).setdefault(self.target.key[0], []).append(
+                f'Повторяет строку {self.seen[key]}'
+            )
+
+        clean = clean[~repeated]
+        for column, compute in self.target.computed.items():
+            clean[column] = compute(clean)
+        return clean, errors
+
+    def keys(self, clean):
+        columns = [self.target.model._meta.get_field(name).column for name in self.target.key]
+        keys = clean[columns[0]].astype('string')
+        for column in columns[1:]:
+            keys = keys + '\x1f' + clean[column].astype('string')
+        return keys
+
+
+def staging_columns(target):
+    return [column.column for column in target_columns(target)] + list(target.computed)
+
+
+def create_staging_table(cursor, target, staging):
+    qn = connection.ops.quote_name
+    columns = ', '.join(qn(column) for column in staging_columns(target))
+    cursor.execute(f'DROP TABLE IF EXISTS {qn(staging)}')
+    cursor.execute(
+        f'CREATE TEMPORARY TABLE {qn(staging)} ON COMMIT DROP AS '
+        f'SELECT {columns} FROM {qn(target.model._meta.db_table)} WITH NO DATA'
+    )
+    cursor.execute(f'ALTER TABLE {qn(staging)} ADD COLUMN line integer')
+
+
+def copy_batch(cursor, target, staging, clean):
+    qn = connection.ops.quote_name
+    columns = staging_columns(target)
+    buffer = io.StringIO()
+    clean[columns + ['line']].to_csv(buffer, header=False, index=False)
+    buffer.seek(0)
+    column_list = ', '.join(qn(column) for column in columns + ['line'])
+    cursor.copy_expert(f'COPY {qn(staging)} ({column_list}) FROM STDIN WITH (FORMAT csv)', buffer)
+
+
+def reject_missing_departments(cursor, target, staging):
+    if 'department' not in target.fields:
+        return []
+    qn = connection.ops.quote_name
+    cursor.execute(
+        f'DELETE FROM {qn(staging)} s WHERE s.department_id IS NOT NULL AND NOT EXISTS ('
+        f'SELECT 1 FROM {qn(Department._meta.db_table)} d WHERE d.id = s.department_id'
+        f') RETURNING s.line, s.department_id'
+    )
+    return cursor.fetchall()
+
+
+def merge_staging(cursor, target, staging, on_conflict, present):
+    qn = connection.ops.quote_name
+    columns = staging_columns(target)
+    key = [target.model._meta.get_field(name).column for name in target.key]
+    updated = [
+        column.column for column in target_columns(target) if column.name in present
+    ] + list(target.computed)
+
+    insert_columns = ', '.join(qn(column) for column in columns + list(target.defaults))
+    select_columns = ', '.join(
+        [qn(column) for column in columns] + ['%s'] * len(target.defaults)
+    )
+    if on_conflict == ON_CONFLICT_UPDATE:
+        assignments = ', '.join(
+            f'{qn(column)} = EXCLUDED.{qn(column)}' for column in updated if column not in key
+        )
+        conflict = f'DO UPDATE SET {assignments}'
+    else:
+        conflict = 'DO NOTHING'
+
+    cursor.execute(
+        f'INSERT INTO {qn(target.model._meta.db_table)} ({insert_columns}) '
+        f'SELECT {select_columns} FROM {qn(staging)} ORDER BY line '
+        f'ON CONFLICT ({", ".join(qn(column) for column in key)}) {conflict} '
+        f'RETURNING id, (xmax = 0)',
+        list(target.defaults.values())
+    )
+    return cursor.fetchall()
+
+
+def import_inventory(target_name, stream, file_format, on_conflict=ON_CONFLICT_SKIP,
+                     column_map=None, batch_size=IMPORT_BATCH_SIZE, progress=None, on_reject=None):
+    target = IMPORT_TARGETS[target_name]
+    rows = read_rows(stream, file_format)
+    header = next(rows, None)
+    if header is None:
+        raise InventoryImportError('Файл пуст')
+    mapping, ignored = map_headers(target, header, column_map)
+
+    report = {
+        'type': target_name,
+        'processed': 0,
+        'staged': 0,
+        'created': 0,
+        'updated': 0,
+        'skipped': 0,
+        'rejected': 0,
+        'ignored_columns': ignored,
+        'rejected_rows': [],
+    }
+
+    def reject(line, errors):
+        report['rejected'] += 1
+        if len(report['rejected_rows']) < IMPORT_REPORT_LIMIT:
+            report['rejected_rows'].append({'line': line, 'errors': errors})
+        if on_reject:
+            on_reject(line, errors)
+
+    validator = BatchValidator(target)
+    staging = f'import_{target.model._meta.db_table.lower()}'
+    with transaction.atomic(), connection.cursor() as cursor:
+        create_staging_table(cursor, target, staging)
+
+        for frame in iter_batches(rows, mapping, batch_size):
+            clean, errors = validator.validate(frame)
+            for line in sorted(errors):
+                reject(line, errors[line])
+            if not clean.empty:
+                copy_batch(cursor, target, staging, clean)
+
+            report['processed'] += len(frame)
+            report['staged'] += len(clean)
+            if progress:
+                progress(report)
+
+        for line, department in reject_missing_departments(cursor, target, staging):
+            reject(line, {'department': [f'Отдел {department} не найден']})
+            report['staged'] -= 1
+
+        merged = merge_staging(cursor, target, staging, on_conflict, set(mapping.values()))
+        report['created'] = sum(1 for _, inserted in merged if inserted)
+        report['updated'] = len(merged) - report['created']
+        report['skipped'] = report['staged'] - len(merged)
+
+        if merged:
+            bulk_changed.send(sender=target.model, pks=[pk for pk, _ in merged])
+
+    report['rejected_rows'].sort(key=lambda row: row['line'])
+    return report
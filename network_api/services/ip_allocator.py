@@ -0,0 +1,244 @@
+import ipaddress
+
+from django.db import connection, transaction
+
+MAX_POOL_SIZE = 1 << 20
+
+
+class AllocationError(Exception):
+    pass
+
+
+def _bitmap(data, size):
+    return int.from_bytes(bytes(data or b''), 'little') & ((1 << size) - 1)
+
+
+def _to_bytes(bitmap, size):
+    return bitmap.to_bytes((size + 7) // 8, 'little')
+
+
+def network_of(network):
+    ip_network = ipaddress.ip_network(network.ip_range, strict=False)
+    if ip_network.num_addresses > MAX_POOL_SIZE:
+        raise AllocationError(
+            f'Сеть {ip_network} слишком велика для пула адресов (максимум {MAX_POOL_SIZE} адресов)'
+        )
+    return ip_network
+
+
+def unusable_mask(ip_network):
+    size = ip_network.num_addresses
+    if ip_network.version == 4 and size > 2:
+        return 1 | (1 << (size - 1))
+    if ip_network.version == 6 and size > 1:
+        return 1
+    return 0
+
+
+def offsets_of(bitmap):
+    offset = 0
+    while bitmap:
+        if bitmap & 1:
+            yield offset
+        bitmap >>= 1
+        offset += 1
+
+
+def lowest_free(taken, size, count):
+    free = ~taken & ((1 << size) - 1)
+    offsets = []
+    while free and len(offsets) < count:
+        lowest = free & -free
+        offsets.append(lowest.bit_length() - 1)
+        free ^= lowest
+    return offsets
+
+
+def used_bitmap(network, ip_network):
+    from network_api.models import NetworkComputer
+
+    bitmap = 0
+    base = int(ip_network.network_address)
+    addresses = NetworkComputer.objects.filter(network=network).values_list('ip_address', flat=True)
+    for address in addresses.iterator(chunk_size=5000):
+        ip = ipaddress.ip_address(address)
+        if ip in ip_network:
+            bitmap |= 1 << (int(ip) - base)
+    return bitmap
+
+
+def locked_pool(network):
+    from network_api.models import IpAddressPool, Network
+
+    network = Network.objects.select_for_update().get(pk=network.pk)
+    ip_network = network_of(network)
+    size = ip_network.num_addresses
+
+    pool = IpAddressPool.objects.select_for_update().filter(network=network).first()
+    if pool is None or pool.ip_range != str(ip_network):
+        pool = IpAddressPool(
+            network=network,
+            ip_range=str(ip_network),
+            size=size,
+            used=_to_bytes(used_bitmap(network, ip_network), size),
+            reserved=_to_bytes(0, size)
+        )
+        pool.save()
+
+    return pool, ip_network
+
+
+def rebuild_pool(network):
+    with transaction.atomic():
+        pool, ip_network = locked_pool(network)
+        pool.used = _to_bytes(used_bitmap(network, ip_network), pool.size)
+        pool.save(update_fields=['used'])
+        return pool
+
+
+def pool_summary(network):
+    with transaction.atomic():
+        pool, ip_network = locked_pool(network)
+        used = _bitmap(pool.used, pool.size)
+        reserved = _bitmap(pool.reserved, pool.size) & ~used
+        usable = pool.size - bin(unusable_mask(ip_network)).count('1')
+        return {
+            'network_id': network.pk,
+            'ip_range': pool.ip_range,
+            'size': usable,
+            'used': bin(used).count('1'),
+            'reserved': bin(reserved).count('1'),
+            'free': usable - bin(used | reserved).count('1'),
+        }
+
+
+def next_free(network, count=1):
+    with transaction.atomic():
+        pool, ip_network = locked_pool(network)
+        taken = _bitmap(pool.used, pool.size) | _bitmap(pool.reserved, pool.size) | unusable_mask(ip_network)
+        base = int(ip_network.network_address)
+        return [str(ipaddress.ip_address(base + offset)) for offset in lowest_free(taken, pool.size, count)]
+
+
+def allocate(network, count=1):
+    if not transaction.get_connection().in_atomic_block:
+        raise AllocationError('Выделение адресов должно выполняться внутри транзакции')
+
+    pool, ip_network = locked_pool(network)
+    used = _bitmap(pool.used, pool.size)
+    taken = used | _bitmap(pool.reserved, pool.size) | unusable_mask(ip_network)
+
+    offsets = lowest_free(taken, pool.size, count)
+    if len(offsets) < count:
+        raise AllocationError(f'В сети {ip_network} недостаточно свободных адресов')
+
+    for offset in offsets:
+        used |= 1 << offset
+    pool.used = _to_bytes(used, pool.size)
+    pool.save(update_fields=['used'])
+
+    base = int(ip_network.network_address)
+    return [str(ipaddress.ip_address(base + offset)) for offset in offsets]
+
+
+def allocate_address(network, computer, mac_address, speed):
+    from network_api.models import NetworkComputer
+
+    with transaction.atomic():
+        ip_address = allocate(network)[0]
+        return NetworkComputer.objects.create(
+            network=network,
+            computer=computer,
+            ip_address=ip_address,
+            mac_address=mac_address,
+            speed=speed
+        )
+
+
+def _range_mask(ip_network, start, end):
+    try:
+        first = ipaddress.ip_address(start)
+        last = ipaddress.ip_address(end if end else start)
+    except ValueError as e:
+        raise AllocationError(str(e))
+
+    if first not in ip_network or last not in ip_network or first > last:
+        raise AllocationError(f'Диапазон {first} - {last} не принадлежит сети {ip_network}')
+
+    base = int(ip_network.network_address)
+    low, high = int(first) - base, int(last) - base
+    return ((1 << (high - low + 1)) - 1) << low
+
+
+def reserve_range(network, start, end=None):
+    with transaction.atomic():
+        pool, ip_network = locked_pool(network)
+        mask = _range_mask(ip_network, start, end) & ~unusable_mask(ip_network)
+        used = _bitmap(pool.used, pool.size)
+        reserved = _bitmap(pool.reserved, pool.size)
+
+        conflicts = used & mask
+        if conflicts:
+            base = int(ip_network.network_address)
+            addresses = [str(ipaddress.ip_address(base + offset)) for offset in offsets_of(conflicts)]
+            raise AllocationError(f'Адреса уже заняты: {", ".join(addresses[:10])}')
+
+        added = mask & ~reserved
+        pool.reserved = _to_bytes(reserved | mask, pool.size)
+        pool.save(update_fields=['reserved'])
+        return bin(added).count('1')
+
+
+def release_range(network, start, end=None):
+    with transaction.atomic():
+        pool, ip_network = locked_pool(network)
+        mask = _range_mask(ip_network, start, end)
+        reserved = _bitmap(pool.reserved, pool.size)
+
+        released = reserved & mask
+        pool.reserved = _to_bytes(reserved & ~mask, pool.size)
+        pool.save(update_fields=['reserved'])
+        return bin(released).count('1')
+
+
+def lock_networks(*network_ids):
+    from network_api.models import Network
+
+    ids = sorted({network_id for network_id in network_ids if network_id is not None})
+    if ids:
+        list(Network.objects.select_for_update().filter(pk__in=ids).order_by('pk').values_list('pk', flat=True))
+
+
+def mark_address(network_id, ip_address, in_use):
+    with transaction.atomic(), connection.cursor() as cursor:
+        lock_networks(network_id)
+        cursor.execute(
+            '''
+            UPDATE "Ip_Address_Pool" AS p
+            SET used = set_bit(p.used, (%s::inet - network(p.ip_range))::int, %s)
+            WHERE p."Network_id" = %s AND p.ip_range >>= %s::inet
+            ''',
+            [ip_address, 1 if in_use else 0, network_id, ip_address]
+        )
+
+
+def release_addresses(network_id, addresses):
+    from network_api.models import IpAddressPool
+
+    with transaction.atomic():
+        pool = IpAddressPool.objects.select_for_update().filter(network_id=network_id).first()
+        if pool is None:
+            return 0
+
+        ip_network = ipaddress.ip_network(pool.ip_range)
+        base = int(ip_network.network_address)
+        used = _bitmap(pool.used, pool.size)
+        mask = 0
+        for address in addresses:
+            ip = ipaddress.ip_address(address)
+            if ip in ip_network:
+                mask |= 1 << (int(ip) - base)
+
+        pool.used = _to_bytes(used & ~mask, pool.size)
+        pool.save(update_fields=['used'])
+        return bin(used & mask).count('1')
@@ -0,0 +1,54 @@
+from django.db import models
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+class LicenseClass(models.TextChoices):
+    COMMERCIAL = 'commercial', 'Коммерческая'
+    FREE = 'free', 'Свободная'
+    TRIAL = 'trial', 'Пробная'
+    EXPIRED = 'expired', 'Истекшая'
+    UNKNOWN = 'unknown', 'Не определена'
+
+
+LICENSE_KEYWORDS = [
+    (LicenseClass.EXPIRED, ('expired',)),
+    (LicenseClass.TRIAL, ('trial',)),
+    (LicenseClass.FREE, ('free', 'open source', 'opensource', 'open-source')),
+    (LicenseClass.COMMERCIAL, ('commercial', 'paid')),
+]
+
+RENEWAL_CLASSES = (LicenseClass.TRIAL, LicenseClass.EXPIRED)
+
+
+def classify_license(license_text):
+    text = (license_text or '').lower()
+    for license_class, keywords in LICENSE_KEYWORDS:
+        if any(keyword in text for keyword in keywords):
+            return license_class
+    return LicenseClass.UNKNOWN
+
+
+def adjust_installed_count(software_ids, delta):
+    from network_api.models import Software
+
+    if software_ids and delta:
+        Software.objects.filter(pk__in=software_ids).update(
+            installed_count=F('installed_count') + delta
+        )
+
+
+def recount_installations(software_ids=None):
+    from network_api.models import Software, SoftwareComputer
+
+    installations = SoftwareComputer.objects.filter(
+        software=OuterRef('pk')
+    ).order_by().values('software').annotate(total=Count('id')).values('total')
+
+    queryset = Software.objects.all()
+    if software_ids is not None:
+        queryset = queryset.filter(pk__in=software_ids)
+
+    return queryset.update(
+        installed_count=Coalesce(Subquery(installations), Value(0))
+    )
@@ -0,0 +1,221 @@
+import json
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils import timezone
+
+from network_api.models import OutboxEvent
+
+OUTBOX_BATCH_SIZE = 500
+
+OPERATION_CREATE = 'create'
+OPERATION_UPDATE = 'update'
+OPERATION_UPSERT = 'upsert'
+OPERATION_DELETE = 'delete'
+OPERATION_RESET = 'reset'
+
+
+class OutboxError(Exception):
+    pass
+
+
+def entity_type(model):
+    return model._meta.model_name
+
+
+def outbox_insert_sql(model, operation, source):
+    qn = connection.ops.quote_name
+    return (
+        f'INSERT INTO {qn(OutboxEvent._meta.db_table)} '
+        f'(entity_type, object_id, operation, payload, transaction_id, created_at) '
+        f'SELECT %s, t.{qn(model._meta.pk.column)}, %s, to_jsonb(t), pg_current_xact_id()::text::bigint, now() '
+        f'FROM {source} t',
+        [entity_type(model), operation]
+    )
+
+
+def record_rows(model, pks, operation):
+    if not pks:
+        return
+    qn = connection.ops.quote_name
+    sql, params = outbox_insert_sql(model, operation, qn(model._meta.db_table))
+    with connection.cursor() as cursor:
+        cursor.execute(f'{sql} WHERE t.{qn(model._meta.pk.column)} = ANY(%s)', params + [list(pks)])
+
+
+def record_reset(models):
+    table = connection.ops.quote_name(OutboxEvent._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {table} (entity_type, object_id, operation, payload, transaction_id, created_at) '
+            f'VALUES (%s, 0, %s, NULL, pg_current_xact_id()::text::bigint, now())',
+            [[entity_type(model), OPERATION_RESET] for model in models]
+        )
+
+
+def event_message(event):
+    event_id, entity, object_id, operation, payload, created_at = event
+    return {
+        'id': event_id,
+        'entity': entity,
+        'object_id': object_id,
+        'operation': operation,
+        'payload': json.loads(payload) if isinstance(payload, str) else payload,
+        'created_at': created_at,
+    }
+
+
+class MemoryBroker:
+
+    def __init__(self, **kwargs):
+        self.messages = []
+
+    def publish(self, topic, key, value):
+        self.messages.append((topic, key, value))
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FileBroker:
+
+    def __init__(self, path=None, **kwargs):
+        self.path = path or getattr(settings, 'OUTBOX_FILE', 'outbox.ndjson')
+        self.pending = []
+
+    def publish(self, topic, key, value):
+        self.pending.append(json.dumps({'topic': topic, 'key': key, 'value': value}, cls=DjangoJSONEncoder))
+
+    def flush(self):
+        if not self.pending:
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(self.pending) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.pending = []
+
+    def close(self):
+        self.flush()
+
+
+class KafkaBroker:
+
+    def __init__(self, bootstrap_servers=None, **kwargs):
+        bootstrap_servers = bootstrap_servers or getattr(settings, 'KAFKA_BOOTSTRAP_SERVERS', 'localhost:9092')
+        self.errors = []
+        try:
+            from confluent_kafka import Producer
+            self.producer = Producer({
+                'bootstrap.servers': bootstrap_servers,
+                'enable.idempotence': True,
+                'linger.ms': 20,
+                'compression.type': 'lz4',
+            })
+            self.confluent = True
+        except ImportError:
+            try:
+                from kafka import KafkaProducer
+            except ImportError:
+                raise OutboxError('Для публикации в Kafka установите confluent-kafka или kafka-python')
+            self.producer = KafkaProducer(
+                bootstrap_servers=bootstrap_servers.split(','),
+                acks='all',
+                linger_ms=20
+            )
+            self.confluent = False
+            self.futures = []
+
+    def on_delivery(self, error, message):
+        if error is not None:
+            self.errors.append(str(error))
+
+    def publish(self, topic, key, value):
+        data = json.dumps(value, cls=DjangoJSONEncoder).encode()
+        if self.confluent:
+            self.producer.produce(topic, key=key.encode(), value=data, on_delivery=self.on_delivery)
+            self.producer.poll(0)
+        else:
+            self.futures.append(self.producer.send(topic, key=key.encode(), value=data))
+
+    def flush(self):
+        if self.confluent:
+            remaining = self.producer.flush(30)
+            if remaining:
+                self.errors.append(f'Не доставлено сообщений: {remaining}')
+        else:
+            self.producer.flush(30)
+            for future in self.futures:
+                if future.failed():
+                    self.errors.append(str(future.exception))
+            self.futures = []
+
+        if self.errors:
+            errors, self.errors = self.errors, []
+            raise OutboxError(f'Ошибка публикации в Kafka: {errors[0]}')
+
+    def close(self):
+        if not self.confluent:
+            self.producer.close()
+
+
+BROKERS = {
+    'kafka': KafkaBroker,
+    'file': FileBroker,
+    'memory': MemoryBroker,
+}
+
+
+def make_broker(name=None, **kwargs):
+    name = name or getattr(settings, 'OUTBOX_BROKER', 'kafka')
+    if name not in BROKERS:
+        raise OutboxError(f'Неизвестный брокер: {name}')
+    return BROKERS[name](**kwargs)
+
+
+def relay_batch(broker, topic=None, batch_size=OUTBOX_BATCH_SIZE):
+    topic = topic or getattr(settings, 'OUTBOX_TOPIC', 'inventory.changes')
+    table = connection.ops.quote_name(OutboxEvent._meta.db_table)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT id, entity_type, object_id, operation, payload, created_at FROM {table} '
+            f'WHERE published_at IS NULL ORDER BY id LIMIT %s FOR UPDATE SKIP LOCKED',
+            [batch_size]
+        )
+        events = cursor.fetchall()
+        if not events:
+            return 0
+
+        for event in events:
+            message = event_message(event)
+            broker.publish(topic, f'{message["entity"]}:{message["object_id"]}', message)
+        broker.flush()
+
+        cursor.execute(
+            f'UPDATE {table} SET published_at = now() WHERE id = ANY(%s)',
+            [[event[0] for event in events]]
+        )
+    return len(events)
+
+
+def relay_pending(broker, topic=None, batch_size=OUTBOX_BATCH_SIZE):
+    total = 0
+    while True:
+        published = relay_batch(broker, topic, batch_size)
+        total += published
+        if published < batch_size:
+            return total
+
+
+def purge_published(retention=None):
+    if retention is None:
+        retention = getattr(settings, 'OUTBOX_RETENTION_SECONDS', 7 * 86400)
+    before = timezone.now() - timedelta(seconds=retention)
+    deleted, _ = OutboxEvent.objects.filter(published_at__lt=before).delete()
+    return deleted
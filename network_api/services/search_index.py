@@ -0,0 +1,162 @@
+from django.apps import apps as global_apps
+
+
+def _join(*values):
+    return ' '.join(str(value) for value in values if value not in (None, ''))
+
+
+def computer_document(obj):
+    return (
+        obj.model,
+        _join(obj.os, f'SN {obj.serial_number}', f'инв. {obj.inventory_number}'),
+        _join(obj.model, obj.os, obj.serial_number, obj.inventory_number),
+    )
+
+
+def user_document(obj):
+    return (
+        obj.full_name,
+        _join(obj.email, obj.phone),
+        _join(obj.full_name, obj.email, obj.phone),
+    )
+
+
+def software_document(obj):
+    return (
+        _join(obj.name, obj.version),
+        _join(obj.vendor, obj.license),
+        _join(obj.name, obj.version, obj.vendor, obj.license),
+    )
+
+
+def host_computer_document(obj):
+    return (
+        obj.hostname,
+        _join(obj.ip_address, obj.mac_address),
+        _join(obj.hostname, obj.ip_address, obj.mac_address),
+    )
+
+
+def network_document(obj):
+    return (
+        f'VLAN {obj.vlan}',
+        _join(obj.ip_range, obj.subnet_mask),
+        _join(f'VLAN {obj.vlan}', obj.vlan, obj.ip_range, obj.subnet_mask),
+    )
+
+
+def server_document(obj):
+    return (
+        obj.hostname,
+        _join(obj.location, f'порт {obj.port}'),
+        _join(obj.hostname, obj.location, obj.port),
+    )
+
+
+def equipment_document(obj):
+    return (
+        obj.type,
+        _join(f'{obj.port_count} портов', f'{obj.bandwidth} Мбит/с'),
+        _join(obj.type, obj.port_count, obj.bandwidth),
+    )
+
+
+SEARCH_DOCUMENTS = {
+    'computer': ('network_api.Computer', computer_document),
+    'user': ('network_api.User', user_document),
+    'software': ('network_api.Software', software_document),
+    'host_computer': ('network_api.HostComputer', host_computer_document),
+    'network': ('network_api.Network', network_document),
+    'server': ('network_api.Server', server_document),
+    'equipment': ('network_api.Equipment', equipment_document),
+}
+
+ENTITY_TYPES = {label: entity_type for entity_type, (label, _) in SEARCH_DOCUMENTS.items()}
+
+UPDATE_FIELDS = ['title', 'subtitle', 'document']
+
+
+def entity_type_for(model):
+    return ENTITY_TYPES.get(model._meta.label)
+
+
+def build_entry(entry_model, entity_type, obj):
+    _, document = SEARCH_DOCUMENTS[entity_type]
+    title, subtitle, text = document(obj)
+    return entry_model(
+        entity_type=entity_type,
+        object_id=obj.pk,
+        title=str(title)[:255],
+        subtitle=str(subtitle)[:255],
+        document=text,
+    )
+
+
+def upsert_entries(entry_model, entries, batch_size=2000):
+    return entry_model.objects.bulk_create(
+        entries,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['entity_type', 'object_id'],
+        update_fields=UPDATE_FIELDS,
+    )
+
+
+def index_instance(instance):
+    from network_api.models import SearchEntry
+
+    entity_type = entity_type_for(instance)
+    if entity_type:
+        upsert_entries(SearchEntry, [build_entry(SearchEntry, entity_type, instance)])
+
+
+def remove_instance(instance):
+    from network_api.models import SearchEntry
+
+    entity_type = entity_type_for(instance)
+    if entity_type:
+        SearchEntry.objects.filter(entity_type=entity_type, object_id=instance.pk).delete()
+
+
+def index_objects(model, pks, apps=global_apps):
+    entry_model = apps.get_model('network_api', 'SearchEntry')
+    entity_type = entity_type_for(model)
+    if not entity_type:
+        return 0
+
+    queryset = model._default_manager.filter(pk__in=pks)
+    entries = [build_entry(entry_model, entity_type, obj) for obj in queryset.iterator(chunk_size=2000)]
+    upsert_entries(entry_model, entries)
+
+    missing = set(pks) - {entry.object_id for entry in entries}
+    if missing:
+        entry_model.objects.filter(entity_type=entity_type, object_id__in=missing).delete()
+    return len(entries)
+
+
+def rebuild_search_index(entity_types=None, apps=global_apps, batch_size=2000):
+    entry_model = apps.get_model('network_api', 'SearchEntry')
+    totals = {}
+
+    for entity_type, (label, _) in SEARCH_DOCUMENTS.items():
+        if entity_types and entity_type not in entity_types:
+            continue
+
+        model = apps.get_model(label)
+        entry_model.objects.filter(entity_type=entity_type).delete()
+
+        batch = []
+        count = 0
+        for obj in model._default_manager.order_by('pk').iterator(chunk_size=batch_size):
+            batch.append(build_entry(entry_model, entity_type, obj))
+            if len(batch) >= batch_size:
+                upsert_entries(entry_model, batch, batch_size)
+                count += len(batch)
+                batch = []
+        if batch:
+            upsert_entries(entry_model, batch, batch_size)
+            count += len(batch)
+
+        totals[entity_type] = count
+
+    return totals
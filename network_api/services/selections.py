@@ -0,0 +1,60 @@
+import re
+from collections import namedtuple
+
+from django_filters.filterset import filterset_factory
+
+from network_api.filters import contains_any
+from network_api.models import Computer, HostComputer, Network, Server, Software, User
+
+Selection = namedtuple('Selection', ['model', 'filter_fields', 'search_fields'])
+
+SELECTIONS = {
+    'computer': Selection(Computer, ['department', 'os', 'model'], ['model', 'serial_number', 'inventory_number']),
+    'software': Selection(Software, ['vendor', 'license', 'license_class'], ['name', 'version', 'vendor', 'license']),
+    'user': Selection(User, ['department', 'position_id'], ['full_name', 'email', 'phone']),
+    'host_computer': Selection(HostComputer, ['department', 'hostname'], ['hostname', 'ip_address', 'mac_address']),
+    'network': Selection(Network, ['vlan', 'equipment'], ['vlan', 'ip_range']),
+    'server': Selection(Server, ['location', 'hostname'], ['hostname', 'location']),
+}
+
+
+class SelectionError(Exception):
+    pass
+
+
+def is_id(value):
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or isinstance(value, str) and re.fullmatch(r'[0-9]+', value) is not None
+
+
+def selection_queryset(name, selection):
+    model, filter_fields, search_fields = SELECTIONS[name]
+
+    if isinstance(selection, list):
+        if not all(is_id(value) for value in selection):
+            raise SelectionError(f'{name}: ожидается список id')
+        ids = {int(value) for value in selection}
+        queryset = model.objects.filter(pk__in=ids)
+        missing = sorted(ids - set(queryset.values_list('pk', flat=True)))
+        return queryset, missing
+
+    if isinstance(selection, dict):
+        params = dict(selection)
+        search = params.pop('search', None)
+        unknown = sorted(set(params) - set(filter_fields))
+        if unknown:
+            raise SelectionError(
+                f'{name}: неизвестные фильтры {", ".join(unknown)} '
+                f'(доступны: search, {", ".join(filter_fields)})'
+            )
+
+        filterset = filterset_factory(model, fields=filter_fields)(params, queryset=model.objects.all())
+        if not filterset.is_valid():
+            raise SelectionError({name: filterset.errors})
+        queryset = filterset.qs
+        if search:
+            queryset = queryset.filter(contains_any(model, str(search), search_fields))
+        return queryset, []
+
+    raise SelectionError(f'Укажите {name}: список id или объект с фильтрами')
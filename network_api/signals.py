@@ -0,0 +1,189 @@
+from django.db import models, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from network_api.dispatch import bulk_changed
+from network_api.models import (
+    Computer, Department, Equipment, HostComputer, Network, NetworkComputer, Server, ServerNetwork, Software,
+    SoftwareComputer, User, UserComputer
+)
+from network_api.services import autocomplete
+from network_api.services.cache_versions import bump_versions
+from network_api.services.ip_allocator import lock_networks, mark_address
+from network_api.services.licensing import adjust_installed_count
+from network_api.services.outbox import (
+    OPERATION_CREATE, OPERATION_DELETE, OPERATION_UPDATE, OPERATION_UPSERT, record_rows
+)
+from network_api.services.search_index import index_instance, index_objects, remove_instance
+
+SEARCHABLE_MODELS = [Computer, User, Software, HostComputer, Network, Server, Equipment]
+AUTOCOMPLETE_MODELS = [HostComputer, Computer, User, Software]
+VERSIONED_MODELS = [
+    Computer, User, Software, Department, HostComputer, UserComputer, SoftwareComputer, NetworkComputer
+]
+OUTBOX_MODELS = [
+    Department, Computer, User, UserComputer, Software, SoftwareComputer, Equipment, Network, NetworkComputer,
+    Server, ServerNetwork, HostComputer
+]
+
+
+@receiver(pre_save, sender=SoftwareComputer)
+def remember_installed_software(sender, instance, raw=False, **kwargs):
+    if instance.pk and not raw:
+        instance._previous_software_id = SoftwareComputer.objects.filter(
+            pk=instance.pk
+        ).values_list('software_id', flat=True).first()
+
+
+@receiver(post_save, sender=SoftwareComputer)
+def software_installed(sender, instance, created, **kwargs):
+    if created:
+        adjust_installed_count([instance.software_id], 1)
+        return
+    previous = getattr(instance, '_previous_software_id', None)
+    if previous is not None and previous != instance.software_id:
+        adjust_installed_count([previous], -1)
+        adjust_installed_count([instance.software_id], 1)
+
+
+@receiver(post_delete, sender=SoftwareComputer)
+def software_uninstalled(sender, instance, **kwargs):
+    adjust_installed_count([instance.software_id], -1)
+
+
+@receiver(m2m_changed, sender=Software.computers.through)
+def software_computers_added(sender, instance, action, reverse, pk_set, **kwargs):
+    if action != 'post_add' or not pk_set:
+        return
+    if reverse:
+        adjust_installed_count(list(pk_set), 1)
+    else:
+        adjust_installed_count([instance.pk], len(pk_set))
+
+
+def update_search_entry(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_instance(instance)
+
+
+def delete_search_entry(sender, instance, **kwargs):
+    remove_instance(instance)
+
+
+for searchable_model in SEARCHABLE_MODELS:
+    post_save.connect(update_search_entry, sender=searchable_model)
+    post_delete.connect(delete_search_entry, sender=searchable_model)
+
+
+def update_autocomplete(sender, instance, raw=False, **kwargs):
+    if not raw:
+        autocomplete.update_instance(instance)
+
+
+def delete_autocomplete(sender, instance, **kwargs):
+    autocomplete.remove_instance(instance)
+
+
+for autocomplete_model in AUTOCOMPLETE_MODELS:
+    post_save.connect(update_autocomplete, sender=autocomplete_model)
+    post_delete.connect(delete_autocomplete, sender=autocomplete_model)
+
+
+def bump_model_version(sender, **kwargs):
+    transaction.on_commit(lambda: bump_versions(sender))
+
+
+for versioned_model in VERSIONED_MODELS:
+    post_save.connect(bump_model_version, sender=versioned_model)
+    post_delete.connect(bump_model_version, sender=versioned_model)
+
+
+@receiver(m2m_changed)
+def bump_link_version(sender, action, **kwargs):
+    if sender in VERSIONED_MODELS and action in ('post_add', 'post_remove', 'post_clear'):
+        bump_model_version(sender)
+
+
+def record_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        record_rows(sender, [instance.pk], OPERATION_CREATE if created else OPERATION_UPDATE)
+
+
+def detached_relations(model):
+    return [
+        relation for relation in model._meta.related_objects
+        if relation.one_to_many and relation.on_delete in (models.SET_NULL, models.SET_DEFAULT) and relation.related_model in OUTBOX_MODELS
+    ]
+
+
+def record_deleted(sender, instance, **kwargs):
+    record_rows(sender, [instance.pk], OPERATION_DELETE)
+    instance._detached_rows = [
+        (relation.related_model, list(
+            relation.related_model._base_manager.filter(**{relation.field.name: instance.pk}).values_list('pk', flat=True)
+        ))
+        for relation in detached_relations(sender)
+    ]
+
+
+def record_detached(sender, instance, **kwargs):
+    for model, pks in getattr(instance, '_detached_rows', []):
+        record_rows(model, pks, OPERATION_UPDATE)
+
+
+for outbox_model in OUTBOX_MODELS:
+    post_save.connect(record_saved, sender=outbox_model)
+    pre_delete.connect(record_deleted, sender=outbox_model)
+    post_delete.connect(record_detached, sender=outbox_model)
+
+
+def link_rows(sender, instance, model, pk_set):
+    columns = {field.related_model: field.name for field in sender._meta.get_fields() if field.many_to_one}
+    filters = {columns[type(instance)]: instance.pk, f'{columns[model]}__in': pk_set}
+    return list(sender.objects.filter(**filters).values_list('pk', flat=True))
+
+
+@receiver(m2m_changed)
+def record_link_changes(sender, instance, action, model, pk_set, **kwargs):
+    if sender in OUTBOX_MODELS and action == 'post_add' and pk_set:
+        record_rows(sender, link_rows(sender, instance, model, pk_set), OPERATION_CREATE)
+
+
+@receiver(bulk_changed)
+def bulk_rows_changed(sender, pks, **kwargs):
+    if sender in OUTBOX_MODELS:
+        record_rows(sender, pks, OPERATION_UPSERT)
+    if sender in SEARCHABLE_MODELS:
+        index_objects(sender, pks)
+    if sender in AUTOCOMPLETE_MODELS:
+        transaction.on_commit(lambda: autocomplete.update_rows(sender, pks))
+    if sender in VERSIONED_MODELS:
+        bump_model_version(sender)
+
+
+@receiver(pre_save, sender=NetworkComputer)
+def remember_network_address(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    if instance.pk:
+        instance._previous_address = NetworkComputer.objects.filter(
+            pk=instance.pk
+        ).values_list('network_id', 'ip_address').first()
+    previous = getattr(instance, '_previous_address', None)
+    lock_networks(instance.network_id, previous[0] if previous else None)
+
+
+@receiver(post_save, sender=NetworkComputer)
+def network_address_assigned(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_address', None)
+    current = (instance.network_id, str(instance.ip_address))
+    if previous and previous != current:
+        mark_address(*previous, in_use=False)
+    mark_address(*current, in_use=True)
+
+
+@receiver(post_delete, sender=NetworkComputer)
+def network_address_released(sender, instance, **kwargs):
+    mark_address(instance.network_id, str(instance.ip_address), in_use=False)
@@ -0,0 +1,99 @@
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from network_api.models import Computer, HostComputer, Software, User
+from network_api.services import autocomplete
+
+
+class AutocompleteViewSetTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.optiplex = Computer.objects.create(
+            serial_number=1001, model="Dell OptiPlex", os="Windows 10", inventory_number=5001
+        )
+        Computer.objects.create(
+            serial_number=1002, model="Dell OptiPlex", os="Windows 11", inventory_number=5002
+        )
+        cls.host = HostComputer.objects.create(
+            hostname="dell-build-01", ip_address="10.0.5.17", mac_address="00:11:22:33:44:55"
+        )
+        cls.user = User.objects.create(
+            full_name="Иван Петров", phone="123456", email="ivan@company.com", position_id=3
+        )
+        Software.objects.create(name="PyCharm", version="2023.1", license="Commercial", vendor="JetBrains")
+
+        cls.base_url = '/api/autocomplete/'
+
+    def setUp(self):
+        self.client = APIClient()
+        autocomplete.reset()
+
+    def suggestions(self, **params):
+        response = self.client.get(self.base_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(hit['type'], hit['value']) for hit in response.data['results']]
+
+    def test_query_is_required(self):
+        response = self.client.get(self.base_url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_prefix_across_types(self):
+        self.assertEqual(
+            self.suggestions(q='del'),
+            [('host_computer', 'dell-build-01'), ('computer_model', 'Dell OptiPlex')]
+        )
+
+    def test_distinct_values_are_counted(self):
+        response = self.client.get(self.base_url, {'q': 'opti', 'type': 'computer_model'})
+        hit = response.data['results'][0]
+        self.assertEqual((hit['value'], hit['count'], hit['id']), ('Dell OptiPlex', 2, self.optiplex.id))
+
+    def test_matches_word_prefix(self):
+        self.assertEqual(self.suggestions(q='пет'), [('user', 'Иван Петров')])
+        self.assertEqual(self.suggestions(q='build'), [('host_computer', 'dell-build-01')])
+
+    def test_limit_is_clamped(self):
+        self.assertEqual(self.suggestions(q='opti', limit=0), [('computer_model', 'Dell OptiPlex')])
+        self.assertEqual(self.suggestions(q='opti', limit=-5), [('computer_model', 'Dell OptiPlex')])
+
+    def test_index_is_not_queried_after_warm_up(self):
+        self.suggestions(q='py')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.suggestions(q='pyc'), [('software', 'PyCharm')])
+
+    def test_updated_by_signals_on_commit(self):
+        self.suggestions(q='x')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.host.hostname = 'hp-render-02'
+            self.host.save()
+            Software.objects.create(name="Pycharm Community", version="2023.1", license="Free", vendor="JetBrains")
+
+        self.assertEqual(self.suggestions(q='dell', type='host_computer'), [])
+        self.assertEqual(self.suggestions(q='render'), [('host_computer', 'hp-render-02')])
+        self.assertEqual(
+            self.suggestions(q='pycharm'),
+            [('software', 'PyCharm'), ('software', 'Pycharm Community')]
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        self.assertEqual(self.suggestions(q='иван'), [])
+
+    def test_bulk_changes_update_index_without_reload(self):
+        self.suggestions(q='x')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/computers/bulk/', [
+                {'serial_number': 3001, 'model': 'Acer Aspire', 'os': 'Windows 11', 'inventory_number': 7001},
+            ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.suggestions(q='acer'), [('computer_model', 'Acer Aspire')])
+
+    def test_stale_index_is_served_while_refreshing(self):
+        self.suggestions(q='py', type='software')
+        index = autocomplete.INDEXES['software']
+        index.loaded_at -= 10
+        with self.settings(AUTOCOMPLETE_REFRESH_SECONDS=1), self.assertNumQueries(0):
+            self.assertEqual(self.suggestions(q='pyc', type='software'), [('software', 'PyCharm')])
+        index.refresh_thread.join()
@@ -0,0 +1,224 @@
+import gzip
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.db import connection
+from django.core.management import CommandError, call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from network_api.models import Computer, Department, Software, SoftwareComputer, User
+from network_api.services.backup import (
+    BackupError, IncrementalBackupError, create_backup, create_incremental_backup, read_meta, restore_backup,
+    verify_backup, write_meta
+)
+
+
+class BackupTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(room_number=101, internal_phone=123, employee_count=5)
+        cls.computers = [
+            Computer.objects.create(
+                serial_number=1000 + i, model="Dell\tOptiPlex\n", os="Windows 10", inventory_number=5000 + i,
+                department=cls.department
+            )
+            for i in range(3)
+        ]
+        cls.office = Software.objects.create(name='Office', version='2021', license='Commercial', vendor='Microsoft')
+        SoftwareComputer.objects.create(software=cls.office, computer=cls.computers[0])
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'backup')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def backup(self, **kwargs):
+        meta = create_backup(self.path, **kwargs)
+        write_meta(self.path, meta)
+        return meta
+
+    def test_backup_records_counts_and_honours_exclude(self):
+        meta = self.backup(compression='gzip', exclude=['auth', 'network_api.searchentry'])
+        tables = {table['table']: table for table in meta['tables']}
+
+        self.assertEqual(tables['Computer']['rows'], 3)
+        self.assertEqual(tables['Software_Computer']['rows'], 1)
+        self.assertNotIn('Search_Entry', tables)
+        self.assertNotIn('auth_user', tables)
+        self.assertEqual(read_meta(self.path)['tables_included'], meta['tables_included'])
+        with gzip.open(os.path.join(self.path, tables['Department']['file'])) as f:
+            self.assertEqual(f.read().count(b'\n'), 1)
+
+        with self.assertRaises(BackupError):
+            create_backup(os.path.join(self.directory, 'other'), exclude=['network_api.nosuchmodel'])
+
+    def test_restore_round_trip(self):
+        self.backup(compression='gzip')
+        Computer.objects.filter(pk=self.computers[1].pk).delete()
+        Computer.objects.create(serial_number=9999, model="HP", os="Linux", inventory_number=9999)
+
+        restored = restore_backup(self.path)
+        self.assertEqual(restored['Computer'], 3)
+        self.assertEqual(
+            sorted(Computer.objects.values_list('serial_number', flat=True)), [1000, 1001, 1002]
+        )
+        self.assertEqual(Computer.objects.get(serial_number=1000).model, "Dell\tOptiPlex\n")
+        self.assertGreater(Computer.objects.create(serial_number=8888, model="HP", os="Linux", inventory_number=1).pk,
+                           max(computer.pk for computer in self.computers))
+
+    def test_restore_rejects_corrupted_table(self):
+        meta = self.backup()
+        table = next(table for table in meta['tables'] if table['table'] == 'Computer')
+        with open(os.path.join(self.path, table['file']), 'rb+') as f:
+            data = f.read()
+            f.seek(0)
+            f.write(data.replace(b'Windows', b'Wind0ws'))
+
+        Computer.objects.create(serial_number=9999, model="HP", os="Linux", inventory_number=9999)
+        with self.assertRaises(BackupError):
+            restore_backup(self.path)
+        self.assertTrue(Computer.objects.filter(serial_number=9999).exists())
+
+
+    def test_verify_detects_truncated_archive_without_queries(self):
+        meta = self.backup(compression='gzip')
+        with self.assertNumQueries(0):
+            report = verify_backup(self.path)
+        self.assertTrue(report['valid'], report['errors'])
+        self.assertEqual(report['tables'], len(meta['tables']))
+
+        table = next(table for table in meta['tables'] if table['table'] == 'Computer')
+        path = os.path.join(self.path, table['file'])
+        with open(path, 'rb+') as f:
+            f.truncate(os.path.getsize(path) - 10)
+
+        report = verify_backup(self.path)
+        self.assertFalse(report['valid'])
+        self.assertTrue(all(error.startswith('Таблица Computer') for error in report['errors']))
+        with self.assertRaises(CommandError):
+            call_command('verify_backup', self.path, stdout=StringIO())
+
+    def test_verify_backup_api(self):
+        self.path = os.path.join(self.directory, 'backups', 'backup')
+        os.makedirs(os.path.dirname(self.path))
+        self.backup()
+
+        with override_settings(BASE_DIR=self.directory):
+            response = self.client.get('/api/database/verify_backup/')
+            missing = self.client.get('/api/database/verify_backup/', {'backup': '../backup'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['valid'])
+        self.assertEqual([report['backup'] for report in response.data['backups']], ['backup'])
+        self.assertEqual(missing.status_code, 404)
+
+class ParallelBackupTests(TransactionTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'backup')
+        department = Department.objects.create(room_number=101, internal_phone=123, employee_count=5)
+        Computer.objects.bulk_create([
+            Computer(serial_number=1000 + i, model="Dell", os="Windows 10", inventory_number=i, department=department)
+            for i in range(50)
+        ])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def foreign_keys(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM pg_constraint WHERE contype = 'f' AND convalidated")
+            return cursor.fetchone()[0]
+
+    def test_parallel_round_trip(self):
+        foreign_keys = self.foreign_keys()
+        serial = create_backup(os.path.join(self.directory, 'serial'))
+        meta = create_backup(self.path, compression='gzip', jobs=3)
+        write_meta(self.path, meta)
+        self.assertEqual(
+            [table['sha256'] for table in meta['tables']], [table['sha256'] for table in serial['tables']]
+        )
+
+        Computer.objects.all().delete()
+        restored = restore_backup(self.path, jobs=3)
+        self.assertEqual(restored['Computer'], 50)
+        self.assertEqual(Computer.objects.filter(department__room_number=101).count(), 50)
+        self.assertEqual(self.foreign_keys(), foreign_keys)
+
+
+class IncrementalBackupTests(TransactionTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.department = Department.objects.create(room_number=101, internal_phone=123, employee_count=5)
+        self.computers = [
+            Computer.objects.create(
+                serial_number=1000 + i, model="Dell", os="Windows 10", inventory_number=i, department=self.department
+            )
+            for i in range(3)
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def backup(self, name, base=None):
+        path = os.path.join(self.directory, name)
+        meta = create_incremental_backup(path, base) if base else create_backup(path)
+        write_meta(path, meta)
+        return path, meta
+
+    def test_incremental_chain_restores_changes(self):
+        base, _ = self.backup('base')
+
+        updated, deleted, _ = self.computers
+        updated.os = 'Linux'
+        updated.save()
+        deleted_id = deleted.id
+        deleted.delete()
+        created = Computer.objects.create(
+            serial_number=2000, model="HP", os="Windows 11", inventory_number=10, department=self.department
+        )
+
+        path, meta = self.backup('increment', base)
+        computers = next(table for table in meta['tables'] if table['table'] == 'Computer')
+        self.assertEqual(computers['mode'], 'changes')
+        self.assertEqual((computers['keys'], computers['rows']), (3, 2))
+
+        Computer.objects.all().delete()
+        restore_backup(path)
+
+        self.assertEqual(Computer.objects.get(id=updated.id).os, 'Linux')
+        self.assertFalse(Computer.objects.filter(id=deleted_id).exists())
+        self.assertTrue(Computer.objects.filter(id=created.id).exists())
+        self.assertEqual(Computer.objects.count(), 3)
+
+    def test_incremental_chain_spans_department_delete(self):
+        user = User.objects.create(
+            full_name='Иванов Иван', phone='+7 900 000-00-00', email='ivanov@example.com', position_id=1,
+            department=self.department
+        )
+        base, _ = self.backup('base')
+
+        self.department.delete()
+        path, _ = self.backup('increment', base)
+
+        Computer.objects.all().delete()
+        restore_backup(path)
+
+        self.assertFalse(Department.objects.exists())
+        self.assertEqual(Computer.objects.filter(department__isnull=True).count(), 3)
+        self.assertIsNone(User.objects.get(pk=user.pk).department_id)
+
+    def test_incremental_refuses_after_unlogged_writes(self):
+        base, _ = self.backup('base')
+        restore_backup(base)
+
+        with self.assertRaises(IncrementalBackupError):
+            self.backup('increment', base)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'increment')))
@@ -0,0 +1,63 @@
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from network_api.models import Computer, Department, Software, SoftwareComputer, User, UserComputer
+
+
+class BatchViewTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(room_number=101, internal_phone=123, employee_count=5)
+        cls.office = Software.objects.create(name='Office', version='2021', license='Commercial', vendor='Microsoft')
+        cls.user = User.objects.create(
+            full_name='Иванов Иван', phone='+7 900 000-00-00', email='ivanov@example.com', position_id=1
+        )
+        cls.url = '/api/batch/'
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def workstation(self, serial_number):
+        return {
+            'method': 'POST',
+            'path': '/api/computers/',
+            'ref': 'pc',
+            'body': {
+                'serial_number': serial_number,
+                'model': 'Dell OptiPlex',
+                'os': 'Windows 11',
+                'inventory_number': serial_number,
+                'department': self.department.id,
+            },
+        }
+
+    def test_provision_workstation(self):
+        response = self.client.post(self.url, {'operations': [
+            self.workstation(7001),
+            {'method': 'POST', 'path': '/api/user-computers/', 'body': {'user': self.user.id, 'computer': '$pc.id'}},
+            {'method': 'POST', 'path': '/api/software-computers/', 'body': {'software': self.office.id, 'computer': '$pc'}},
+            {'method': 'GET', 'path': '/api/computers/$pc.id/'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([result['status'] for result in response.data['results']], [201, 201, 201, 200])
+
+        computer = Computer.objects.get(serial_number=7001)
+        self.assertEqual(response.data['results'][3]['data']['id'], computer.id)
+        self.assertTrue(UserComputer.objects.filter(user=self.user, computer=computer).exists())
+        self.assertTrue(SoftwareComputer.objects.filter(software=self.office, computer=computer).exists())
+
+    def test_failed_operation_rolls_back(self):
+        response = self.client.post(self.url, {'operations': [
+            self.workstation(7002),
+            {'method': 'POST', 'path': '/api/software-computers/', 'body': {'software': 999999, 'computer': '$pc.id'}},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['failed'], 1)
+        self.assertFalse(Computer.objects.filter(serial_number=7002).exists())
+
+    def test_invalid_operations(self):
+        for operations in ([], [{'method': 'POST', 'path': '/api/batch/'}], [{'path': '/api/users/$missing.id/'}]):
+            response = self.client.post(self.url, {'operations': operations}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('error', response.data)
@@ -0,0 +1,164 @@
+from datetime import date
+
+from django.db import IntegrityError, transaction
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from network_api.models import (
+    Computer, Department, Equipment, IpAddressPool, Network, NetworkComputer, Server, ServerNetwork,
+    Software, SoftwareComputer, User, UserComputer
+)
+from network_api.services import ip_allocator
+
+
+class BulkLinkTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(room_number=101, internal_phone=123, employee_count=5)
+        cls.computers = [
+            Computer.objects.create(
+                serial_number=1000 + i,
+                model='Dell OptiPlex' if i % 2 else 'HP EliteBook',
+                os='Windows 10',
+                inventory_number=5000 + i,
+                department=cls.department if i < 3 else None
+            )
+            for i in range(5)
+        ]
+        cls.office = Software.objects.create(name='Office', version='2021', license='Commercial', vendor='Microsoft')
+        cls.vim = Software.objects.create(name='Vim', version='9', license='Free', vendor='Vim')
+        cls.user = User.objects.create(
+            full_name='Иванов Иван', phone='+7 900 000-00-00', email='ivanov@example.com', position_id=1
+        )
+        cls.equipment = Equipment.objects.create(
+            bandwidth=1000, setup_date=date(2023, 1, 1), port_count=24, type='Cisco'
+        )
+        cls.network = Network.objects.create(
+            subnet_mask='255.255.255.0', vlan=10, ip_range='10.0.0.0/24', equipment=cls.equipment
+        )
+        cls.server = Server.objects.create(
+            port=22, hostname='server-1', connection_date=date(2023, 1, 1), location='ЦОД-1'
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_assign_software_by_ids_and_filter(self):
+        response = self.client.post('/api/software-computers/assign/', {
+            'software': [self.office.id, 999999],
+            'computer': {'department': self.department.id},
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            'requested': 3, 'created': 3, 'existing': 0, 'missing': {'software': [999999]}
+        })
+
+        response = self.client.post('/api/software-computers/assign/', {
+            'software': [self.office.id, self.vim.id],
+            'computer': {'search': 'Dell'},
+        }, format='json')
+        self.assertEqual((response.data['requested'], response.data['created']), (4, 3))
+
+        self.office.refresh_from_db()
+        self.assertEqual(self.office.installed_count, 4)
+        self.assertEqual(SoftwareComputer.objects.count(), 6)
+
+    def test_unassign_software(self):
+        self.client.post('/api/software-computers/assign/', {
+            'software': [self.office.id, self.vim.id],
+            'computer': [computer.id for computer in self.computers],
+        }, format='json')
+
+        response = self.client.post('/api/software-computers/unassign/', {
+            'software': [self.office.id],
+            'computer': {'os': 'Windows 10'},
+        }, format='json')
+        self.assertEqual(response.data['deleted'], 5)
+
+        self.office.refresh_from_db()
+        self.vim.refresh_from_db()
+        self.assertEqual((self.office.installed_count, self.vim.installed_count), (0, 5))
+
+    def test_assign_users_and_servers(self):
+        response = self.client.post('/api/user-computers/assign/', {
+            'user': [self.user.id],
+            'computer': [self.computers[0].id, self.computers[1].id],
+        }, format='json')
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(UserComputer.objects.filter(user=self.user).count(), 2)
+
+        response = self.client.post('/api/server-networks/assign/', {
+            'server': {'location': 'ЦОД-1'},
+            'network': [self.network.id],
+        }, format='json')
+        self.assertEqual(response.data['created'], 1)
+        self.assertTrue(ServerNetwork.objects.filter(server=self.server, network=self.network).exists())
+
+    def test_assign_network_allocates_addresses(self):
+        response = self.client.post('/api/network-computers/assign/', {
+            'network': [self.network.id],
+            'computer': [self.computers[0].id, self.computers[1].id, self.computers[2].id],
+            'mac_addresses': {
+                str(self.computers[0].id): '00-1A-2B-3C-4D-5E',
+                str(self.computers[1].id): '00:1a:2b:3c:4d:5f',
+            },
+            'speed': 100,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['skipped'], [self.computers[2].id])
+        self.assertEqual(
+            sorted(NetworkComputer.objects.values_list('ip_address', flat=True)),
+            ['10.0.0.1', '10.0.0.2']
+        )
+        self.assertEqual(ip_allocator.pool_summary(self.network)['used'], 2)
+
+        response = self.client.post('/api/network-computers/unassign/', {
+            'network': [self.network.id],
+            'computer': [self.computers[0].id],
+        }, format='json')
+        self.assertEqual(response.data['deleted'], 1)
+        self.assertEqual(ip_allocator.pool_summary(self.network)['used'], 1)
+        self.assertTrue(IpAddressPool.objects.filter(network=self.network).exists())
+
+    def test_manual_address_is_not_allocated_twice(self):
+        ip_allocator.pool_summary(self.network)
+        NetworkComputer.objects.create(
+            network=self.network, computer=self.computers[3], ip_address='10.0.0.1',
+            mac_address='00:1a:2b:3c:4d:60', speed=100
+        )
+        with transaction.atomic():
+            self.assertEqual(ip_allocator.allocate(self.network), ['10.0.0.2'])
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            NetworkComputer.objects.create(
+                network=self.network, computer=self.computers[4], ip_address='10.0.0.1',
+                mac_address='00:1a:2b:3c:4d:61', speed=100
+            )
+
+    def test_invalid_requests(self):
+        response = self.client.post('/api/software-computers/assign/', {
+            'software': [self.office.id],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post('/api/software-computers/assign/', {
+            'software': [self.office.id],
+            'computer': {'serial_number': 1000},
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post('/api/network-computers/assign/', {
+            'network': [],
+            'computer': [self.computers[0].id],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        for ids in ([float(self.office.id)], [True], [str(self.office.id) + '.0'], ['١']):
+            response = self.client.post('/api/software-computers/assign/', {
+                'software': ids,
+                'computer': [self.computers[0].id],
+            }, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(SoftwareComputer.objects.exists())
@@ -1,8 +1,12 @@
+import json
+
+from django.core.cache import cache
+from django.test import override_settings
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
 from network_api.models import (
     Department, Computer, NetworkComputer, User, Software,
-    Network, Equipment
+    Network, Equipment, SearchEntry
 )
 
 
@@ -136,7 +140,7 @@ class ComputerViewSetTests(APITestCase):
         }
         response = self.client.post(self.base_url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn('error', response.data)
+        self.assertEqual(response.data['error'], 'Компьютер с таким серийным номером уже существует')
 
     def test_retrieve_computer(self):
         url = f'{self.base_url}{self.computer1.id}/'
@@ -203,4 +207,122 @@ class ComputerViewSetTests(APITestCase):
     def test_details_action_not_found(self):
         url = f'{self.base_url}999/details/'
         response = self.client.get(url)
-        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_facets(self):
+        url = f'{self.base_url}facets/'
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total'], 3)
+
+        facets = response.data['facets']
+        self.assertEqual(
+            facets['department'],
+            [
+                {'value': self.department1.id, 'count': 2, 'label': 101},
+                {'value': self.department2.id, 'count': 1, 'label': 202},
+            ]
+        )
+        self.assertEqual(len(facets['os']), 3)
+
+    def test_facets_honour_filters(self):
+        response = self.client.get(f'{self.base_url}facets/', {'department': self.department1.id, 'facet': 'os'})
+        self.assertEqual(response.data['total'], 2)
+        self.assertEqual(list(response.data['facets']), ['os'])
+        self.assertEqual(
+            {bucket['value'] for bucket in response.data['facets']['os']},
+            {'Windows 10', 'macOS'}
+        )
+
+    @override_settings(FACETS_CACHE_SECONDS=60)
+    def test_facets_cache_invalidated_on_commit(self):
+        cache.clear()
+        url = f'{self.base_url}facets/'
+        self.client.get(url)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url).data['total'], 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Computer.objects.create(serial_number=1004, model="Dell OptiPlex", os="Windows 10", inventory_number=5004)
+        self.assertEqual(self.client.get(url).data['total'], 4)
+
+    def test_bulk_create(self):
+        rows = [
+            {'serial_number': 3001, 'model': 'Acer Aspire', 'os': 'Windows 11', 'inventory_number': 7001,
+             'department': self.department1.id},
+            {'serial_number': 3002, 'model': 'Acer Swift', 'os': 'Linux Ubuntu', 'inventory_number': 7002},
+        ]
+        response = self.client.post(f'{self.base_url}bulk/', rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data['created'], response.data['rejected']), (2, 0))
+        self.assertEqual(Computer.objects.count(), 5)
+        self.assertTrue(SearchEntry.objects.filter(
+            entity_type='computer', object_id=response.data['results'][0]['id']
+        ).exists())
+
+    def test_bulk_rejects_invalid_and_duplicate_rows(self):
+        rows = [
+            {'serial_number': 3001, 'model': 'Acer Aspire', 'os': 'Windows 11', 'inventory_number': 7001},
+            {'serial_number': 3001, 'model': 'Acer Swift', 'os': 'Windows 11', 'inventory_number': 7002},
+            {'serial_number': 1001, 'model': 'Dell OptiPlex', 'os': 'Windows 11', 'inventory_number': 5001},
+            {'serial_number': 3003, 'model': 'Acer Nitro', 'os': 'Windows 11', 'inventory_number': 7003,
+             'department': 999999},
+            {'model': 'Без серийника'},
+        ]
+        response = self.client.post(f'{self.base_url}bulk/', rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data['created'], response.data['rejected']), (1, 4))
+        self.assertEqual(
+            [result['status'] for result in response.data['results']],
+            ['created', 'rejected', 'rejected', 'rejected', 'rejected']
+        )
+        self.assertIn('serial_number', response.data['results'][1]['errors'])
+        self.assertIn('department', response.data['results'][3]['errors'])
+        self.assertEqual(Computer.objects.get(serial_number=1001).os, 'Windows 10')
+
+    def test_bulk_update_on_conflict(self):
+        rows = [
+            {'serial_number': 1001, 'model': 'Dell OptiPlex', 'os': 'Windows 11', 'inventory_number': 5001},
+            {'id': self.computer2.id, 'serial_number': 1002, 'model': 'HP EliteBook', 'os': 'Debian',
+             'inventory_number': 5002},
+        ]
+        response = self.client.post(f'{self.base_url}bulk/?on_conflict=update', rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 2)
+        self.assertEqual(response.data['results'][0]['id'], self.computer1.id)
+        self.assertEqual(Computer.objects.get(serial_number=1001).os, 'Windows 11')
+        self.assertEqual(Computer.objects.get(serial_number=1002).os, 'Debian')
+        self.assertEqual(Computer.objects.count(), 3)
+
+    def test_bulk_ndjson(self):
+        rows = [
+            {'serial_number': 3001, 'model': 'Acer Aspire', 'os': 'Windows 11', 'inventory_number': 7001},
+            {'serial_number': 3002, 'model': 'Acer Swift', 'os': 'Windows 11', 'inventory_number': 7002},
+        ]
+        body = '\n'.join(json.dumps(row) for row in rows) + '\n'
+        response = self.client.post(f'{self.base_url}bulk/', body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 2)
+
+        response = self.client.post(f'{self.base_url}bulk/', '{"serial_number": ', content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_requires_list(self):
+        response = self.client.post(f'{self.base_url}bulk/', {'serial_number': 3001}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_not_modified(self):
+        cache.clear()
+        etag = self.client.get(self.base_url)['ETag']
+        response = self.client.get(self.base_url, HTTP_IF_NONE_MATCH=f'W/{etag}')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(self.base_url, {'department': self.department1.id}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.department1.employee_count += 1
+            self.department1.save()
+        response = self.client.get(self.base_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
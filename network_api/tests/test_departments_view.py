@@ -1,6 +1,9 @@
+from django.core.cache import cache
+from django.db.models import F
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
-from network_api.models import Department, Computer, User, HostComputer
+from network_api.models import Department, Computer, User, HostComputer, ModelVersion
+from network_api.services.cache_versions import model_version
 
 class DepartmentViewSetTests(APITestCase):
 
@@ -406,4 +409,79 @@ class DepartmentViewSetTests(APITestCase):
             self.assertEqual(response.data['results'][0]['room_number'], 202)
         else:
             self.assertEqual(len(response.data), 1)
-            self.assertEqual(response.data[0]['room_number'], 202)
\ No newline at end of file
+            self.assertEqual(response.data[0]['room_number'], 202)
+
+    def test_move_to_department(self):
+        url = f'{self.base_url}{self.department3.id}/move/'
+        cache.clear()
+        version = model_version(Computer)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, {
+                'computers': {'department': self.department1.id},
+                'users': [self.user3.id, 999999],
+                'host_computers': {'search': 'host-101'},
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['moved'], {'computers': 2, 'users': 1, 'host_computers': 2})
+        self.assertEqual(response.data['missing'], {'users': [999999]})
+
+        self.assertEqual(self.department3.computers.count(), 2)
+        self.assertEqual(set(self.department3.users.all()), {self.user3})
+        self.assertEqual(set(self.department3.host_computers.all()), {self.host1, self.host2})
+        self.assertNotEqual(model_version(Computer), version)
+
+    def test_move_requires_selection(self):
+        url = f'{self.base_url}{self.department3.id}/move/'
+        response = self.client.post(url, {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(f'{self.base_url}999999/move/', {'users': [self.user1.id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.post(f'{self.base_url}abc/move/', {'users': [self.user1.id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_retrieve_not_modified(self):
+        url = f'{self.base_url}{self.department1.id}/'
+        cache.clear()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Computer.objects.create(
+                serial_number=9001, model="HP", os="Linux", inventory_number=9001, department=self.department1
+            )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_etag_follows_versions_bumped_elsewhere(self):
+        etag = self.client.get(self.base_url)['ETag']
+        self.assertEqual(self.client.get(self.base_url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        ModelVersion.objects.filter(label='network_api.department').update(version=F('version') + 1)
+        response = self.client.get(self.base_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_update_if_match(self):
+        url = f'{self.base_url}{self.department2.id}/'
+        etag = self.client.get(url)['ETag']
+
+        response = self.client.patch(url, {'employee_count': 16}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.patch(url, {'employee_count': 17}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertIn('error', response.data)
+        self.department2.refresh_from_db()
+        self.assertEqual(self.department2.employee_count, 16)
+
+        response = self.client.patch(url, {'employee_count': 17}, format='json', HTTP_IF_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,90 @@
+import ipaddress
+
+from django.test import TestCase
+from network_api.filters import (
+    ADDRESS, INTEGER, INTEGER_RANGE, MAC, NETWORK, TEXT, VLAN, contains_any, parse_search, parse_term
+)
+from network_api.models import Computer, Department, Equipment, HostComputer, Network
+
+
+class ParseTermTests(TestCase):
+
+    def test_term_kinds(self):
+        cases = {
+            '1001': (INTEGER, 1001),
+            '100..200': (INTEGER_RANGE, (100, 200)),
+            '300-200': (INTEGER_RANGE, (200, 300)),
+            'vlan:140': (VLAN, 140),
+            '10.0.5.17': (ADDRESS, ipaddress.ip_address('10.0.5.17')),
+            '10.0.5.0/24': (NETWORK, ipaddress.ip_network('10.0.5.0/24')),
+            '10.0.5': (NETWORK, ipaddress.ip_network('10.0.5.0/24')),
+            '00-1A-2B-3C-4D-5E': (MAC, '00:1a:2b:3c:4d:5e'),
+            'Dell': (TEXT, 'Dell'),
+            '2023.1': (TEXT, '2023.1'),
+        }
+        for raw, expected in cases.items():
+            with self.subTest(raw=raw):
+                self.assertEqual(parse_term(raw)[:2], expected)
+
+    def test_vlan_keyword_joins_number(self):
+        terms = parse_search('vlan 140 cisco')
+        self.assertEqual([(term.kind, term.value) for term in terms], [(VLAN, 140), (TEXT, 'cisco')])
+
+
+class TypedSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.equipment = Equipment.objects.create(
+            type="Cisco Catalyst", bandwidth=1000, port_count=48, setup_date="2023-01-01"
+        )
+        cls.office = Network.objects.create(
+            subnet_mask="255.255.255.0", vlan=140, ip_range="192.168.14.0/24", equipment=cls.equipment
+        )
+        cls.lab = Network.objects.create(
+            subnet_mask="255.255.255.0", vlan=14, ip_range="10.14.0.0/24", equipment=cls.equipment
+        )
+        cls.computer = Computer.objects.create(
+            serial_number=784512, model="Dell OptiPlex 7010", os="Windows 10", inventory_number=5001
+        )
+        Computer.objects.create(
+            serial_number=78451, model="HP EliteDesk", os="Windows 11", inventory_number=5002
+        )
+        cls.host = HostComputer.objects.create(
+            hostname="build-01", ip_address="10.14.0.17", mac_address="00:11:22:33:44:55"
+        )
+        cls.department = Department.objects.create(
+            room_number=140, internal_phone=456, employee_count=3, employee_phones=[1001]
+        )
+
+    def search(self, model, value, fields):
+        return list(model.objects.filter(contains_any(model, value, fields)).order_by('pk'))
+
+    def test_integer_is_exact(self):
+        fields = ['model', 'serial_number', 'inventory_number']
+        self.assertEqual(self.search(Computer, '784512', fields), [self.computer])
+        self.assertEqual(self.search(Computer, '7010', fields), [self.computer])
+
+    def test_integer_range(self):
+        self.assertEqual(len(self.search(Computer, '5000..5001', ['inventory_number'])), 1)
+
+    def test_vlan_only_matches_vlan(self):
+        fields = ['vlan', 'ip_range', 'subnet_mask', 'equipment__type']
+        self.assertEqual(self.search(Network, 'vlan 14', fields), [self.lab])
+        self.assertEqual(self.search(Network, '14', fields), [self.lab])
+
+    def test_address_and_prefix_use_containment(self):
+        fields = ['vlan', 'ip_range', 'subnet_mask', 'equipment__type']
+        self.assertEqual(self.search(Network, '192.168.14.37', fields), [self.office])
+        self.assertEqual(self.search(Network, '192.168', fields), [self.office])
+        self.assertEqual(self.search(HostComputer, '10.14', ['hostname', 'ip_address', 'mac_address']), [self.host])
+
+    def test_mac_is_exact(self):
+        fields = ['hostname', 'ip_address', 'mac_address']
+        self.assertEqual(self.search(HostComputer, '0011.2233.4455', fields), [self.host])
+
+    def test_out_of_range_integer_matches_nothing(self):
+        self.assertEqual(self.search(Department, '99999999999', ['room_number', 'employee_phones']), [])
+
+    def test_free_text_skips_numeric_columns(self):
+        self.assertEqual(self.search(Department, 'abc', ['room_number', 'internal_phone']), [])
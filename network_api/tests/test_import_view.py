@@ -0,0 +1,129 @@
+import io
+import os
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from openpyxl import Workbook
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from network_api.models import Computer, Department, LicenseClass, SearchEntry, Software, User
+
+
+def csv_file(content, name='inventory.csv'):
+    return SimpleUploadedFile(name, content.encode('utf-8'), content_type='text/csv')
+
+
+class InventoryImportTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(room_number=101, internal_phone=123, employee_count=5)
+        cls.computer = Computer.objects.create(
+            serial_number=1001, model='Dell OptiPlex', os='Windows 10', inventory_number=5001
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_import_computers_csv(self):
+        content = (
+            'Серийный номер;Модель;ОС;Инвентарный номер;Отдел;Комментарий\n'
+            f'2001;Lenovo ThinkPad;Windows 11;6001;{self.department.id};новый\n'
+            '2002;HP ProBook;Linux Ubuntu;6002;;\n'
+            '1001;Dell OptiPlex;Windows 11;5001;;уже есть\n'
+        )
+        response = self.client.post('/api/import/computers/', {'file': csv_file(content)}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            (response.data['created'], response.data['updated'], response.data['skipped'], response.data['rejected']),
+            (2, 0, 1, 0)
+        )
+        self.assertEqual(response.data['ignored_columns'], ['Комментарий'])
+        self.assertEqual(Computer.objects.get(serial_number=2001).department, self.department)
+        self.assertEqual(Computer.objects.get(serial_number=1001).os, 'Windows 10')
+        self.assertTrue(SearchEntry.objects.filter(
+            entity_type='computer', object_id=Computer.objects.get(serial_number=2002).id
+        ).exists())
+
+    def test_import_rejects_invalid_and_duplicate_rows(self):
+        content = (
+            'serial_number,model,os,inventory_number,department\n'
+            '2001,Lenovo ThinkPad,Windows 11,6001,\n'
+            '2001,Lenovo ThinkPad,Windows 11,6002,\n'
+            'abc,HP ProBook,Linux,6003,\n'
+            '2004,,Linux,6004,\n'
+            '2005,HP ProBook,Linux,6005,999999\n'
+            '99999999999,HP ProBook,Linux,6006,\n'
+        )
+        response = self.client.post('/api/import/computers/', {'file': csv_file(content)}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['created'], response.data['rejected']), (1, 5))
+        rejected = {row['line']: row['errors'] for row in response.data['rejected_rows']}
+        self.assertEqual(rejected[3], {'serial_number': ['Повторяет строку 2']})
+        self.assertIn('serial_number', rejected[4])
+        self.assertIn('model', rejected[5])
+        self.assertIn('department', rejected[6])
+        self.assertIn('serial_number', rejected[7])
+
+    def test_import_update_on_conflict(self):
+        content = 'serial_number,model,os,inventory_number\n1001,Dell OptiPlex,Windows 11,5001\n'
+        response = self.client.post(
+            '/api/import/computers/', {'file': csv_file(content), 'on_conflict': 'update'}, format='multipart'
+        )
+        self.assertEqual((response.data['created'], response.data['updated']), (0, 1))
+        self.computer.refresh_from_db()
+        self.assertEqual(self.computer.os, 'Windows 11')
+
+    def test_import_software_xlsx(self):
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(['Название', 'Версия', 'Лицензия', 'Производитель', 'Количество мест'])
+        sheet.append(['Office', '2021', 'Commercial', 'Microsoft', 50])
+        sheet.append(['Firefox', 120, 'Free', 'Mozilla', None])
+        output = io.BytesIO()
+        workbook.save(output)
+
+        upload = SimpleUploadedFile('software.xlsx', output.getvalue())
+        response = self.client.post('/api/import/software/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 2)
+
+        office = Software.objects.get(name='Office')
+        self.assertEqual((office.seat_count, office.installed_count), (50, 0))
+        self.assertEqual(office.license_class, LicenseClass.COMMERCIAL)
+        self.assertEqual(Software.objects.get(name='Firefox').version, '120')
+
+    def test_import_missing_required_column(self):
+        content = 'full_name,phone\nИванов Иван,+7 900 000-00-00\n'
+        response = self.client.post('/api/import/users/', {'file': csv_file(content)}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', response.data['error'])
+
+    def test_import_unsupported_format(self):
+        response = self.client.post(
+            '/api/import/users/', {'file': csv_file('x', name='users.txt')}, format='multipart'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_import_command(self):
+        content = (
+            'ФИО,Телефон,Email,Должность\n'
+            'Иванов Иван,+7 900 000-00-01,ivanov@example.com,1\n'
+            'Петров Петр,+7 900 000-00-02,ivanov@example.com,2\n'
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'users.csv')
+            rejects = os.path.join(directory, 'rejects.csv')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+
+            output = io.StringIO()
+            call_command('import_inventory', 'users', path, '--rejects', rejects, '--batch-size', '1', stdout=output)
+
+            with open(rejects, encoding='utf-8') as f:
+                self.assertIn('Повторяет строку 2', f.read())
+
+        self.assertEqual(User.objects.get(email='ivanov@example.com').full_name, 'Иванов Иван')
+        self.assertIn('Обработано: 2', output.getvalue())
@@ -0,0 +1,167 @@
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from network_api.models import (
+    Computer, Department, Equipment, HostComputer, Network, NetworkComputer, User
+)
+from network_api.views.hostcomputers_view import HostComputerFilter
+
+
+class MacLookupTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(
+            room_number=101,
+            internal_phone=1234,
+            employee_count=5,
+            employee_phones=[1001, 1002]
+        )
+        cls.equipment = Equipment.objects.create(
+            type="Cisco Catalyst",
+            bandwidth=1000,
+            port_count=48,
+            setup_date="2023-01-01"
+        )
+        cls.network = Network.objects.create(
+            subnet_mask="255.255.255.0",
+            vlan=140,
+            ip_range="192.168.14.0/24",
+            equipment=cls.equipment
+        )
+        cls.computer = Computer.objects.create(
+            serial_number=1001,
+            model="Dell OptiPlex",
+            os="Windows 10",
+            inventory_number=5001,
+            department=cls.department
+        )
+        cls.connection = NetworkComputer.objects.create(
+            network=cls.network,
+            computer=cls.computer,
+            ip_address="192.168.14.37",
+            mac_address="00-1A-2B-3C-4D-5E",
+            speed=1000
+        )
+        cls.host = HostComputer.objects.create(
+            hostname="dell-build-01",
+            ip_address="192.168.14.50",
+            mac_address="001a.2b3c.4d5f",
+            department=cls.department
+        )
+
+        cls.base_url = '/api/lookup/mac/'
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_mac_is_stored_normalized(self):
+        self.connection.refresh_from_db()
+        self.host.refresh_from_db()
+        self.assertEqual(self.connection.mac_address, "00:1a:2b:3c:4d:5e")
+        self.assertEqual(self.host.mac_address, "00:1a:2b:3c:4d:5f")
+
+    def test_lookup_network_computer(self):
+        response = self.client.get(f'{self.base_url}001A2B3C4D5E/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['mac_address'], "00:1a:2b:3c:4d:5e")
+        self.assertEqual(response.data['count'], 1)
+
+        result = response.data['results'][0]
+        self.assertEqual(result['source'], 'network_computer')
+        self.assertEqual(result['ip_address'], '192.168.14.37')
+        self.assertEqual(result['computer']['id'], self.computer.id)
+        self.assertEqual(result['network']['vlan'], 140)
+        self.assertEqual(result['department']['room_number'], 101)
+        self.assertIsNone(result['host'])
+
+    def test_lookup_host_resolves_network(self):
+        response = self.client.get(f'{self.base_url}00:1a:2b:3c:4d:5f/')
+        result = response.data['results'][0]
+        self.assertEqual(result['source'], 'host_computer')
+        self.assertEqual(result['host']['hostname'], 'dell-build-01')
+        self.assertEqual(result['network']['id'], self.network.id)
+        self.assertIsNone(result['computer'])
+
+    def test_lookup_unknown_mac(self):
+        response = self.client.get(f'{self.base_url}00:00:00:00:00:01/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 0)
+
+    def test_lookup_invalid_mac(self):
+        response = self.client.get(f'{self.base_url}not-a-mac/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_host_filter_by_mac_in_any_format(self):
+        queryset = HostComputer.objects.all()
+        exact = HostComputerFilter({'mac_address': '00-1A-2B-3C-4D-5F'}, queryset=queryset).qs
+        partial = HostComputerFilter({'mac_address': '4d-5f'}, queryset=queryset).qs
+        self.assertEqual(list(exact), [self.host])
+        self.assertEqual(list(partial), [self.host])
+
+
+class PhoneLookupTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sales = Department.objects.create(
+            room_number=101,
+            internal_phone=1234,
+            employee_count=5,
+            employee_phones=[1001, 1002]
+        )
+        cls.support = Department.objects.create(
+            room_number=202,
+            internal_phone=2345,
+            employee_count=3,
+            employee_phones=[2001]
+        )
+        cls.user = User.objects.create(
+            full_name="Иван Петров",
+            phone="+7 (495) 123-45-67",
+            email="ivan@company.com",
+            position_id=3,
+            department=cls.support
+        )
+
+        cls.base_url = '/api/lookup/phone/'
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def lookup(self, phone):
+        response = self.client.get(f'{self.base_url}{phone}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_lookup_employee_phone(self):
+        data = self.lookup('1002')
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['results'][0]['source'], 'employee_phone')
+        self.assertEqual(data['results'][0]['department']['id'], self.sales.id)
+
+    def test_lookup_ignores_non_ascii_digits(self):
+        response = self.client.get(f'{self.base_url}²/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.lookup('10²02')['count'], 1)
+
+    def test_lookup_internal_phone(self):
+        data = self.lookup('2345')
+        self.assertEqual(data['results'][0]['source'], 'internal_phone')
+        self.assertEqual(data['results'][0]['department']['id'], self.support.id)
+
+    def test_lookup_user_phone_ignores_formatting(self):
+        data = self.lookup('7-495-1234567')
+        self.assertEqual(data['count'], 1)
+        result = data['results'][0]
+        self.assertEqual(result['source'], 'user')
+        self.assertEqual(result['user']['id'], self.user.id)
+        self.assertEqual(result['department']['id'], self.support.id)
+
+    def test_lookup_without_digits(self):
+        response = self.client.get(f'{self.base_url}abc/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_department_search_matches_employee_phone(self):
+        response = self.client.get('/api/departments/', {'search': '2001'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.data['results']], [self.support.id])
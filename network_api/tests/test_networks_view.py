@@ -0,0 +1,165 @@
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from network_api.models import Computer, Equipment, Network, NetworkComputer
+
+
+class NetworkViewSetTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.account = get_user_model().objects.create_user(username='admin', password='secret')
+
+        cls.equipment = Equipment.objects.create(
+            type="Cisco Catalyst",
+            bandwidth=1000,
+            port_count=48,
+            setup_date="2023-01-01"
+        )
+
+        cls.campus = Network.objects.create(
+            subnet_mask="255.255.0.0",
+            vlan=1,
+            ip_range="192.168.0.0/16",
+            equipment=cls.equipment
+        )
+        cls.office = Network.objects.create(
+            subnet_mask="255.255.255.0",
+            vlan=140,
+            ip_range="192.168.14.0/24",
+            equipment=cls.equipment
+        )
+        cls.lab = Network.objects.create(
+            subnet_mask="255.255.255.0",
+            vlan=200,
+            ip_range="10.20.0.0/24",
+            equipment=cls.equipment
+        )
+
+        cls.computer = Computer.objects.create(
+            serial_number=1001,
+            model="Dell OptiPlex",
+            os="Windows 10",
+            inventory_number=5001
+        )
+        NetworkComputer.objects.create(
+            network=cls.office,
+            computer=cls.computer,
+            ip_address="192.168.14.37",
+            mac_address="00:11:22:33:44:55",
+            speed=1000
+        )
+
+        cls.base_url = '/api/networks/'
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.account)
+
+    def network_ids(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [network['id'] for network in response.data['networks']]
+
+    def test_ip_range_is_normalized(self):
+        network = Network.objects.create(
+            subnet_mask="255.255.255.0",
+            vlan=300,
+            ip_range="172.16.5.9/24",
+            equipment=self.equipment
+        )
+        network.refresh_from_db()
+        self.assertEqual(network.ip_range, "172.16.5.0/24")
+
+    def test_containing_returns_most_specific_first(self):
+        response = self.client.get(f'{self.base_url}containing/', {'ip': '192.168.14.37'})
+        self.assertEqual(self.network_ids(response), [self.office.id, self.campus.id])
+
+    def test_search_ranks_without_cidr_similarity(self):
+        response = self.client.get(self.base_url, {'search': 'cisco 192.168.14'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([network['id'] for network in response.data['results']], [self.office.id])
+
+    def test_containing_invalid_ip(self):
+        response = self.client.get(f'{self.base_url}containing/', {'ip': 'not-an-ip'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_overlapping(self):
+        response = self.client.get(f'{self.base_url}overlapping/', {'cidr': '10.0.0.0/8'})
+        self.assertEqual(self.network_ids(response), [self.lab.id])
+
+    def test_supernets(self):
+        response = self.client.get(f'{self.base_url}supernets/', {'cidr': '192.168.14.0/24'})
+        self.assertEqual(self.network_ids(response), [self.campus.id])
+
+    def test_filter_ip_range_by_address(self):
+        response = self.client.get(self.base_url, {'ip_range': '10.20.0.5'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([network['id'] for network in response.data['results']], [self.lab.id])
+
+    def test_ip_address_containment_lookup(self):
+        connections = NetworkComputer.objects.filter(ip_address__net_contained_by=self.office.ip_range)
+        self.assertEqual(connections.count(), 1)
+
+    def test_next_free_skips_network_address_and_used(self):
+        NetworkComputer.objects.create(
+            network=self.lab,
+            computer=self.computer,
+            ip_address="10.20.0.1",
+            mac_address="00:11:22:33:44:66",
+            speed=100
+        )
+        response = self.client.get(f'{self.base_url}{self.lab.id}/next_free/', {'count': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['addresses'], ['10.20.0.2', '10.20.0.3'])
+
+    def test_allocate_assigns_lowest_free_address(self):
+        response = self.client.post(f'{self.base_url}{self.lab.id}/allocate/', {
+            'computer': self.computer.id,
+            'mac_address': '00:11:22:33:44:77',
+            'speed': 1000
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['ip_address'], '10.20.0.1')
+
+        pool = self.client.get(f'{self.base_url}{self.lab.id}/pool/').data
+        self.assertEqual((pool['size'], pool['used'], pool['free']), (254, 1, 253))
+
+    def test_reserved_range_is_not_allocated(self):
+        response = self.client.post(f'{self.base_url}{self.lab.id}/reserve/', {
+            'start': '10.20.0.1', 'end': '10.20.0.10'
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['reserved'], 10)
+
+        response = self.client.get(f'{self.base_url}{self.lab.id}/next_free/')
+        self.assertEqual(response.data['addresses'], ['10.20.0.11'])
+
+        self.client.post(f'{self.base_url}{self.lab.id}/release/', {'start': '10.20.0.1', 'end': '10.20.0.10'})
+        response = self.client.get(f'{self.base_url}{self.lab.id}/next_free/')
+        self.assertEqual(response.data['addresses'], ['10.20.0.1'])
+
+    def test_reserve_conflicts_with_used_address(self):
+        response = self.client.post(f'{self.base_url}{self.office.id}/reserve/', {'start': '192.168.14.37'})
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_pool_follows_connection_changes(self):
+        self.client.get(f'{self.base_url}{self.office.id}/pool/')
+        connection = NetworkComputer.objects.get(network=self.office)
+        connection.ip_address = "192.168.14.1"
+        connection.save()
+
+        response = self.client.get(f'{self.base_url}{self.office.id}/next_free/', {'count': 2})
+        self.assertEqual(response.data['addresses'], ['192.168.14.2', '192.168.14.3'])
+
+        connection.delete()
+        response = self.client.get(f'{self.base_url}{self.office.id}/next_free/')
+        self.assertEqual(response.data['addresses'], ['192.168.14.1'])
+
+    def test_pool_rejects_oversized_network(self):
+        response = self.client.get(f'{self.base_url}{self.campus.id}/next_free/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        huge = Network.objects.create(
+            subnet_mask="255.0.0.0", vlan=1000, ip_range="10.0.0.0/8", equipment=self.equipment
+        )
+        response = self.client.get(f'{self.base_url}{huge.id}/next_free/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
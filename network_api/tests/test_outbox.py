@@ -0,0 +1,98 @@
+import json
+import os
+import tempfile
+
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from network_api.models import Computer, Department, HostComputer, OutboxEvent, Software, User
+from network_api.services.outbox import FileBroker, MemoryBroker, relay_pending
+
+
+class OutboxTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.computer = Computer.objects.create(serial_number=1001, model="Dell", os="Windows 10", inventory_number=5001)
+        cls.office = Software.objects.create(name='Office', version='2021', license='Commercial', vendor='Microsoft')
+        cls.user = User.objects.create(
+            full_name='Иванов Иван', phone='+7 900 000-00-00', email='ivanov@example.com', position_id=1
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        OutboxEvent.objects.all().delete()
+
+    def test_save_and_delete_are_recorded(self):
+        computer_id = self.computer.id
+        self.computer.os = 'Windows 11'
+        self.computer.save()
+        self.computer.delete()
+
+        events = list(OutboxEvent.objects.order_by('id').values_list('entity_type', 'object_id', 'operation'))
+        self.assertEqual(events, [
+            ('computer', computer_id, 'update'),
+            ('computer', computer_id, 'delete'),
+        ])
+        self.assertEqual(OutboxEvent.objects.first().payload['os'], 'Windows 11')
+
+    def test_department_delete_records_detached_rows(self):
+        department = Department.objects.create(room_number=101, internal_phone=123, employee_count=5)
+        Computer.objects.filter(pk=self.computer.pk).update(department=department)
+        User.objects.filter(pk=self.user.pk).update(department=department)
+        host = HostComputer.objects.create(
+            hostname='host-01', ip_address='10.0.0.5', mac_address='00:11:22:33:44:55', department=department
+        )
+        OutboxEvent.objects.all().delete()
+
+        department.delete()
+
+        updates = OutboxEvent.objects.filter(operation='update')
+        self.assertEqual(
+            sorted(updates.values_list('entity_type', 'object_id')),
+            sorted([('computer', self.computer.id), ('hostcomputer', host.id), ('user', self.user.id)])
+        )
+        self.assertTrue(all(event.payload['department_id'] is None for event in updates))
+
+    def test_bulk_links_are_recorded(self):
+        response = self.client.post('/api/software-computers/assign/', {
+            'software': [self.office.id], 'computer': [self.computer.id],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        created = OutboxEvent.objects.get(entity_type='softwarecomputer', operation='create')
+        self.assertEqual(created.payload['Computer_id'], self.computer.id)
+
+        self.office.computers.remove(self.computer)
+        self.computer.users.add(self.user)
+        self.computer.users.clear()
+        self.assertEqual(
+            list(OutboxEvent.objects.filter(entity_type='softwarecomputer', operation='delete')
+                 .values_list('object_id', flat=True)),
+            [created.object_id]
+        )
+        self.assertEqual(OutboxEvent.objects.filter(entity_type='usercomputer', operation='create').count(), 1)
+        self.assertEqual(OutboxEvent.objects.filter(entity_type='usercomputer', operation='delete').count(), 1)
+
+    def test_relay_publishes_pending_events(self):
+        self.computer.save()
+        self.office.save()
+
+        broker = MemoryBroker()
+        self.assertEqual(relay_pending(broker, 'changes', batch_size=1), 2)
+        self.assertEqual(
+            [(topic, key) for topic, key, _ in broker.messages],
+            [('changes', f'computer:{self.computer.id}'), ('changes', f'software:{self.office.id}')]
+        )
+        self.assertFalse(OutboxEvent.objects.filter(published_at__isnull=True).exists())
+        self.assertEqual(relay_pending(broker, 'changes'), 0)
+
+    def test_file_broker(self):
+        self.computer.save()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'outbox.ndjson')
+            relay_pending(FileBroker(path), 'changes')
+            with open(path, encoding='utf-8') as f:
+                lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]['value']['object_id'], self.computer.id)
+        self.assertEqual(lines[0]['value']['payload']['serial_number'], 1001)
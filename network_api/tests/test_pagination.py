@@ -0,0 +1,56 @@
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from network_api.models import Computer
+from network_api.pagination import EstimatedCountPaginator, estimate_count
+
+
+@override_settings(ESTIMATED_COUNT_THRESHOLD=0)
+class EstimatedCountTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Computer.objects.bulk_create([
+            Computer(serial_number=1000 + i, model="Dell OptiPlex", os="Windows 10", inventory_number=5000 + i)
+            for i in range(30)
+        ])
+        cls.base_url = '/api/computers/'
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_exact_count_by_default(self):
+        response = self.client.get(self.base_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 30)
+        self.assertFalse(response.data['count_is_estimate'])
+
+    def test_estimate_is_flagged(self):
+        response = self.client.get(self.base_url, {'count': 'estimate'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['count_is_estimate'])
+        self.assertGreater(response.data['count'], 25)
+        self.assertEqual(len(response.data['results']), 25)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_last_page_reports_exact_count(self):
+        response = self.client.get(self.base_url, {'count': 'estimate', 'page': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data['count_is_estimate'])
+        self.assertEqual(response.data['count'], 30)
+        self.assertIsNone(response.data['next'])
+
+    def test_estimate_skips_count_query(self):
+        queryset = Computer.objects.filter(os='Windows 10').order_by('id')
+        paginator = EstimatedCountPaginator(queryset, 10, estimate=True)
+        with self.assertNumQueries(2):
+            page = paginator.page(1)
+        self.assertTrue(page.has_next())
+        self.assertTrue(paginator.count_is_estimate)
+
+    def test_small_estimate_falls_back_to_exact_count(self):
+        queryset = Computer.objects.order_by('id')
+        paginator = EstimatedCountPaginator(queryset, 10, estimate=True, threshold=10 ** 9)
+        self.assertEqual(paginator.count, 30)
+        self.assertFalse(paginator.count_is_estimate)
+        self.assertGreaterEqual(estimate_count(queryset), 0)
@@ -0,0 +1,100 @@
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from network_api.models import (
+    Computer, User, Software, HostComputer, Network, Equipment, Server, SearchEntry
+)
+
+
+class SearchViewSetTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.computer = Computer.objects.create(
+            serial_number=784512,
+            model="Dell OptiPlex",
+            os="Windows 10",
+            inventory_number=5001
+        )
+        cls.user = User.objects.create(
+            full_name="Иван Петров",
+            phone="123456",
+            email="ivan@company.com",
+            position_id=3
+        )
+        cls.software = Software.objects.create(
+            name="PyCharm",
+            version="2023.1",
+            license="Commercial",
+            vendor="JetBrains"
+        )
+        cls.host = HostComputer.objects.create(
+            hostname="dell-build-01",
+            ip_address="10.0.5.17",
+            mac_address="00:11:22:33:44:55"
+        )
+        cls.equipment = Equipment.objects.create(
+            type="Cisco Catalyst",
+            bandwidth=1000,
+            port_count=24,
+            setup_date="2023-01-01"
+        )
+        cls.network = Network.objects.create(
+            subnet_mask="255.255.255.0",
+            vlan=140,
+            ip_range="192.168.14.0/24",
+            equipment=cls.equipment
+        )
+        cls.server = Server.objects.create(
+            port=8080,
+            hostname="srv-files",
+            connection_date="2023-01-01",
+            location="ЦОД-1"
+        )
+
+        cls.base_url = '/api/search/'
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def hits(self, **params):
+        response = self.client.get(self.base_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(hit['type'], hit['id']) for hit in response.data['results']]
+
+    def test_entries_created_for_all_entities(self):
+        self.assertEqual(SearchEntry.objects.count(), 7)
+
+    def test_search_requires_query(self):
+        response = self.client.get(self.base_url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_by_serial_number(self):
+        self.assertEqual(self.hits(q='784512'), [('computer', self.computer.id)])
+
+    def test_search_by_partial_ip(self):
+        self.assertEqual(self.hits(q='10.0.5'), [('host_computer', self.host.id)])
+
+    def test_search_by_person(self):
+        self.assertEqual(self.hits(q='петров'), [('user', self.user.id)])
+
+    def test_search_ranks_and_mixes_types(self):
+        hits = self.hits(q='dell')
+        self.assertEqual(set(hits), {('computer', self.computer.id), ('host_computer', self.host.id)})
+
+    def test_search_filter_by_type(self):
+        self.assertEqual(self.hits(q='dell', type='host_computer'), [('host_computer', self.host.id)])
+
+    def test_search_clamps_limit(self):
+        self.assertEqual(len(self.hits(q='dell', limit=-5)), 1)
+
+    def test_entry_updated_on_save(self):
+        self.server.hostname = 'srv-backup'
+        self.server.save()
+        self.assertEqual(self.hits(q='srv-backup'), [('server', self.server.id)])
+        self.assertEqual(self.hits(q='srv-files'), [])
+
+    def test_entry_removed_on_delete(self):
+        network_id = self.network.id
+        self.equipment.delete()
+        self.assertFalse(SearchEntry.objects.filter(entity_type='network', object_id=network_id).exists())
+        self.assertEqual(self.hits(q='Cisco'), [])
@@ -0,0 +1,208 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from network_api.models import Computer, IdempotencyKey, Software, SoftwareComputer
+
+
+class SoftwareViewSetTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.computer1 = Computer.objects.create(
+            serial_number=1001,
+            model="Dell OptiPlex",
+            os="Windows 10",
+            inventory_number=5001
+        )
+        cls.computer2 = Computer.objects.create(
+            serial_number=1002,
+            model="HP EliteBook",
+            os="Linux Ubuntu",
+            inventory_number=5002
+        )
+        cls.computer3 = Computer.objects.create(
+            serial_number=1003,
+            model="Apple MacBook",
+            os="macOS",
+            inventory_number=5003
+        )
+
+        cls.office = Software.objects.create(
+            name="Office",
+            version="2021",
+            license="Commercial",
+            vendor="Microsoft",
+            seat_count=1
+        )
+        cls.ubuntu = Software.objects.create(
+            name="Ubuntu",
+            version="22.04",
+            license="Open Source",
+            vendor="Canonical"
+        )
+        cls.ide = Software.objects.create(
+            name="PyCharm",
+            version="2023.1",
+            license="Trial 30 days",
+            vendor="JetBrains"
+        )
+
+        cls.office.computers.add(cls.computer1, cls.computer2)
+        SoftwareComputer.objects.create(software=cls.ubuntu, computer=cls.computer2)
+        cls.computer3.software.add(cls.ide)
+
+        cls.base_url = '/api/software/'
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_license_class_is_normalized(self):
+        self.assertEqual(self.office.license_class, 'commercial')
+        self.assertEqual(self.ubuntu.license_class, 'free')
+        self.assertEqual(self.ide.license_class, 'trial')
+
+    def test_installed_count_tracks_links(self):
+        self.office.refresh_from_db()
+        self.ubuntu.refresh_from_db()
+        self.ide.refresh_from_db()
+        self.assertEqual(self.office.installed_count, 2)
+        self.assertEqual(self.ubuntu.installed_count, 1)
+        self.assertEqual(self.ide.installed_count, 1)
+
+    def test_installed_count_after_removal(self):
+        self.office.computers.remove(self.computer1)
+        SoftwareComputer.objects.filter(software=self.ubuntu).delete()
+        self.computer3.delete()
+
+        self.office.refresh_from_db()
+        self.ubuntu.refresh_from_db()
+        self.ide.refresh_from_db()
+        self.assertEqual(self.office.installed_count, 1)
+        self.assertEqual(self.ubuntu.installed_count, 0)
+        self.assertEqual(self.ide.installed_count, 0)
+
+    def test_installed_count_after_clear(self):
+        self.computer2.software.clear()
+        self.office.refresh_from_db()
+        self.ubuntu.refresh_from_db()
+        self.assertEqual(self.office.installed_count, 1)
+        self.assertEqual(self.ubuntu.installed_count, 0)
+
+    def test_installed_count_after_link_update(self):
+        link = SoftwareComputer.objects.get(software=self.ubuntu)
+        response = self.client.patch(
+            f'/api/software-computers/{link.id}/', {'software': self.ide.id}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.ubuntu.refresh_from_db()
+        self.ide.refresh_from_db()
+        self.assertEqual(self.ubuntu.installed_count, 0)
+        self.assertEqual(self.ide.installed_count, 2)
+
+    def test_license_change_reclassifies(self):
+        url = f'{self.base_url}{self.ide.id}/'
+        response = self.client.patch(url, {'license': 'Expired'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['license_class'], 'expired')
+        self.assertTrue(response.data['needs_license_renewal'])
+
+    def test_filter_by_license_type(self):
+        response = self.client.get(self.base_url, {'license_type': 'free'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        names = [item['name'] for item in response.data['results']]
+        self.assertEqual(names, ['Ubuntu'])
+
+    def test_license_summary(self):
+        response = self.client.get(f'{self.base_url}license_summary/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_software'], 3)
+        self.assertEqual(response.data['total_installations'], 4)
+
+    def test_compliance(self):
+        response = self.client.get(f'{self.base_url}compliance/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        by_class = {row['license_class']: row for row in response.data['by_license_class']}
+        self.assertEqual(by_class['commercial']['total_installations'], 2)
+        self.assertEqual(by_class['commercial']['over_licensed'], 1)
+        self.assertEqual(by_class['free']['total_installations'], 1)
+
+        office = next(row for row in response.data['software'] if row['id'] == self.office.id)
+        self.assertEqual(office['free_seats'], -1)
+
+    def test_compliance_violations(self):
+        response = self.client.get(f'{self.base_url}compliance/', {'violations': 'true'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = {row['id'] for row in response.data['software']}
+        self.assertEqual(ids, {self.office.id, self.ide.id})
+
+    def test_search_ranks_by_similarity(self):
+        Software.objects.create(name="Kubuntu Desktop", version="1.0", license="Free", vendor="KDE")
+        response = self.client.get(self.base_url, {'search': 'ubuntu'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        names = [item['name'] for item in response.data['results']]
+        self.assertEqual(names, ['Ubuntu', 'Kubuntu Desktop'])
+
+    def test_create_duplicate_name_version(self):
+        data = {'name': 'Office', 'version': '2021', 'license': 'Commercial', 'vendor': 'Microsoft'}
+        response = self.client.post(self.base_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'ПО с таким названием и версией уже существует')
+        self.assertEqual(Software.objects.filter(name='Office').count(), 1)
+
+    def test_update_to_duplicate_name_version(self):
+        url = f'{self.base_url}{self.ubuntu.id}/'
+        response = self.client.patch(url, {'name': 'Office', 'version': '2021'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'ПО с таким названием и версией уже существует')
+
+    def test_facets_by_license_class(self):
+        response = self.client.get(f'{self.base_url}facets/', {'facet': 'license_class,vendor'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        counts = {bucket['value']: bucket['count'] for bucket in response.data['facets']['license_class']}
+        self.assertEqual(sum(counts.values()), response.data['total'])
+        self.assertEqual(counts['free'], Software.objects.filter(license_class='free').count())
+
+    def test_create_with_idempotency_key(self):
+        data = {'name': 'Blender', 'version': '4.2', 'license': 'GPL', 'vendor': 'Blender Foundation'}
+        first = self.client.post(self.base_url, data, format='json', HTTP_IDEMPOTENCY_KEY='blender-42')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+
+        repeat = self.client.post(self.base_url, data, format='json', HTTP_IDEMPOTENCY_KEY='blender-42')
+        self.assertEqual(repeat.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(repeat['Idempotent-Replayed'], 'true')
+        self.assertEqual(repeat.data['id'], first.data['id'])
+        self.assertEqual(Software.objects.filter(name='Blender').count(), 1)
+
+        data['version'] = '4.3'
+        response = self.client.post(self.base_url, data, format='json', HTTP_IDEMPOTENCY_KEY='blender-42')
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertFalse(Software.objects.filter(name='Blender', version='4.3').exists())
+
+    def test_idempotency_key_expires(self):
+        data = {'name': 'Office', 'version': '2021', 'license': 'Commercial', 'vendor': 'Microsoft'}
+        response = self.client.post(self.base_url, data, format='json', HTTP_IDEMPOTENCY_KEY='office')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(IdempotencyKey.objects.get(key='office').status_code, 400)
+
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=2))
+        Software.objects.filter(name='Office').delete()
+        response = self.client.post(self.base_url, data, format='json', HTTP_IDEMPOTENCY_KEY='office')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(response.has_header('Idempotent-Replayed'))
+
+    def test_stale_in_progress_claim_is_reclaimed(self):
+        data = {'name': 'Blender', 'version': '4.2', 'license': 'GPL', 'vendor': 'Blender Foundation'}
+        self.client.post(self.base_url, data, format='json', HTTP_IDEMPOTENCY_KEY='blender')
+        IdempotencyKey.objects.filter(key='blender').update(status_code=None, response=None)
+        Software.objects.filter(name='Blender').delete()
+
+        response = self.client.post(self.base_url, data, format='json', HTTP_IDEMPOTENCY_KEY='blender')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(minutes=5))
+        response = self.client.post(self.base_url, data, format='json', HTTP_IDEMPOTENCY_KEY='blender')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(IdempotencyKey.objects.get(key='blender').status_code, 201)
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import views, views_ui, computers_view, users_view, departments_view, softwares_view, networks_view, hostcomputers_view, equipments_view
+from .views import views, views_ui, computers_view, users_view, departments_view, softwares_view, networks_view, hostcomputers_view, equipments_view, search_view, lookup_view, autocomplete_view, import_view, batch_view
 from network_api.views.views import DatabaseViewSet
 
 router = DefaultRouter()
@@ -13,11 +13,17 @@ router.register(r'networks', networks_view.NetworkReadOnlyViewSet, basename='net
 router.register(r'host-computers', hostcomputers_view.HostComputerViewSet)
 router.register(r'servers', views.ServerViewSet)
 router.register(r'software-computers', views.SoftwareComputerViewSet)
+router.register(r'network-computers', views.NetworkComputerViewSet)
 router.register(r'user-computers', views.UserComputerViewSet)
 router.register(r'server-networks', views.ServerNetworkViewSet)
 router.register(r'analytics', views.AnalyticsViewSet, basename='analytics')
 router.register(r'database', DatabaseViewSet, basename='database')
 router.register(r'equipment', equipments_view.EquipmentViewSet, basename='equipment')
+router.register(r'search', search_view.SearchViewSet, basename='search')
+router.register(r'lookup', lookup_view.LookupViewSet, basename='lookup')
+router.register(r'autocomplete', autocomplete_view.AutocompleteViewSet, basename='autocomplete')
+router.register(r'import', import_view.ImportViewSet, basename='import')
+router.register(r'batch', batch_view.BatchViewSet, basename='batch')
 
 urlpatterns = [
     path('', views_ui.DashboardView.as_view(), name='dashboard'),
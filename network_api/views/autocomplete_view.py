@@ -0,0 +1,34 @@
+from rest_framework import viewsets, status
+from rest_framework.response import Response
+
+from network_api.services import autocomplete
+
+
+class AutocompleteViewSet(viewsets.ViewSet):
+    default_limit = 10
+    max_limit = 50
+
+    def list(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {'error': 'Параметр q обязателен'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', self.default_limit)), self.max_limit))
+        except ValueError:
+            limit = self.default_limit
+
+        index_types = [
+            value for value in request.query_params.get('type', '').split(',')
+            if value in autocomplete.INDEXES
+        ]
+
+        results = autocomplete.suggest(query, index_types, limit)
+        return Response({
+            'query': query,
+            'count': len(results),
+            'results': results,
+        })
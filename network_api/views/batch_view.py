@@ -0,0 +1,23 @@
+from rest_framework import viewsets, status
+from rest_framework.response import Response
+
+from network_api.services.batch import BatchError, run_batch
+
+
+class BatchViewSet(viewsets.ViewSet):
+    batch_allowed = False
+
+    def create(self, request):
+        operations = request.data.get('operations') if isinstance(request.data, dict) else request.data
+        try:
+            results, failed = run_batch(request._request, operations)
+        except BatchError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if failed is not None:
+            return Response({
+                'error': f'Операция {failed.index} завершилась ошибкой, изменения отменены',
+                'failed': failed.index,
+                'results': results,
+            }, status=failed.status_code)
+        return Response({'results': results})
@@ -1,37 +1,52 @@
 from django.db.models import Avg
-from network_api.mixins import ExportMixin
-from network_api.models import Computer
+from network_api.filters import TrigramSearchFilter
+from network_api.mixins import ConditionalRequestMixin, ExportMixin, FacetsMixin, UniqueConstraintMixin
+from network_api.models import (
+    Computer, Department, NetworkComputer, Software, SoftwareComputer, User, UserComputer
+)
+from network_api.parsers import NDJSONParser
 from network_api.serializers import ComputerSerializer
+from network_api.services.bulk_computers import (
+    BULK_MAX_ROWS, ON_CONFLICT_ERROR, ON_CONFLICT_UPDATE, bulk_upsert_computers
+)
 
+from django.db import IntegrityError
 from django.db.models import Count, Q
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets, filters, status
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
 
-class ComputerViewSet(ExportMixin, viewsets.ModelViewSet):
+class ComputerViewSet(ConditionalRequestMixin, UniqueConstraintMixin, FacetsMixin, ExportMixin, viewsets.ModelViewSet):
     queryset = Computer.objects.all()
     serializer_class = ComputerSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, TrigramSearchFilter]
     filterset_fields = ['department', 'os']
     search_fields = ['model', 'serial_number', 'inventory_number']
+    unique_constraint_errors = {
+        'computer_serial_number_uniq': 'Компьютер с таким серийным номером уже существует',
+    }
+    facet_fields = {
+        'os': ['os'],
+        'model': ['model'],
+        'department': ['department', 'department__room_number'],
+    }
+    facet_cache_models = (Department,)
+    etag_models = (Department, User, UserComputer, Software, SoftwareComputer, NetworkComputer)
+    etag_actions = ('list', 'retrieve', 'details')
 
     def get_queryset(self):
         queryset = Computer.objects.select_related('department').prefetch_related(
             'users', 'software', 'networkcomputer_set'
-        )
+        ).order_by('id')
 
-        search = self.request.query_params.get('search')
         department_id = self.request.query_params.get('department')
         os_filter = self.request.query_params.get('os_filter')
 
         filters = Q()
         has_filters = False
 
-        if search:
-            filters |= Q(model__icontains=search) | Q(serial_number__icontains=search)
-            has_filters = True
-
         if department_id:
             filters &= Q(department_id=department_id)
             has_filters = True
@@ -45,28 +60,37 @@ class ComputerViewSet(ExportMixin, viewsets.ModelViewSet):
 
         return queryset
 
-    def create(self, request, *args, **kwargs):
-        serial_number = request.data.get('serial_number')
-        if serial_number and Computer.objects.filter(serial_number=serial_number).exists():
+    @action(detail=False, methods=['post'], parser_classes=[JSONParser, NDJSONParser])
+    def bulk(self, request):
+        rows = request.data
+        if not isinstance(rows, list):
             return Response(
-                {'error': 'Компьютер с таким серийным номером уже существует'},
+                {'error': 'Ожидается JSON-массив или NDJSON'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(rows) > BULK_MAX_ROWS:
+            return Response(
+                {'error': f'Не более {BULK_MAX_ROWS} компьютеров за один запрос'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        return super().create(request, *args, **kwargs)
-
-    def update(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serial_number = request.data.get('serial_number')
+        on_conflict = request.query_params.get('on_conflict', ON_CONFLICT_ERROR)
+        if on_conflict not in (ON_CONFLICT_ERROR, ON_CONFLICT_UPDATE):
+            return Response(
+                {'error': 'on_conflict должен быть error или update'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        if serial_number and serial_number != instance.serial_number:
-            if Computer.objects.filter(serial_number=serial_number).exists():
-                return Response(
-                    {'error': 'Компьютер с таким серийным номером уже существует'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
+        try:
+            result = bulk_upsert_computers(rows, on_conflict=on_conflict)
+        except IntegrityError:
+            return Response(
+                {'error': 'Данные изменились во время импорта, повторите запрос'},
+                status=status.HTTP_409_CONFLICT
+            )
 
-        return super().update(request, *args, **kwargs)
+        response_status = status.HTTP_201_CREATED if result['created'] else status.HTTP_200_OK
+        return Response(result, status=response_status)
 
     @action(detail=False, methods=['get'])
     def report(self, request):
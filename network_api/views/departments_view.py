@@ -1,21 +1,26 @@
 from rest_framework import serializers
-from network_api.mixins import ExportMixin
-from network_api.models import Department, HostComputer
+from network_api.mixins import ConditionalRequestMixin, ExportMixin, IdempotencyMixin
+from network_api.models import Computer, Department, HostComputer, User
 from network_api.serializers import DepartmentSerializer
+from network_api.filters import contains_any
+from network_api.services.department_moves import move_to_department
+from network_api.services.selections import SelectionError
 
-from django.db.models import Count, Q, OuterRef, Subquery
+from django.db.models import Count, OuterRef, Subquery
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets, filters, status
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 
 
-class DepartmentViewSet(ExportMixin, viewsets.ModelViewSet):
+class DepartmentViewSet(IdempotencyMixin, ConditionalRequestMixin, ExportMixin, viewsets.ModelViewSet):
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend]
     filterset_fields = ['employee_count']
-    search_fields = ['room_number', 'internal_phone']
+    etag_models = (Computer, User, HostComputer)
+    etag_actions = ('list', 'retrieve', 'statistics', 'host_computers', 'users')
 
     def get_queryset(self):
         queryset = Department.objects.all()
@@ -32,8 +37,7 @@ class DepartmentViewSet(ExportMixin, viewsets.ModelViewSet):
 
             if search:
                 queryset = queryset.filter(
-                    Q(room_number__icontains=search) |
-                    Q(internal_phone__icontains=search)
+                    contains_any(Department, search, ['room_number', 'internal_phone', 'employee_phones'])
                 )
 
             host_computer_ip_subquery = HostComputer.objects.filter(
@@ -111,6 +115,14 @@ class DepartmentViewSet(ExportMixin, viewsets.ModelViewSet):
             print(f"Validation error: {e.detail}")
             return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=True, methods=['post'])
+    def move(self, request, pk=None):
+        department = get_object_or_404(Department, pk=pk)
+        try:
+            return Response(move_to_department(department, request.data))
+        except SelectionError as e:
+            return Response({'error': e.args[0]}, status=status.HTTP_400_BAD_REQUEST)
+
     @action(detail=True, methods=['get'])
     def statistics(self, request, pk=None):
         try:
@@ -3,7 +3,8 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 import django_filters
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Count, Avg, Max, Min
+from django.db.models import Count, Avg, Max, Min
+from network_api.filters import trigram_search
 from network_api.models import Equipment
 from network_api.serializers import (
     EquipmentSerializer, NetworkSerializer
@@ -25,12 +26,7 @@ class EquipmentFilter(django_filters.FilterSet):
         fields = ['type', 'port_count', 'bandwidth', 'setup_date']
 
     def filter_search(self, queryset, name, value):
-        if value:
-            return queryset.filter(
-                Q(type__icontains=value) |
-                Q(bandwidth__icontains=value)
-            )
-        return queryset
+        return trigram_search(queryset, value, ['type', 'bandwidth'])
 
 
 class EquipmentViewSet(ExportMixin, viewsets.ReadOnlyModelViewSet):
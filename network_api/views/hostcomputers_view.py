@@ -3,15 +3,15 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 import django_filters
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
-from network_api.models import HostComputer
+from network_api.filters import contains_any, trigram_search
+from network_api.models import Department, HostComputer
 from network_api.serializers import HostComputerSerializer
-from network_api.mixins import ExportMixin
+from network_api.mixins import ConditionalRequestMixin, ExportMixin
 
 class HostComputerFilter(django_filters.FilterSet):
     hostname = django_filters.CharFilter(field_name='hostname', lookup_expr='icontains')
     ip_address = django_filters.CharFilter(field_name='ip_address', lookup_expr='icontains')
-    mac_address = django_filters.CharFilter(field_name='mac_address', lookup_expr='icontains')
+    mac_address = django_filters.CharFilter(method='filter_mac_address')
     department = django_filters.NumberFilter(field_name='department__id')
     department_room = django_filters.NumberFilter(field_name='department__room_number')
     has_department = django_filters.BooleanFilter(field_name='department', lookup_expr='isnull', exclude=True)
@@ -21,23 +21,23 @@ class HostComputerFilter(django_filters.FilterSet):
         model = HostComputer
         fields = ['hostname', 'ip_address', 'mac_address', 'department']
 
+    def filter_mac_address(self, queryset, name, value):
+        return queryset.filter(contains_any(queryset.model, value, [name]))
+
     def filter_search(self, queryset, name, value):
-        if value:
-            return queryset.filter(
-                Q(hostname__icontains=value) |
-                Q(ip_address__icontains=value) |
-                Q(mac_address__icontains=value) |
-                Q(department__room_number__icontains=value)
-            )
-        return queryset
+        return trigram_search(
+            queryset, value,
+            ['hostname', 'ip_address', 'mac_address', 'department__room_number']
+        )
 
 
-class HostComputerViewSet(ExportMixin, viewsets.ModelViewSet):
+class HostComputerViewSet(ConditionalRequestMixin, ExportMixin, viewsets.ModelViewSet):
     queryset = HostComputer.objects.select_related('department').order_by('hostname')
     serializer_class = HostComputerSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_class = HostComputerFilter
+    etag_models = (Department,)
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
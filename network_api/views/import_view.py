@@ -0,0 +1,53 @@
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.response import Response
+
+from network_api.services.inventory_import import (
+    IMPORT_TARGETS, ON_CONFLICT_SKIP, ON_CONFLICT_UPDATE, InventoryImportError, detect_format,
+    import_inventory, parse_column_map
+)
+
+
+class ImportViewSet(viewsets.ViewSet):
+    parser_classes = [MultiPartParser, FormParser]
+    batch_allowed = False
+
+    def list(self, request):
+        return Response({
+            target_name: {
+                'fields': target.fields,
+                'key': target.key,
+            }
+            for target_name, target in IMPORT_TARGETS.items()
+        })
+
+    @action(detail=False, methods=['post'], url_path=f'(?P<target>{"|".join(IMPORT_TARGETS)})')
+    def upload(self, request, target=None):
+        uploaded = request.FILES.get('file')
+        if uploaded is None:
+            return Response(
+                {'error': 'Приложите файл в поле file'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        on_conflict = request.data.get('on_conflict', ON_CONFLICT_SKIP)
+        if on_conflict not in (ON_CONFLICT_SKIP, ON_CONFLICT_UPDATE):
+            return Response(
+                {'error': 'on_conflict должен быть skip или update'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            file_format = detect_format(uploaded.name, request.data.get('format'))
+            report = import_inventory(
+                target,
+                uploaded.file,
+                file_format,
+                on_conflict=on_conflict,
+                column_map=parse_column_map(request.data.getlist('map')),
+            )
+        except InventoryImportError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(report)
@@ -0,0 +1,130 @@
+from django.db import connection
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from network_api.fields import parse_mac
+
+INT_MAX = 2 ** 31 - 1
+
+MAC_LOOKUP_SQL = '''
+    SELECT 'network_computer' AS source, nc.id, host(nc.ip_address), nc.speed,
+           c.id, c.model, c.serial_number, c.inventory_number,
+           n.id, n.vlan, n.ip_range::text,
+           NULL, NULL,
+           d.id, d.room_number, d.internal_phone
+    FROM "Network_Computer" nc
+    JOIN "Computer" c ON c.id = nc."Computer_id"
+    JOIN "Network" n ON n.id = nc."Network_id"
+    LEFT JOIN "Department" d ON d.id = c.department_id
+    WHERE nc.mac_address = %s::macaddr
+    UNION ALL
+    SELECT 'host_computer' AS source, h.id, host(h.ip_address), NULL,
+           NULL, NULL, NULL, NULL,
+           n.id, n.vlan, n.ip_range::text,
+           h.id, h.hostname,
+           d.id, d.room_number, d.internal_phone
+    FROM "Host_Computer" h
+    LEFT JOIN LATERAL (
+        SELECT id, vlan, ip_range FROM "Network"
+        WHERE ip_range >>= h.ip_address
+        ORDER BY masklen(ip_range) DESC
+        LIMIT 1
+    ) n ON TRUE
+    LEFT JOIN "Department" d ON d.id = h.department_id
+    WHERE h.mac_address = %s::macaddr
+    ORDER BY 1 DESC, 2
+'''
+
+PHONE_LOOKUP_SQL = r'''
+    SELECT 'employee_phone' AS source, d.id, d.room_number, d.internal_phone,
+           NULL::bigint, NULL::text, NULL::text, NULL::text
+    FROM "Department" d
+    WHERE d.employee_phones @> ARRAY[%(number)s]::integer[]
+    UNION ALL
+    SELECT 'internal_phone' AS source, d.id, d.room_number, d.internal_phone,
+           NULL, NULL, NULL, NULL
+    FROM "Department" d
+    WHERE d.internal_phone = %(number)s
+    UNION ALL
+    SELECT 'user' AS source, d.id, d.room_number, d.internal_phone,
+           u.id, u.full_name, u.phone, u.email
+    FROM "User" u
+    LEFT JOIN "Department" d ON d.id = u.department_id
+    WHERE regexp_replace(u.phone, '\D', '', 'g') = %(digits)s
+    ORDER BY 1, 2
+'''
+
+
+def _section(values, *keys):
+    if values[0] is None:
+        return None
+    return dict(zip(keys, values))
+
+
+class LookupViewSet(viewsets.ViewSet):
+
+    @action(detail=False, methods=['get'], url_path=r'mac/(?P<mac>[^/]+)')
+    def mac(self, request, mac=None):
+        normalized = parse_mac(mac)
+        if normalized is None:
+            return Response(
+                {'error': 'Укажите MAC-адрес, например 00:1a:2b:3c:4d:5e'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        with connection.cursor() as cursor:
+            cursor.execute(MAC_LOOKUP_SQL, [normalized, normalized])
+            rows = cursor.fetchall()
+
+        results = [
+            {
+                'source': row[0],
+                'id': row[1],
+                'ip_address': row[2],
+                'speed': row[3],
+                'computer': _section(row[4:8], 'id', 'model', 'serial_number', 'inventory_number'),
+                'network': _section(row[8:11], 'id', 'vlan', 'ip_range'),
+                'host': _section(row[11:13], 'id', 'hostname'),
+                'department': _section(row[13:16], 'id', 'room_number', 'internal_phone'),
+            }
+            for row in rows
+        ]
+
+        return Response({
+            'mac_address': normalized,
+            'count': len(results),
+            'results': results,
+        })
+
+    @action(detail=False, methods=['get'], url_path=r'phone/(?P<phone>[^/]+)')
+    def phone(self, request, phone=None):
+        digits = ''.join(ch for ch in phone if ch in '0123456789')
+        if not digits:
+            return Response(
+                {'error': 'Укажите номер телефона'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        number = int(digits)
+        if number > INT_MAX:
+            number = None
+
+        with connection.cursor() as cursor:
+            cursor.execute(PHONE_LOOKUP_SQL, {'number': number, 'digits': digits})
+            rows = cursor.fetchall()
+
+        results = [
+            {
+                'source': row[0],
+                'department': _section(row[1:4], 'id', 'room_number', 'internal_phone'),
+                'user': _section(row[4:8], 'id', 'full_name', 'phone', 'email'),
+            }
+            for row in rows
+        ]
+
+        return Response({
+            'phone': digits,
+            'count': len(results),
+            'results': results,
+        })
@@ -1,24 +1,25 @@
-from rest_framework import viewsets, permissions
+from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
+from network_api.pagination import StandardResultsSetPagination
 import django_filters
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Count, Avg, Max, Min
+from django.db.models import Count, Avg, Max, Min, F, Func, IntegerField
+from network_api.fields import parse_network
+from network_api.filters import trigram_search
+from django.db import IntegrityError
 from network_api.models import Network, NetworkComputer
-from network_api.serializers import NetworkSerializer, NetworkComputerSerializer
+from network_api.serializers import (
+    NetworkSerializer, NetworkComputerSerializer, IpAllocationSerializer, IpRangeSerializer
+)
+from network_api.services import ip_allocator
+from network_api.services.ip_allocator import AllocationError
 from network_api.mixins import ExportMixin
 
 
-class StandardResultsSetPagination(PageNumberPagination):
-    page_size = 25
-    page_size_query_param = 'page_size'
-    max_page_size = 100
-
-
 class NetworkFilter(django_filters.FilterSet):
     vlan = django_filters.NumberFilter(field_name='vlan')
-    ip_range = django_filters.CharFilter(field_name='ip_range', lookup_expr='icontains')
+    ip_range = django_filters.CharFilter(method='filter_ip_range')
     equipment_type = django_filters.CharFilter(field_name='equipment__type', lookup_expr='icontains')
     has_computers = django_filters.BooleanFilter(method='filter_has_computers')
     search = django_filters.CharFilter(method='filter_search')
@@ -32,15 +33,18 @@ class NetworkFilter(django_filters.FilterSet):
             return queryset.annotate(comp_count=Count('networkcomputer')).filter(comp_count__gt=0)
         return queryset.annotate(comp_count=Count('networkcomputer')).filter(comp_count=0)
 
+    def filter_ip_range(self, queryset, name, value):
+        if not value:
+            return queryset
+        if parse_network(value):
+            return queryset.filter(ip_range__net_contains_or_equals=value.strip())
+        return queryset.filter(ip_range__icontains=value)
+
     def filter_search(self, queryset, name, value):
-        if value:
-            return queryset.filter(
-                Q(vlan__icontains=value) |
-                Q(ip_range__icontains=value) |
-                Q(subnet_mask__icontains=value) |
-                Q(equipment__type__icontains=value)
-            )
-        return queryset
+        return trigram_search(
+            queryset, value,
+            ['vlan', 'ip_range', 'subnet_mask', 'equipment__type']
+        )
 
 
 class NetworkReadOnlyViewSet(ExportMixin, viewsets.ReadOnlyModelViewSet):
@@ -76,6 +80,38 @@ class NetworkReadOnlyViewSet(ExportMixin, viewsets.ReadOnlyModelViewSet):
 
         return Response(stats)
 
+    def network_lookup_response(self, request, param, lookup):
+        value = request.query_params.get(param, '').strip()
+        network = parse_network(value)
+        if network is None:
+            return Response(
+                {'error': f'Параметр {param} должен быть IP-адресом или сетью в формате CIDR'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        networks = self.get_queryset().filter(**{f'ip_range__{lookup}': str(network)}).annotate(
+            prefix_length=Func(F('ip_range'), function='masklen', output_field=IntegerField())
+        ).order_by('-prefix_length', 'vlan')
+
+        serializer = self.get_serializer(networks, many=True)
+        return Response({
+            param: value,
+            'count': len(serializer.data),
+            'networks': serializer.data,
+        })
+
+    @action(detail=False, methods=['get'])
+    def containing(self, request):
+        return self.network_lookup_response(request, 'ip', 'net_contains_or_equals')
+
+    @action(detail=False, methods=['get'])
+    def overlapping(self, request):
+        return self.network_lookup_response(request, 'cidr', 'net_overlaps')
+
+    @action(detail=False, methods=['get'])
+    def supernets(self, request):
+        return self.network_lookup_response(request, 'cidr', 'net_contains')
+
     @action(detail=True, methods=['get'])
     def computers(self, request, pk=None):
         network = self.get_object()
@@ -119,4 +155,75 @@ class NetworkReadOnlyViewSet(ExportMixin, viewsets.ReadOnlyModelViewSet):
             for nc in recent_computers
         ]
 
-        return Response(data)
\ No newline at end of file
+        return Response(data)
+
+    @action(detail=True, methods=['get'])
+    def pool(self, request, pk=None):
+        network = self.get_object()
+        try:
+            return Response(ip_allocator.pool_summary(network))
+        except AllocationError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=True, methods=['get'])
+    def next_free(self, request, pk=None):
+        network = self.get_object()
+        try:
+            count = min(max(int(request.query_params.get('count', 1)), 1), 256)
+        except ValueError:
+            count = 1
+
+        try:
+            addresses = ip_allocator.next_free(network, count)
+        except AllocationError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'network_id': network.id,
+            'ip_range': network.ip_range,
+            'addresses': addresses,
+        })
+
+    @action(detail=True, methods=['post'])
+    def allocate(self, request, pk=None):
+        network = self.get_object()
+        serializer = IpAllocationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            connection = ip_allocator.allocate_address(network, **serializer.validated_data)
+        except AllocationError as e:
+            return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+        except IntegrityError:
+            return Response(
+                {'error': 'Компьютер уже подключен к этой сети'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(NetworkComputerSerializer(connection).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post'])
+    def reserve(self, request, pk=None):
+        network = self.get_object()
+        serializer = IpRangeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            reserved = ip_allocator.reserve_range(network, **serializer.validated_data)
+        except AllocationError as e:
+            return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+
+        return Response({'reserved': reserved, **ip_allocator.pool_summary(network)})
+
+    @action(detail=True, methods=['post'])
+    def release(self, request, pk=None):
+        network = self.get_object()
+        serializer = IpRangeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            released = ip_allocator.release_range(network, **serializer.validated_data)
+        except AllocationError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({'released': released, **ip_allocator.pool_summary(network)})
@@ -0,0 +1,60 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db.models import F, Q
+from rest_framework import viewsets, status
+from rest_framework.response import Response
+
+from network_api.models import SearchEntry
+from network_api.services.search_index import SEARCH_DOCUMENTS
+
+
+class SearchViewSet(viewsets.ViewSet):
+    default_limit = 20
+    max_limit = 100
+
+    def list(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {'error': 'Параметр q обязателен'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', self.default_limit)), self.max_limit))
+        except ValueError:
+            limit = self.default_limit
+
+        search_query = SearchQuery(query, search_type='websearch', config='simple')
+        entries = SearchEntry.objects.filter(
+            Q(search_vector=search_query) | Q(document__icontains=query)
+        )
+
+        entity_types = [
+            value for value in request.query_params.get('type', '').split(',')
+            if value in SEARCH_DOCUMENTS
+        ]
+        if entity_types:
+            entries = entries.filter(entity_type__in=entity_types)
+
+        entries = entries.annotate(
+            rank=SearchRank(F('search_vector'), search_query) + TrigramWordSimilarity(query, 'document')
+        ).order_by('-rank', 'entity_type', 'object_id').values(
+            'entity_type', 'object_id', 'title', 'subtitle', 'rank'
+        )[:limit]
+
+        results = [
+            {
+                'type': entry['entity_type'],
+                'id': entry['object_id'],
+                'title': entry['title'],
+                'subtitle': entry['subtitle'],
+                'rank': round(entry['rank'], 4),
+            }
+            for entry in entries
+        ]
+
+        return Response({
+            'query': query,
+            'count': len(results),
+            'results': results,
+        })
@@ -1,40 +1,42 @@
-from network_api.mixins import ExportMixin
-from network_api.models import Software
+from network_api.filters import TrigramSearchFilter
+from network_api.mixins import ConditionalRequestMixin, IdempotencyMixin, ExportMixin, FacetsMixin, UniqueConstraintMixin
+from network_api.models import Computer, Software, SoftwareComputer
 from network_api.serializers import SoftwareSerializer
+from network_api.services.licensing import LicenseClass, RENEWAL_CLASSES
 
-from django.db.models import Count, Q
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets, filters, status
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-class SoftwareViewSet(ExportMixin, viewsets.ModelViewSet):
+class SoftwareViewSet(IdempotencyMixin, ConditionalRequestMixin, UniqueConstraintMixin, FacetsMixin, ExportMixin, viewsets.ModelViewSet):
     queryset = Software.objects.all()
     serializer_class = SoftwareSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    filterset_fields = ['vendor', 'license']
+    filter_backends = [DjangoFilterBackend, TrigramSearchFilter]
+    filterset_fields = ['vendor', 'license', 'license_class']
     search_fields = ['name', 'version', 'vendor', 'license']
+    unique_constraint_errors = {
+        'software_name_version_uniq': 'ПО с таким названием и версией уже существует',
+    }
+    facet_fields = {
+        'vendor': ['vendor'],
+        'license': ['license'],
+        'license_class': ['license_class'],
+    }
+    etag_models = (Computer, SoftwareComputer)
 
     def get_queryset(self):
         queryset = Software.objects.prefetch_related('computers')
 
-        search = self.request.query_params.get('search')
         license_type = self.request.query_params.get('license_type')
 
         filters = Q()
         has_filters = False
 
-        if search:
-            filters |= Q(name__icontains=search) | Q(vendor__icontains=search) | Q(license__icontains=search)
-            has_filters = True
-
-        if license_type:
-            if license_type == 'trial':
-                filters &= Q(license__icontains='trial')
-            elif license_type == 'commercial':
-                filters &= Q(license__icontains='commercial') | Q(license__icontains='paid')
-            elif license_type == 'free':
-                filters &= Q(license__icontains='free') | Q(license__icontains='open source')
+        if license_type in LicenseClass.values:
+            filters &= Q(license_class=license_type)
             has_filters = True
 
         if has_filters:
@@ -53,21 +55,15 @@ class SoftwareViewSet(ExportMixin, viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-        name = request.data.get('name')
-        version = request.data.get('version')
-        if name and version:
-            if Software.objects.filter(name=name, version=version).exists():
-                return Response(
-                    {'error': 'ПО с таким названием и версией уже существует'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
         serializer = self.get_serializer(data=request.data)
         try:
             serializer.is_valid(raise_exception=True)
-            self.perform_create(serializer)
+            with transaction.atomic():
+                self.perform_create(serializer)
             headers = self.get_success_headers(serializer.data)
             return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+        except IntegrityError as e:
+            return self.integrity_error_response(e)
         except Exception as e:
             print(f"Error creating software: {e}")
             return Response(
@@ -75,21 +71,6 @@ class SoftwareViewSet(ExportMixin, viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-    def update(self, request, *args, **kwargs):
-        instance = self.get_object()
-        name = request.data.get('name')
-        version = request.data.get('version')
-
-        if name and version:
-            if name != instance.name or version != instance.version:
-                if Software.objects.filter(name=name, version=version).exists():
-                    return Response(
-                        {'error': 'ПО с таким названием и версией уже существует'},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-
-        return super().update(request, *args, **kwargs)
-
     @action(detail=False, methods=['get'])
     def popularity_report(self, request):
         try:
@@ -132,13 +113,50 @@ class SoftwareViewSet(ExportMixin, viewsets.ModelViewSet):
         try:
             license_stats = Software.objects.values('license').annotate(
                 count=Count('id'),
-                total_installations=Count('computers')
+                total_installations=Sum('installed_count')
             ).order_by('-count')
 
+            totals = Software.objects.aggregate(
+                total_software=Count('id'),
+                total_installations=Sum('installed_count')
+            )
+
             return Response({
                 'license_summary': list(license_stats),
-                'total_software': Software.objects.count(),
-                'total_installations': Software.objects.aggregate(total=Count('computers'))['total']
+                'total_software': totals['total_software'],
+                'total_installations': totals['total_installations'] or 0
+            })
+        except Exception as e:
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @action(detail=False, methods=['get'])
+    def compliance(self, request):
+        try:
+            software = Software.objects.annotate(
+                free_seats=F('seat_count') - F('installed_count')
+            ).values(
+                'id', 'name', 'version', 'vendor', 'license', 'license_class',
+                'seat_count', 'installed_count', 'free_seats'
+            ).order_by('license_class', 'name', 'version')
+
+            if request.query_params.get('violations', '').lower() == 'true':
+                software = software.filter(
+                    Q(seat_count__isnull=False, installed_count__gt=F('seat_count')) |
+                    Q(license_class__in=RENEWAL_CLASSES, installed_count__gt=0)
+                )
+
+            by_class = Software.objects.values('license_class').annotate(
+                software_count=Count('id'),
+                total_installations=Sum('installed_count'),
+                total_seats=Sum('seat_count'),
+                over_licensed=Count('id', filter=Q(
+                    seat_count__isnull=False, installed_count__gt=F('seat_count')
+                ))
+            ).order_by('license_class')
+
+            return Response({
+                'by_license_class': list(by_class),
+                'software': list(software),
             })
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
@@ -1,35 +1,41 @@
-from network_api.mixins import ExportMixin
-from network_api.models import User
+from network_api.filters import TrigramSearchFilter
+from network_api.mixins import ConditionalRequestMixin, IdempotencyMixin, ExportMixin, FacetsMixin, UniqueConstraintMixin
+from network_api.models import Computer, Department, User, UserComputer
 from network_api.serializers import UserSerializer
 
 
+from django.db import IntegrityError, transaction
 from django.db.models import Count, Q
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets, filters, status
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-class UserViewSet(ExportMixin, viewsets.ModelViewSet):
+class UserViewSet(IdempotencyMixin, ConditionalRequestMixin, UniqueConstraintMixin, FacetsMixin, ExportMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, TrigramSearchFilter]
     filterset_fields = ['department', 'position_id']
     search_fields = ['full_name', 'email', 'phone']
+    unique_constraint_errors = {
+        'user_email_uniq': 'Пользователь с таким email уже существует',
+    }
+    facet_fields = {
+        'position': ['position_id'],
+        'department': ['department', 'department__room_number'],
+    }
+    facet_cache_models = (Department,)
+    etag_models = (Department, Computer, UserComputer)
 
     def get_queryset(self):
         queryset = User.objects.select_related('department').prefetch_related('computers')
 
-        search = self.request.query_params.get('search')
         department_id = self.request.query_params.get('department')
         position_id = self.request.query_params.get('position_id')
 
         filters = Q()
         has_filters = False
 
-        if search:
-            filters |= Q(full_name__icontains=search) | Q(email__icontains=search) | Q(phone__icontains=search)
-            has_filters = True
-
         if department_id:
             filters &= Q(department_id=department_id)
             has_filters = True
@@ -54,19 +60,15 @@ class UserViewSet(ExportMixin, viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-        email = request.data.get('email')
-        if email and User.objects.filter(email=email).exists():
-            return Response(
-                {'error': 'Пользователь с таким email уже существует'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
         serializer = self.get_serializer(data=request.data)
         try:
             serializer.is_valid(raise_exception=True)
-            self.perform_create(serializer)
+            with transaction.atomic():
+                self.perform_create(serializer)
             headers = self.get_success_headers(serializer.data)
             return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+        except IntegrityError as e:
+            return self.integrity_error_response(e)
         except Exception as e:
             print(f"Error creating user: {e}")
             return Response(
@@ -74,19 +76,6 @@ class UserViewSet(ExportMixin, viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-    def update(self, request, *args, **kwargs):
-        instance = self.get_object()
-        email = request.data.get('email')
-
-        if email and email != instance.email:
-            if User.objects.filter(email=email).exists():
-                return Response(
-                    {'error': 'Пользователь с таким email уже существует'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-        return super().update(request, *args, **kwargs)
-
     @action(detail=False, methods=['get'])
     def managers(self, request):
         managers = self.get_queryset().filter(position_id__in=[1, 2])
@@ -1,3 +1,4 @@
+import os
 from io import BytesIO
 
 import pandas as pd
@@ -5,15 +6,17 @@ from django.http import HttpResponse
 from django.db import connection
 from django.db.models.aggregates import Max
 from django.db.models import Subquery, OuterRef
-from network_api.mixins import ExportMixin
+from network_api.mixins import BulkLinkMixin, ExportMixin
 from network_api.models import Department, User, Network, Software, Server, SoftwareComputer, \
     UserComputer, ServerNetwork, NetworkComputer
 from network_api.serializers import (
+    NetworkComputerSerializer,
     ServerSerializer,
     SoftwareComputerSerializer,
     UserComputerSerializer,
     ServerNetworkSerializer
 )
+from network_api.services.backup import backup_directory, list_backups, verify_backup
 from network_api.services.export_utils import export_analytics_to_excel
 
 from django.db.models import Count
@@ -25,15 +28,21 @@ class ServerViewSet(ExportMixin, viewsets.ModelViewSet):
     queryset = Server.objects.all()
     serializer_class = ServerSerializer
 
-class SoftwareComputerViewSet(ExportMixin, viewsets.ModelViewSet):
-    queryset = SoftwareComputer.objects.all()
+class SoftwareComputerViewSet(BulkLinkMixin, ExportMixin, viewsets.ModelViewSet):
+    queryset = SoftwareComputer.objects.select_related('software', 'computer').order_by('id')
     serializer_class = SoftwareComputerSerializer
+    filterset_fields = ['software', 'computer']
 
-class UserComputerViewSet(ExportMixin, viewsets.ModelViewSet):
+class NetworkComputerViewSet(BulkLinkMixin, ExportMixin, viewsets.ModelViewSet):
+    queryset = NetworkComputer.objects.select_related('computer', 'network').order_by('id')
+    serializer_class = NetworkComputerSerializer
+    filterset_fields = ['network', 'computer']
+
+class UserComputerViewSet(BulkLinkMixin, ExportMixin, viewsets.ModelViewSet):
     queryset = UserComputer.objects.all()
     serializer_class = UserComputerSerializer
 
-class ServerNetworkViewSet(ExportMixin, viewsets.ModelViewSet):
+class ServerNetworkViewSet(BulkLinkMixin, ExportMixin, viewsets.ModelViewSet):
     queryset = ServerNetwork.objects.all()
     serializer_class = ServerNetworkSerializer
 
@@ -225,6 +234,8 @@ class AnalyticsViewSet(viewsets.ViewSet):
             )
 
 class DatabaseViewSet(viewsets.ViewSet):
+    batch_allowed = False
+
     @action(detail=False, methods=['post'])
     def execute_sql(self, request):
         try:
@@ -454,4 +465,18 @@ class DatabaseViewSet(viewsets.ViewSet):
         except Exception as e:
             return Response({
                 'error': f'Ошибка при экспорте: {str(e)}'
-            }, status=500)
\ No newline at end of file
+            }, status=500)
+
+    @action(detail=False, methods=['get'])
+    def verify_backup(self, request):
+        backups = {os.path.basename(path): path for path in list_backups(backup_directory())}
+        name = request.GET.get('backup')
+        if name is not None and name not in backups:
+            return Response({'error': f'Резервная копия {name} не найдена'}, status=status.HTTP_404_NOT_FOUND)
+
+        reports = [verify_backup(backups[name])] if name else [verify_backup(path) for path in backups.values()]
+        return Response({
+            'status': 'success',
+            'valid': all(report['valid'] for report in reports),
+            'backups': reports
+        })
@@ -22,6 +22,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     'rest_framework',
     'django_filters',
@@ -49,7 +50,7 @@ REST_FRAMEWORK = {
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'network_api.pagination.EstimatedCountPagination',
     'PAGE_SIZE': 25
 }
 
@@ -117,6 +118,18 @@ USE_TZ = True
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+AUTOCOMPLETE_REFRESH_SECONDS = int(os.getenv('AUTOCOMPLETE_REFRESH_SECONDS', 300))
+FACETS_CACHE_SECONDS = int(os.getenv('FACETS_CACHE_SECONDS', 0))
+ESTIMATED_COUNT_THRESHOLD = int(os.getenv('ESTIMATED_COUNT_THRESHOLD', 100000))
+CONDITIONAL_REQUESTS = os.getenv('CONDITIONAL_REQUESTS', '1') == '1'
+IDEMPOTENCY_KEY_TTL_SECONDS = int(os.getenv('IDEMPOTENCY_KEY_TTL_SECONDS', 86400))
+IDEMPOTENCY_LEASE_SECONDS = int(os.getenv('IDEMPOTENCY_LEASE_SECONDS', 60))
+OUTBOX_BROKER = os.getenv('OUTBOX_BROKER', 'kafka')
+OUTBOX_TOPIC = os.getenv('OUTBOX_TOPIC', 'inventory.changes')
+OUTBOX_FILE = os.getenv('OUTBOX_FILE', str(BASE_DIR / 'outbox.ndjson'))
+OUTBOX_RETENTION_SECONDS = int(os.getenv('OUTBOX_RETENTION_SECONDS', 7 * 86400))
+KAFKA_BOOTSTRAP_SERVERS = os.getenv('KAFKA_BOOTSTRAP_SERVERS', 'localhost:9092')
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,